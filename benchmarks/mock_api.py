@@ -0,0 +1,337 @@
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+"""
+Mock Intapp API
+---------------
+A local stand-in for the Intake endpoints the SDK uses, serving synthetic but
+realistically shaped data:
+
+    GET .../api/intake/v1/requests                          (filter.* paging/filters)
+    GET .../api/intake/v1/requests/{id}                     (full detail with answers)
+    GET .../api/intake/v1/requests/{id}/attachments/{id}    (?includeContent=true, base64)
+
+Details are generated on demand from a seed, and attachment bodies are
+streamed, so 10k requests with multi-MB attachments need little memory.
+Latency and error rates can be injected. Two extra endpoints support the
+benchmark harness: `/__stats` (calls and bytes served per endpoint) and
+`/__info` (sample IDs).
+
+Usage:
+    python benchmarks/mock_api.py [--requests 10000] [--attachment-mb 2] [--latency-ms 20]
+                                  [--error-rate 0.01] [--port 8765]
+"""
+
+PEOPLE = [
+    "Mark Rob", "Michael Sloan", "Jane Doe", "Priya Patel", "Carlos Mendez", "Emily Chen",
+    "David Okafor", "Sarah Klein", "Tom Becker", "Aisha Rahman", "Luke Martin", "Nina Rossi",
+]
+CLIENTS = [
+    "Acme Holdings", "Blue River Capital", "Northwind Partners", "Summit BioPharma", "Granite Logistics",
+    "Harbor Point REIT", "Orion Software", "Cedar Health", "Keystone Energy", "Maple Street Bank",
+]
+STATES = ["Draft", "Engagement Acceptance", "Analyst Review", "QC Review", "Finalized", "Complete", "Canceled"]
+TYPES = ["Valuation Request"] * 8 + ["Conflict Check", "New Client Intake"]
+CATEGORIES = ["Business Enterprise", "Intangible Assets", "Purchase Price Allocation", "Goodwill Impairment",
+              "Stock Compensation", "Complex Securities"]
+FILE_NAMES = ["Valuation Report.pdf", "Financial Statements.xlsx", "Cap Table.xlsx", "Purchase Agreement.pdf",
+              "Management Projections.xlsx", "Engagement Letter.pdf"]
+TEMPLATE_NAME = "Engagement Letter Template.pdf"
+
+ATTACHMENT_CHUNK = 48 * 1024  # raw bytes per streamed chunk (a multiple of 3, so each chunk is valid base64)
+
+
+def person(name):
+    return f"{name} ({name.lower().replace(' ', '.')}@example.com)"
+
+
+class MockData:
+    """
+    Deterministic synthetic data set. Listing rows are kept in memory;
+    details and attachment bytes are derived from the seed on demand.
+    """
+
+    def __init__(self, count=10000, seed=42, answers=40, max_attachments=3, attachment_mb=2.0,
+                 shared_fraction=0.1):
+        self.seed = seed
+        self.answers = answers
+        self.max_attachments = max_attachments
+        self.attachment_bytes = int(attachment_mb * 1024 * 1024)
+        self.shared_fraction = shared_fraction
+        now = datetime.now().replace(microsecond=0)
+        rng = random.Random(seed)
+        self.summaries = []
+        for i in range(count):
+            created = now - timedelta(days=rng.uniform(0, 400))
+            modified = min(now, created + timedelta(days=rng.expovariate(1 / 20)))
+            state = rng.choice(STATES)
+            status = {"Complete": "Complete", "Finalized": "Complete", "Canceled": "Canceled"}.get(state, "InProgress")
+            client = rng.choice(CLIENTS)
+            self.summaries.append({
+                "id": 500000 + i,
+                "name": f"{client} - {rng.choice(CATEGORIES)} {created.year}",
+                "requestType": rng.choice(TYPES),
+                "status": status,
+                "currentState": state,
+                "clientName": client,
+                "requestedBy": rng.choice(PEOPLE),
+                "createdOn": created.strftime("%Y-%m-%dT%H:%M:%S"),
+                "modifiedOn": modified.strftime("%Y-%m-%dT%H:%M:%S"),
+            })
+        self.by_id = {s["id"]: s for s in self.summaries}
+
+    def _rng(self, *parts):
+        digest = hashlib.sha256(repr((self.seed,) + parts).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def attachments(self, request_id):
+        rng = self._rng("attachments", request_id)
+        result = []
+        for n in range(rng.randint(0, self.max_attachments)):
+            shared = rng.random() < self.shared_fraction
+            size = self.attachment_bytes if shared else int(self.attachment_bytes * rng.uniform(0.5, 1.5))
+            result.append({
+                "id": request_id * 10 + n,
+                "name": TEMPLATE_NAME if shared else rng.choice(FILE_NAMES),
+                "size": size,
+                "contentType": "application/octet-stream",
+                "modifiedOn": self.by_id[request_id]["modifiedOn"],
+                # Identical template files are attached to many requests
+                "_content_key": "template" if shared else f"{request_id}:{n}",
+            })
+        return result
+
+    def detail(self, request_id):
+        summary = self.by_id.get(request_id)
+        if summary is None:
+            return None
+        rng = self._rng("detail", request_id)
+        answers = [
+            {"questionName": "ARI - Partner Assigned", "displayValue": person(rng.choice(PEOPLE))},
+            {"questionName": "ARI - Assigned Analyst", "displayValue": person(rng.choice(PEOPLE))},
+            {"questionName": "ARI - Engagement Partner", "displayValue": person(rng.choice(PEOPLE))},
+            {"questionName": "ARI - Engagement Quality Reviewer", "displayValue": person(rng.choice(PEOPLE))},
+            {"questionName": "ARI - Additional Analyst",
+             "displayValue": ", ".join(person(p) for p in rng.sample(PEOPLE, rng.randint(0, 2))) or "None"},
+            {"questionName": "RSD - Engagement Team Members",
+             "displayValue": ", ".join(person(p) for p in rng.sample(PEOPLE, 3))},
+            {"questionName": "ARI - Category", "displayValue": rng.choice(CATEGORIES)},
+            {"questionName": "ARI - ValuationDate", "displayValue": summary["createdOn"][:10]},
+            {"questionName": "ARI - Due Date", "displayValue": summary["modifiedOn"][:10]},
+            {"questionName": "ARI - Fee", "displayValue": f"{rng.randrange(5, 250) * 1000:,}",
+             "numericAnswer": rng.randrange(5, 250) * 1000},
+            {"questionName": "ARI - Scope",
+             "displayValue": " ".join(rng.choice(["valuation", "of", "the", "equity", "interest", "in",
+                                                  "subsidiary", "as", "at", "reporting", "date", "for",
+                                                  "financial", "purposes"]) for _ in range(60))},
+        ]
+        for k in range(len(answers), self.answers):
+            answers.append({"questionName": f"ARI - Question {k}", "displayValue": rng.choice(["Yes", "No", "N/A"]),
+                            "textAnswer": None})
+        attachments = [{k: v for k, v in a.items() if not k.startswith("_")} for a in self.attachments(request_id)]
+        return dict(summary, answers=answers, attachments=attachments)
+
+    def attachment(self, request_id, attachment_id):
+        if request_id not in self.by_id:
+            return None
+        for att in self.attachments(request_id):
+            if att["id"] == attachment_id:
+                return att
+        return None
+
+    def content_block(self, content_key):
+        # A pseudo-random block repeated to the full size; cheap to produce, not trivially compressible
+        return self._rng("content", content_key).randbytes(ATTACHMENT_CHUNK)
+
+    def list(self, skip=0, take=1000, request_types=None, modified_from=None, modified_to=None):
+        rows = self.summaries
+        if request_types:
+            rows = [r for r in rows if r["requestType"] in request_types]
+        if modified_from:
+            rows = [r for r in rows if r["modifiedOn"] >= modified_from]
+        if modified_to:
+            rows = [r for r in rows if r["modifiedOn"] < modified_to]
+        return rows[skip:skip + take]
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address, data, latency_ms=0.0, jitter=0.3, error_rate=0.0, error_status=503,
+                 retry_after=None):
+        super().__init__(address, MockHandler)
+        self.data = data
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.counters = {}
+
+    def count(self, endpoint, nbytes=0, error=False):
+        with self.lock:
+            entry = self.counters.setdefault(endpoint, {"calls": 0, "bytes": 0, "errors": 0})
+            entry["calls"] += 1
+            entry["bytes"] += nbytes
+            entry["errors"] += int(error)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, endpoint, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.server.count(endpoint, len(body))
+        self._send(200, body)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/__stats":
+            with server.lock:
+                return self._send(200, json.dumps(server.counters).encode())
+        if url.path == "/__info":
+            with_attachments = [s["id"] for s in server.data.summaries[:2000] if server.data.attachments(s["id"])]
+            return self._send(200, json.dumps({
+                "requests": len(server.data.summaries),
+                "with_attachments": with_attachments[:100],
+            }).encode())
+
+        endpoint = "other"
+        attachment = re.search(r"/intake/v1/requests/(\d+)/attachments/(\d+)$", url.path)
+        detail = re.search(r"/intake/v1/requests/(\d+)$", url.path)
+        if attachment:
+            endpoint = "attachment"
+        elif detail:
+            endpoint = "detail"
+        elif url.path.endswith("/intake/v1/requests"):
+            endpoint = "list"
+
+        if server.latency:
+            time.sleep(max(0.0, random.gauss(server.latency, server.latency * server.jitter)))
+        if server.error_rate and random.random() < server.error_rate:
+            server.count(endpoint, error=True)
+            headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else None
+            return self._send(server.error_status, b"", headers)
+
+        if endpoint == "list":
+            take = int(query.get("filter.rowsToTake", ["1000"])[0])
+            skip = int(query.get("filter.rowsToSkip", ["0"])[0])
+            rows = server.data.list(
+                skip=skip, take=take,
+                request_types=query.get("filter.requestTypes"),
+                modified_from=query.get("filter.modifiedFrom", [None])[0],
+                modified_to=query.get("filter.modifiedTo", [None])[0],
+            )
+            return self._send_json(endpoint, rows)
+        if endpoint == "detail":
+            payload = server.data.detail(int(detail.group(1)))
+            if payload is None:
+                server.count(endpoint, error=True)
+                return self._send(404)
+            return self._send_json(endpoint, payload)
+        if endpoint == "attachment":
+            return self._stream_attachment(int(attachment.group(1)), int(attachment.group(2)), query)
+
+        server.count(endpoint, error=True)
+        self._send(404)
+
+    def _stream_attachment(self, request_id, attachment_id, query):
+        att = self.server.data.attachment(request_id, attachment_id)
+        if att is None:
+            self.server.count("attachment", error=True)
+            return self._send(404)
+
+        meta = {k: v for k, v in att.items() if not k.startswith("_")}
+        if query.get("includeContent", ["false"])[0].lower() != "true":
+            return self._send_json("attachment", meta)
+
+        head = json.dumps(meta)[:-1].encode("utf-8") + b', "content": "'
+        tail = b'"}'
+        size = att["size"]
+        encoded_size = 4 * ((size + 2) // 3)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(head) + encoded_size + len(tail)))
+        self.end_headers()
+
+        block = self.server.data.content_block(att["_content_key"])
+        self.wfile.write(head)
+        remaining = size
+        while remaining > 0:
+            chunk = block[:min(remaining, ATTACHMENT_CHUNK)]
+            self.wfile.write(base64.b64encode(chunk))
+            remaining -= len(chunk)
+        self.wfile.write(tail)
+        self.server.count("attachment", len(head) + encoded_size + len(tail))
+
+
+def start(data=None, host="127.0.0.1", port=0, **options):
+    """
+    Starts a mock server on a background thread and returns it (`server.url`
+    is the base URL to hand to the client).
+    """
+    server = MockServer((host, port), data or MockData(), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Intapp Intake API for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (0 picks a free port)")
+    parser.add_argument("--requests", type=int, default=10000, help="Number of synthetic requests")
+    parser.add_argument("--answers", type=int, default=40, help="Answers per request")
+    parser.add_argument("--attachment-mb", type=float, default=2.0, help="Typical attachment size in MB")
+    parser.add_argument("--max-attachments", type=int, default=3, help="Maximum attachments per request")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean injected latency per call")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Latency standard deviation as a fraction of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds to send with injected errors")
+    args = parser.parse_args()
+
+    data = MockData(count=args.requests, seed=args.seed, answers=args.answers,
+                    max_attachments=args.max_attachments, attachment_mb=args.attachment_mb)
+    server = MockServer((args.host, args.port), data, latency_ms=args.latency_ms, jitter=args.jitter,
+                        error_rate=args.error_rate, error_status=args.error_status, retry_after=args.retry_after)
+    print(f"Mock Intapp API listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
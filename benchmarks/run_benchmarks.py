@@ -0,0 +1,297 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+"""
+SDK Benchmark Harness
+---------------------
+Starts the mock Intapp API (benchmarks/mock_api.py) in its own process and
+runs each scenario in a fresh Python process against it, so every run starts
+with a cold cache and its peak memory is measured in isolation.
+
+Reports wall time, API calls served, throughput and peak RSS per scenario.
+Use --json to save results and --baseline to fail (exit 1) when a scenario's
+wall time regresses by more than --tolerance against a saved run.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--requests 10000] [--attachment-mb 2] [--latency-ms 20]
+                                        [--error-rate 0.0] [--only NAME ...] [--json out.json]
+                                        [--baseline old.json] [--tolerance 0.25]
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+DOWNLOAD_REQUESTS = 10
+
+
+def _client(url):
+    from intapp_sdk import IntappIntakeClient
+    return IntappIntakeClient(url, "benchmark-token")
+
+
+def _info(url):
+    root = url.rsplit("/api", 1)[0]
+    with urllib.request.urlopen(f"{root}/__info") as response:
+        return json.load(response)
+
+
+def bench_list_requests(url):
+    return len(_client(url).list_requests(limit=1000, request_types=[]))
+
+
+def bench_iter_requests(url):
+    return sum(1 for _ in _client(url).iter_requests(request_types=[]))
+
+
+def bench_iter_requests_partitioned(url):
+    client = _client(url)
+    return sum(1 for _ in client.iter_requests_partitioned(client._lookback_start(365), request_types=[]))
+
+
+def bench_get_cfi_team_requests(url):
+    failures = {}
+    _client(url).get_cfi_team_requests(limit=15, lookback_days=60, failures=failures)
+    return len(failures)
+
+
+def bench_search_requests_by_answer(url):
+    return len(_client(url).search_requests_by_answer("Mark Rob", limit=2000))
+
+
+def _details(projection=None):
+    def run(url):
+        client = _client(url)
+        rows = client.list_requests(limit=2000, request_types=[])
+        return sum(1 for _ in client.iter_request_details(rows, projection=projection))
+    return run
+
+
+def bench_iter_request_details_projected(url):
+    from intapp_sdk.decoding import Projection
+    projection = Projection(fields=["id", "name", "status", "currentState"], questions=["ARI - Fee"])
+    return _details(projection)(url)
+
+
+def bench_download_all_attachments(url):
+    client = _client(url)
+    files = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for request_id in _info(url)["with_attachments"][:DOWNLOAD_REQUESTS]:
+            files += len(client.download_all_attachments(request_id, os.path.join(tmp, str(request_id))))
+    return files
+
+
+def bench_async_get_cfi_team_requests(url):
+    import asyncio
+    from intapp_sdk.async_client import AsyncIntappIntakeClient
+
+    async def run():
+        async with AsyncIntappIntakeClient(url, "benchmark-token") as client:
+            return len(await client.get_cfi_team_requests(limit=15, lookback_days=60))
+    return asyncio.run(run())
+
+
+def _tool(script, *argv):
+    def run(url):
+        path = os.path.join(ROOT, "tools", script)
+        sys.argv = [path, *argv]
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(path, run_name="__main__")
+        return None
+    return run
+
+
+def bench_tool_download_request_files(url):
+    request_id = _info(url)["with_attachments"][0]
+    with tempfile.TemporaryDirectory() as tmp:
+        _tool("download_request_files.py", str(request_id), "--output-dir", tmp)(url)
+    return None
+
+
+def _cli(*argv):
+    # Times a whole `intapp` process (interpreter start included), i.e. what a cron job or agent shell pays
+    def run(url):
+        env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+        subprocess.run([sys.executable, "-m", "intapp_sdk", *argv], env=env, check=True, stdout=subprocess.DEVNULL)
+        return None
+    return run
+
+
+SCENARIOS = {
+    "list_requests": bench_list_requests,
+    "iter_requests": bench_iter_requests,
+    "iter_requests_partitioned": bench_iter_requests_partitioned,
+    "get_cfi_team_requests": bench_get_cfi_team_requests,
+    "async_get_cfi_team_requests": bench_async_get_cfi_team_requests,
+    "search_requests_by_answer": bench_search_requests_by_answer,
+    "iter_request_details": _details(),
+    "iter_request_details_projected": bench_iter_request_details_projected,
+    "download_all_attachments": bench_download_all_attachments,
+    "tool:search_team_cfi": _tool("search_team_cfi.py"),
+    "tool:analyze_workload": _tool("analyze_workload.py"),
+    "tool:list_recent_requests": _tool("list_recent_requests.py", "-n", "25"),
+    "tool:download_request_files": bench_tool_download_request_files,
+    "cli:help": _cli("--help"),
+    "cli:list": _cli("list", "-n", "25"),
+}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        pass
+    try:
+        import psutil  # type: ignore
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except (ImportError, AttributeError):
+        return None
+
+
+def run_child(name, url):
+    """
+    Runs one scenario in this (fresh) process and prints its measurements as JSON.
+    """
+    os.environ["INTAPP_BASE_URL"] = url
+    os.environ["INTAPP_TOKEN"] = "benchmark-token"
+    started = time.perf_counter()
+    items = SCENARIOS[name](url)
+    wall = time.perf_counter() - started
+    print(json.dumps({"wall": wall, "items": items, "peak_rss_mb": peak_rss_mb()}))
+
+
+def server_counters(url):
+    root = url.rsplit("/api", 1)[0]
+    with urllib.request.urlopen(f"{root}/__stats") as response:
+        return json.load(response)
+
+
+def totals(before, after):
+    calls = sum(v["calls"] for v in after.values()) - sum(v["calls"] for v in before.values())
+    nbytes = sum(v["bytes"] for v in after.values()) - sum(v["bytes"] for v in before.values())
+    errors = sum(v["errors"] for v in after.values()) - sum(v["errors"] for v in before.values())
+    return calls, nbytes, errors
+
+
+def start_server(args):
+    command = [
+        sys.executable, os.path.join(ROOT, "benchmarks", "mock_api.py"), "--port", "0",
+        "--requests", str(args.requests), "--attachment-mb", str(args.attachment_mb),
+        "--latency-ms", str(args.latency_ms), "--error-rate", str(args.error_rate), "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if "listening on" not in line:
+        process.kill()
+        raise RuntimeError(f"Mock API failed to start: {line!r}")
+    return process, line.strip().rsplit(" ", 1)[1]
+
+
+def run_scenario(name, url):
+    before = server_counters(url)
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name, "--url", url],
+                            capture_output=True, text=True)
+    after = server_counters(url)
+    if result.returncode != 0:
+        return {"name": name, "error": (result.stderr.strip().splitlines() or ["failed"])[-1]}
+
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    calls, nbytes, errors = totals(before, after)
+    wall = measured["wall"]
+    return {
+        "name": name,
+        "wall": round(wall, 3),
+        "api_calls": calls,
+        "api_errors": errors,
+        "calls_per_sec": round(calls / wall, 1) if wall else None,
+        "mb": round(nbytes / 1e6, 2),
+        "mb_per_sec": round(nbytes / 1e6 / wall, 2) if wall else None,
+        "peak_rss_mb": measured["peak_rss_mb"],
+        "items": measured["items"],
+    }
+
+
+def print_results(results, baseline=None):
+    print(f"{'Scenario':<30} | {'Wall s':>8} | {'Calls':>6} | {'Calls/s':>8} | {'MB':>8} | {'MB/s':>7} | "
+          f"{'Peak MB':>8} | {'vs base':>8}")
+    print("-" * 110)
+    for r in results:
+        if "error" in r:
+            print(f"{r['name']:<30} | FAILED: {r['error']}")
+            continue
+        change = ""
+        if baseline and r["name"] in baseline and baseline[r["name"]].get("wall"):
+            change = f"{(r['wall'] / baseline[r['name']]['wall'] - 1) * 100:+.0f}%"
+        print(f"{r['name']:<30} | {r['wall']:>8.3f} | {r['api_calls']:>6} | {r['calls_per_sec'] or 0:>8.1f} | "
+              f"{r['mb']:>8.2f} | {r['mb_per_sec'] or 0:>7.2f} | {r['peak_rss_mb'] or 0:>8.1f} | {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Intapp SDK against a local mock API.")
+    parser.add_argument("--requests", type=int, default=10000, help="Synthetic requests served by the mock")
+    parser.add_argument("--attachment-mb", type=float, default=2.0, help="Typical attachment size in MB")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean injected latency per API call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API calls answered with 503")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), metavar="NAME",
+                        help=f"Scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed wall-time slowdown vs the baseline before failing (default: 0.25)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.url)
+        return
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    process, url = start_server(args)
+    print(f"Mock API: {url} ({args.requests} requests, {args.attachment_mb} MB attachments, "
+          f"{args.latency_ms} ms latency, {args.error_rate:.0%} errors)\n")
+    try:
+        results = []
+        for name in args.only or SCENARIOS:
+            print(f"Running {name}...", file=sys.stderr)
+            results.append(run_scenario(name, url))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k not in ("child", "url")},
+                       "results": results}, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+    if baseline:
+        regressed = [r["name"] for r in results if "wall" in r and r["name"] in baseline
+                     and baseline[r["name"]].get("wall")
+                     and r["wall"] > baseline[r["name"]]["wall"] * (1 + args.tolerance)]
+        if regressed:
+            print(f"\nRegressed beyond {args.tolerance:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
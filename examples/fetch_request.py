@@ -8,6 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"
 
 from intapp_sdk import IntappIntakeClient
 from intapp_sdk.auth import get_intapp_token
+from intapp_sdk.store import AttachmentStore
 
 
 def main() -> None:
@@ -44,17 +45,14 @@ def main() -> None:
             print("No attachments found.")
             return
 
+        # Attachment bytes are kept once in the shared store; the directory holds links to them
+        store = AttachmentStore(os.path.join("../data", "attachment_store"))
         print(f"Downloading {len(attachments)} attachments...")
-        for attachment in attachments:
-            attachment_id = attachment["id"]
-            attachment_name = client.sanitize_filename(attachment["name"])
-            attachment_path = os.path.join(attachment_dir, attachment_name)
-
-            try:
-                client.download_attachment(request_id, attachment_id, attachment_path)
-                print(f"  - Downloaded: {attachment['name']}")
-            except Exception as exc:
-                print(f"  - Failed to download {attachment['name']}: {exc}")
+        downloaded = client.download_all_attachments(request_id, attachment_dir, store=store)
+        for path in downloaded:
+            print(f"  - Downloaded: {os.path.basename(path)}")
+        if len(downloaded) < len(attachments):
+            print(f"  - {len(attachments) - len(downloaded)} attachments failed (see log)")
     except Exception as exc:
         print(f"Error: {exc}")
 
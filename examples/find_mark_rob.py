@@ -19,21 +19,22 @@ def main() -> None:
 
     search_term = "Mark Rob"
     print(f"Searching for '{search_term}' in the most recent 200 requests...")
-    print("This may take a few minutes as we have to fetch details for each request...")
-
-    matches = client.search_requests_by_answer(search_term, limit=200)
-
-    if matches:
-        print(f"\nFound {len(matches)} matches:")
+    print("Details are fetched concurrently; matches are printed as they arrive...")
+    print("-" * 80)
+
+    count = 0
+    for m in client.iter_search_requests_by_answer(search_term, limit=200):
+        count += 1
+        print(f"Request ID: {m['request_id']}")
+        print(f"Name      : {m['request_name']}")
+        print(f"Field     : {m['field_name']}")
+        print(f"Value     : {m['value']}")
         print("-" * 80)
-        for m in matches:
-            print(f"Request ID: {m['request_id']}")
-            print(f"Name      : {m['request_name']}")
-            print(f"Field     : {m['field_name']}")
-            print(f"Value     : {m['value']}")
-            print("-" * 80)
+
+    if count:
+        print(f"\nFound {count} matches.")
     else:
-        print(f"\nNo requests found with '{search_term}' in the last 50 requests.")
+        print(f"\nNo requests found with '{search_term}' in the last 200 requests.")
 
 
 if __name__ == "__main__":
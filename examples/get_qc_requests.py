@@ -1,6 +1,5 @@
 import os
 import sys
-from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
@@ -9,48 +8,49 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"
 
 from intapp_sdk import IntappIntakeClient
 from intapp_sdk.auth import get_intapp_token
+from intapp_sdk.roles import AssignmentTable
 
+QC_FIELDS = ["*QC*", "*Reviewer*"]
 
-def search_for_qc(client: IntappIntakeClient, user_name: str, limit: int = 500):
-    print(f"Searching for '{user_name}' in CVG QC fields...")
-    print(f"Fetching most recent {limit} requests...")
 
-    requests_list = client.list_requests()[:limit]
+def build_assignments(client: IntappIntakeClient, limit: int = 500):
+    print(f"Fetching most recent {limit} requests...")
 
-    def process_req(req):
-        req_id = req["id"]
-        try:
-            detail = client.get_request(req_id)
-            if not detail:
-                return None
+    requests_list = client.iter_requests(max_rows=limit)
 
-            qc_fields = [
-                "ARI - Engagement Quality Reviewer",
-                "ARI - Previous Reviewer",
-                "ARI - QC Reviewer",
-            ]
+    # One pass over the details records every person's roles, not just the user we search for.
+    # QC/Reviewer answers often hold bare names, so those count even without an email.
+    table = AssignmentTable(fields=QC_FIELDS)
+    failures = {}
+    # Throttled calls are retried by the client's scheduler; whatever still fails is reported, not dropped
+    for _, detail in client.iter_request_details(requests_list, failures=failures):
+        if detail:
+            table.add_request(detail)
 
-            for a in detail.get("answers", []):
-                q_name = a.get("questionName") or ""
-                val = str(a.get("displayValue", "") or "")
+    if failures:
+        print(f"Warning: {len(failures)} requests could not be fetched: {sorted(failures)}")
+    return table
 
-                if user_name.lower() in val.lower():
-                    if q_name in qc_fields or "QC" in q_name or "Reviewer" in q_name:
-                        return {
-                            "id": req_id,
-                            "name": req["name"],
-                            "field": q_name,
-                            "value": val,
-                            "status": detail.get("status"),
-                        }
-            return None
-        except Exception:
-            return None
 
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        results = list(executor.map(process_req, requests_list))
+def search_for_qc(table: AssignmentTable, user_name: str):
+    print(f"Searching for '{user_name}' in CVG QC fields...")
 
-    return [r for r in results if r]
+    summaries = {r["id"]: r for r in table.requests_for(user_name, question=QC_FIELDS)}
+    results = []
+    seen = set()
+    # Keep the first QC/Reviewer assignment per request
+    for a in table.assignments(person=user_name, question=QC_FIELDS):
+        if a.request_id in seen:
+            continue
+        seen.add(a.request_id)
+        results.append({
+            "id": a.request_id,
+            "name": summaries[a.request_id]["name"],
+            "field": a.question,
+            "value": f"{a.person} ({a.email})" if a.email else a.person,
+            "status": summaries[a.request_id]["status"],
+        })
+    return results
 
 
 def main() -> None:
@@ -61,7 +61,8 @@ def main() -> None:
     client = IntappIntakeClient(base_url, token)
 
     user_to_find = "Mark Rob"
-    results = search_for_qc(client, user_to_find, limit=1000)
+    table = build_assignments(client, limit=1000)
+    results = search_for_qc(table, user_to_find)
 
     if results:
         print(f"\nFound {len(results)} requests where '{user_to_find}' is in a QC/Reviewer field:")
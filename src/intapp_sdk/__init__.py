@@ -1,3 +1,27 @@
-from .client import IntappIntakeClient
+__all__ = ['Answer', 'AnswerIndex', 'AsyncIntappIntakeClient', 'IntappIntakeClient', 'Projection', 'Request', 'RequestCache']
 
-__all__ = ['IntappIntakeClient']
+# Public name -> defining module. Imported on first access, so `import intapp_sdk` (and the
+# `intapp` CLI) does not load requests or httpx until a client is actually used.
+_EXPORTS = {
+    'Answer': '.models',
+    'AnswerIndex': '.index',
+    'AsyncIntappIntakeClient': '.async_client',
+    'IntappIntakeClient': '.client',
+    'Projection': '.decoding',
+    'Request': '.models',
+    'RequestCache': '.cache',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,459 @@
+import asyncio
+import logging
+import os
+import time
+
+from .client import IntakeClientBase
+from .manifest import AttachmentManifest
+from .metrics import endpoint_name
+from .scheduler import AsyncRequestScheduler
+from .streaming import Base64FieldWriter, STREAM_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# One event loop can comfortably keep this many detail fetches in flight.
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+class AsyncIntappIntakeClient(IntakeClientBase):
+    """
+    asyncio counterpart of `IntappIntakeClient` built on `httpx.AsyncClient`.
+
+    Exposes the same surface with awaitable methods. Every HTTP call goes
+    through an `AsyncRequestScheduler` capped at `max_concurrency` in-flight
+    calls (adapting downwards when the API throttles, with retries and
+    backoff), so fan-outs such as `get_cfi_team_requests` can schedule every
+    detail fetch at once without opening more than that many connections.
+    Request building, caching and result shaping are shared with the sync
+    client, so both return identical results.
+    """
+    def __init__(self, base_url, token, max_concurrency=DEFAULT_MAX_CONCURRENCY, cache=None, timeout=60.0,
+                 token_provider=None, scheduler=None):
+        try:
+            import httpx  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError(
+                "AsyncIntappIntakeClient requires `httpx`. Install it via:\n"
+                "  pip install httpx"
+            ) from exc
+
+        super().__init__(base_url, token, cache=cache, token_provider=token_provider)
+        self.max_concurrency = max_concurrency
+        self._transport_errors = (httpx.TransportError,)
+        self.scheduler = scheduler or AsyncRequestScheduler(max_concurrency=max_concurrency)
+        self.session = httpx.AsyncClient(
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            timeout=timeout,
+        )
+
+    def _apply_token(self):
+        self.session.headers.update(self.headers)
+
+    async def _get(self, url, params=None, consume=None, stream=False):
+        endpoint = endpoint_name(url)
+        attempts = 0
+
+        async def send():
+            nonlocal attempts
+            attempts += 1
+            self.metrics.begin(endpoint, retry=attempts > 1)
+            started = time.monotonic()
+            try:
+                token = self.token
+                response = await self.session.send(self.session.build_request('GET', url, params=params),
+                                                   stream=stream)
+                if response.status_code == 401 and self._refresh_token(token):
+                    await response.aclose()
+                    response = await self.session.send(self.session.build_request('GET', url, params=params),
+                                                       stream=stream)
+            except BaseException:
+                self.metrics.end(endpoint, time.monotonic() - started, error=True)
+                raise
+            self.metrics.end(endpoint, time.monotonic() - started, response.status_code)
+            if not stream:
+                self.metrics.add_bytes(endpoint, len(response.content))
+            return response
+
+        return await self.scheduler.call(send, url=url, consume=consume, retry_on=self._transport_errors)
+
+    def scheduler_stats(self):
+        """
+        Returns the scheduler's current concurrency limit and retry/throttle counters.
+        """
+        return self.scheduler.stats()
+
+    async def close(self):
+        """
+        Releases the pooled connections held by the client.
+        """
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def list_requests(self, limit=1000, skip=0, request_types=None, modified_from=None, typed=False,
+                            modified_to=None, projection=None):
+        """
+        Retrieves a list of intake requests with optional filtering.
+        Defaults to 'Valuation Request' if no type is specified.
+        """
+        params = self._list_params(limit, skip, request_types, modified_from, modified_to)
+        response = await self._get(self._requests_url(), params=params)
+        response.raise_for_status()
+        if projection is not None:
+            projection = projection.keeping(*self.LISTING_KEYS)
+        return self._typed(self._observe_listing(self._decode(response, projection)), typed)
+
+    async def iter_requests(self, page_size=1000, request_types=None, modified_from=None, max_rows=None,
+                            typed=False, modified_to=None, projection=None):
+        """
+        Async generator over every matching request, prefetching the next
+        page while the current one is consumed (at most two pages in memory).
+        """
+        if max_rows is not None and max_rows <= 0:
+            return
+
+        async def fetch(skip):
+            take = page_size if max_rows is None else min(page_size, max_rows - skip)
+            return take, await self.list_requests(
+                limit=take, skip=skip, request_types=request_types, modified_from=modified_from,
+                modified_to=modified_to, projection=projection
+            )
+
+        pending = asyncio.ensure_future(fetch(0))
+        skip = 0
+        try:
+            while pending is not None:
+                take, page = await pending
+                skip += len(page)
+                done = len(page) < take or (max_rows is not None and skip >= max_rows)
+                pending = None if done else asyncio.ensure_future(fetch(skip))
+                for row in self._typed(page, typed):
+                    yield row
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def iter_requests_partitioned(self, modified_from, modified_to=None, request_types=None, slices=None,
+                                        page_size=1000, typed=False):
+        """
+        Async counterpart of `IntappIntakeClient.iter_requests_partitioned`:
+        time slices are listed concurrently (bounded by the scheduler), full
+        slices are split again and rows are de-duplicated by ID.
+        """
+        async def fetch(bounds):
+            return bounds, await self.list_requests(limit=page_size, request_types=request_types,
+                                                    modified_from=bounds[0], modified_to=bounds[1])
+
+        seen = set()
+        leaked = False
+        pending = {asyncio.ensure_future(fetch(b)) for b in self._time_slices(modified_from, modified_to, slices)}
+        try:
+            while pending and not leaked:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    bounds, rows = future.result()
+                    if self._slice_leaked(rows, bounds):
+                        leaked = True
+                        break
+                    if len(rows) >= page_size:
+                        parts = self._split_slice(bounds, rows)
+                        if parts:
+                            pending.update(asyncio.ensure_future(fetch(part)) for part in parts)
+                            continue
+                        rows = [row async for row in self.iter_requests(
+                            page_size, request_types, modified_from=bounds[0], modified_to=bounds[1])]
+                    for row in rows:
+                        if row.get('id') not in seen:
+                            seen.add(row.get('id'))
+                            yield self._typed(row, typed)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if leaked:
+            logger.warning("The API ignored filter.modifiedTo; falling back to a serial listing")
+            async for row in self.iter_requests(page_size, request_types, modified_from=modified_from):
+                if row.get('id') not in seen and (not modified_to or (row.get('modifiedOn') or '')[:19] < modified_to):
+                    seen.add(row.get('id'))
+                    yield self._typed(row, typed)
+
+    async def get_request(self, request_id, use_cache=True, typed=False, projection=None):
+        """
+        Retrieves full details for a specific intake request by ID
+        (optionally only the parts selected by a `Projection`).
+        """
+        cached = self._cached_request(request_id, use_cache, projection)
+        if cached is not None:
+            return self._typed(cached, typed)
+
+        response = await self._get(self._request_url(request_id))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return self._typed(self._remember_request(request_id, self._decode(response, projection), projection), typed)
+
+    async def download_attachment(self, request_id, attachment_id, output_path, store=None):
+        """
+        Downloads an attachment and saves it to the specified path, decoding
+        the base64 `content` incrementally into a temp file that is renamed
+        into place once complete. See the sync client for `store`.
+        """
+        await self._fetch_attachment(request_id, {'id': attachment_id}, output_path, store)
+        return output_path
+
+    async def _fetch_attachment(self, request_id, attachment, output_path, store):
+        if store is None:
+            return await self._download_attachment(request_id, attachment['id'], output_path)
+
+        sha256, staged = self._stage_in_store(store, attachment)
+        if staged is not None:
+            try:
+                _, sha256 = await self._download_attachment(request_id, attachment['id'], staged)
+            except BaseException:
+                self._discard_partial(staged)
+                raise
+            store.commit(staged, sha256, attachment)
+        return store.materialize(sha256, output_path)
+
+    async def _download_attachment(self, request_id, attachment_id, output_path):
+        params = {'includeContent': 'true'}
+
+        async def consume(response):
+            try:
+                response.raise_for_status()
+                f, tmp_path = self._open_partial(output_path)
+                received = 0
+                try:
+                    with f:
+                        writer = Base64FieldWriter(f)
+                        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                            received += len(chunk)
+                            writer.feed(chunk)
+                        result = self._finish_attachment(writer, attachment_id)
+                    self._commit_partial(tmp_path, output_path)
+                    return result
+                except BaseException:
+                    self._discard_partial(tmp_path)
+                    raise
+                finally:
+                    self.metrics.add_bytes('attachment', received)
+            finally:
+                await response.aclose()
+
+        url = self._attachment_url(request_id, attachment_id)
+        return await self._get(url, params=params, consume=consume, stream=True)
+
+    async def download_all_attachments(self, request_id, output_dir, overwrite=False, verify_hash=False,
+                                       store=None):
+        """
+        Downloads all attachments for a request concurrently, skipping files
+        the directory manifest already records as complete and unchanged.
+        Returns a list of paths to the downloaded files.
+        """
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        request = await self.get_request(request_id)
+        if not request:
+            logger.warning(f"Request {request_id} not found.")
+            return []
+
+        manifest = AttachmentManifest(output_dir)
+        todo, downloaded_files = self._plan_downloads(request, output_dir, manifest, overwrite, verify_hash)
+        results = await asyncio.gather(
+            *(self._fetch_attachment(request_id, target[3], target[2], store) for target in todo),
+            return_exceptions=True,
+        )
+
+        for target, result in zip(todo, results):
+            att_id, raw_name, output_path, _ = target
+            if isinstance(result, Exception):
+                logger.error(f"Failed to download attachment {att_id} ({raw_name}): {result}")
+                continue
+            self._record_download(manifest, request_id, target, *result)
+            downloaded_files.append(output_path)
+            logger.info(f"Downloaded: {output_path}")
+        return downloaded_files
+
+    @staticmethod
+    async def _as_completed(coros):
+        """
+        Schedules every coroutine and yields results as they finish. The
+        scheduler behind `_get` bounds the HTTP calls; closing the generator
+        cancels whatever is still outstanding.
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _search_answers(self, query, limit, max_matches, failures=None):
+        needle = query.lower()
+        listing = [req async for req in self.iter_requests(max_rows=limit)]
+
+        async def fetch(position, req):
+            try:
+                return position, req, await self.get_request(req['id']), None
+            except Exception as e:
+                return position, req, None, e
+
+        found = 0
+        # With `max_matches`, matches are released in listing order (see the sync client)
+        held = {}
+        confirmed = 0
+        completed = self._as_completed(fetch(*entry) for entry in enumerate(listing))
+        try:
+            async for position, req, detail, error in completed:
+                if error is not None:
+                    self._record_failure(failures, req['id'], error)
+                    detail = None
+                matches = list(self._answer_matches(req, detail, needle)) if detail else []
+                if max_matches is None:
+                    for match in matches:
+                        yield position, match
+                    continue
+
+                held[position] = matches
+                while confirmed in held:
+                    for match in held.pop(confirmed):
+                        yield confirmed, match
+                        found += 1
+                        if found >= max_matches:
+                            return
+                    confirmed += 1
+        finally:
+            await completed.aclose()
+
+    async def iter_search_requests_by_answer(self, query, limit=50, max_matches=None, failures=None):
+        """
+        Yields matching answer fields as soon as their request details arrive
+        (in listing order when `max_matches` is given, as in the sync client).
+        """
+        results = self._search_answers(query, limit, max_matches, failures)
+        try:
+            async for _, match in results:
+                yield match
+        finally:
+            await results.aclose()
+
+    async def search_requests_by_answer(self, query, limit=50, max_matches=None, failures=None):
+        """
+        Searches the most recent requests for a specific string in any answer field.
+        Returns the same list, in the same order, as the sync client.
+        """
+        results = [entry async for entry in self._search_answers(query, limit, max_matches, failures)]
+        results.sort(key=lambda entry: entry[0])
+        return [match for _, match in results]
+
+    async def get_cfi_team_requests(self, limit=15, lookback_days=60, failures=None):
+        """
+        Specialized search for the CFI Team (Mark Rob as QC/Reviewer or Michael Sloan as Analyst).
+        Pass a dict as `failures` to learn which request IDs could not be checked.
+        """
+        return await self.top_query(self._cfi_team_query(lookback_days), limit, failures=failures)
+
+    async def top_query(self, query, limit, failures=None, stats=None, typed=False):
+        """
+        Returns the `limit` highest-ID requests matching a `RequestQuery`,
+        fetching details highest ID first in waves and stopping once the top
+        `limit` are confirmed (see `IntappIntakeClient.top_query`).
+        """
+        stats = self._query_stats(stats)
+        rows = []
+        async for row in self.iter_requests(**query.list_params):
+            stats['listed'] += 1
+            if query.matches_summary(row):
+                rows.append(row)
+        rows.sort(key=lambda x: x.get('id', 0), reverse=True)
+        if not query.needs_detail:
+            stats['matched'] = min(limit, len(rows))
+            return self._typed(rows[:limit], typed)
+
+        async def fetch(position):
+            try:
+                return position, await self.get_request(rows[position]['id'], typed=typed), None
+            except Exception as e:
+                return position, None, e
+
+        outcomes = {}
+        pending = set()
+        matches = []
+        confirmed = 0
+        try:
+            while True:
+                # Matches only count once every higher ID has been checked
+                while confirmed in outcomes:
+                    detail = outcomes.pop(confirmed)
+                    confirmed += 1
+                    if detail is not None:
+                        matches.append(detail)
+                if len(matches) >= limit or confirmed >= len(rows):
+                    break
+                found = len(matches) + sum(1 for d in outcomes.values() if d is not None)
+                want = self._wave_size(limit - found, confirmed + len(outcomes), found, self.max_concurrency)
+                start = confirmed + len(outcomes) + len(pending)
+                for position in range(start, min(len(rows), start + max(0, want - len(pending)))):
+                    pending.add(asyncio.ensure_future(fetch(position)))
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    position, detail, error = future.result()
+                    stats['fetched'] += 1
+                    if error is not None:
+                        self._record_failure(failures, rows[position]['id'], error)
+                    outcomes[position] = detail if detail is not None and query.matches_detail(detail) else None
+        finally:
+            for future in pending:
+                future.cancel()
+        stats['matched'] = len(matches[:limit])
+        return matches[:limit]
+
+    async def iter_query(self, query, details=None, failures=None, stats=None, typed=False, partitioned=False):
+        """
+        Yields the requests matching a `RequestQuery`, with the same pushdown
+        as the sync client: details are fetched only for listing rows that
+        pass the summary-level conditions.
+        """
+        stats = self._query_stats(stats)
+        params = query.list_params
+        if partitioned and params['modified_from']:
+            rows = self.iter_requests_partitioned(**params)
+        else:
+            rows = self.iter_requests(**params)
+        candidates = []
+        async for row in rows:
+            stats['listed'] += 1
+            if query.matches_summary(row):
+                candidates.append(row)
+
+        if not (query.needs_detail if details is None else details):
+            for row in candidates:
+                stats['matched'] += 1
+                yield self._typed(row, typed)
+            return
+
+        async def fetch(req):
+            try:
+                return req, await self.get_request(req['id'], typed=typed), None
+            except Exception as e:
+                return req, None, e
+
+        completed = self._as_completed(fetch(req) for req in candidates)
+        try:
+            async for req, detail, error in completed:
+                if error is not None:
+                    self._record_failure(failures, req['id'], error)
+                    continue
+                stats['fetched'] += 1
+                if detail is not None and query.matches_detail(detail):
+                    stats['matched'] += 1
+                    yield detail
+        finally:
+            await completed.aclose()
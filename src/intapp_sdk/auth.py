@@ -1,15 +1,82 @@
 from __future__ import annotations
 
+import json
 import os
+import time
 
+DEFAULT_BASE_URL = "https://marcum-flow.open.intapp.com/api"
 
-def get_intapp_token() -> str:
+# How long a token read from the keyring is reused from the token cache before the keyring is asked again
+TOKEN_CACHE_TTL = 8 * 3600
+
+
+def get_intapp_base_url() -> str:
+    """
+    Resolve the Intapp API base URL.
+
+    `INTAPP_BASE_URL` overrides the production tenant, e.g. to point the tools
+    at the local mock API used by `benchmarks/`.
+    """
+    return os.getenv("INTAPP_BASE_URL") or DEFAULT_BASE_URL
+
+
+def token_cache_path() -> str | None:
+    """
+    Location of the token cache, or None when it is off (the default).
+
+    The cache is a plain file outside the credential store (file permissions
+    do not protect it on Windows), so it is opt-in: set `INTAPP_TOKEN_CACHE`
+    to `1` for `intapp/token.json` in the user's local cache directory, or to
+    a file path.
+    """
+    path = os.getenv("INTAPP_TOKEN_CACHE", "")
+    if path in ("", "0"):
+        return None
+    if path != "1":
+        return path
+    root = os.getenv("LOCALAPPDATA") or os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "intapp", "token.json")
+
+
+def _read_cached_token() -> str | None:
+    path = token_cache_path()
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or time.time() - cached.get("cached_at", 0) > TOKEN_CACHE_TTL:
+        return None
+    return cached.get("token") or None
+
+
+def _write_cached_token(token: str) -> None:
+    path = token_cache_path()
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Readable by the current user only (POSIX; ignored on Windows)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"token": token, "cached_at": time.time()}, f)
+    except OSError:
+        pass
+
+
+def get_intapp_token(use_cache: bool = True) -> str:
     """
     Resolve the Intapp bearer token.
 
     Precedence:
     1) Environment variable `INTAPP_TOKEN` (recommended for CI and ephemeral sessions)
-    2) Windows Credential Manager via `keyring` (recommended for local dev)
+    2) The opt-in token cache (see `token_cache_path`), filled from the
+       keyring for `TOKEN_CACHE_TTL` seconds so short-lived processes skip the
+       keyring lookup. `use_cache=False` bypasses it (and refreshes it); pass
+       it from a `token_provider` so a rejected token is not reused.
+    3) Windows Credential Manager via `keyring` (recommended for local dev)
        - service: `intapp`
        - username: `INTAPP_TOKEN`
     """
@@ -17,11 +84,17 @@ def get_intapp_token() -> str:
     if token:
         return token
 
+    if use_cache:
+        token = _read_cached_token()
+        if token:
+            return token
+
     try:
         import keyring  # type: ignore
 
         token = keyring.get_password("intapp", "INTAPP_TOKEN")
         if token:
+            _write_cached_token(token)
             return token
     except ImportError as exc:
         raise RuntimeError(
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RequestCache:
+    """
+    Thread-safe LRU cache for request details with a per-entry TTL.
+
+    Entries remember the `modifiedOn` stamp of the detail they hold. When a
+    list call later reports a newer stamp for the same ID the entry is dropped,
+    so a cached detail is never served after the API has seen a change.
+    Set `max_size=0` to disable caching entirely.
+    """
+
+    MODIFIED_FIELD = 'modifiedOn'
+
+    def __init__(self, max_size=2048, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, request_id):
+        """
+        Returns the cached detail for `request_id`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(request_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, _, expires_at = entry
+            if self.ttl is not None and expires_at <= time.monotonic():
+                del self._entries[request_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(request_id)
+            self.hits += 1
+            return value
+
+    def put(self, request_id, value):
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[request_id] = (value, value.get(self.MODIFIED_FIELD), expires_at)
+            self._entries.move_to_end(request_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, request_id=None):
+        """
+        Drops one entry, or the whole cache when no ID is given.
+        """
+        with self._lock:
+            if request_id is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(request_id, None) is not None:
+                self.invalidations += 1
+
+    def observe(self, summary):
+        """
+        Checks a list-endpoint row against the cache and invalidates the
+        matching entry if the row carries a newer modified stamp.
+        """
+        request_id = summary.get('id')
+        modified = summary.get(self.MODIFIED_FIELD)
+        if request_id is None or not modified:
+            return
+        with self._lock:
+            entry = self._entries.get(request_id)
+            if entry is None:
+                return
+            value, cached_modified, expires_at = entry
+            if cached_modified is None:
+                # The detail had no stamp of its own; adopt the first one seen
+                self._entries[request_id] = (value, modified, expires_at)
+            elif modified > cached_modified:
+                del self._entries[request_id]
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,53 @@
+"""
+intapp command line
+-------------------
+One entry point for the tools in `intapp_sdk.commands`:
+
+    intapp <command> [options]        (or: python -m intapp_sdk <command>)
+    intapp <command> --help
+
+Only the selected command's module is imported, so `intapp --help` starts
+without loading requests, dotenv or any other SDK dependency, and each
+command pulls in just what it uses.
+"""
+
+import sys
+
+# command -> (module in intapp_sdk.commands, one-line help)
+COMMANDS = {
+    'list': ('list_recent_requests', "List the most recent requests"),
+    'workload': ('analyze_workload', "Summarize InProgress requests by workflow state (with --history trends)"),
+    'team': ('search_team_cfi', "Active requests assigned to the CFI team"),
+    'fetch': ('fetch_request_data', "People, dates, financials and more for one or many requests"),
+    'download': ('download_request_files', "Download all attachments of a request"),
+    'search': ('search_answers', "Find a name or text in the answers of recent requests"),
+    'export': ('export_requests', "Export requests and answers to Parquet, CSV or JSON Lines"),
+}
+
+
+def usage():
+    width = max(map(len, COMMANDS))
+    lines = ["usage: intapp <command> [options]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "Run `intapp <command> --help` for a command's options."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+
+    name, argv = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"intapp: unknown command {name!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    from importlib import import_module
+    command = import_module(f"{__package__}.commands.{COMMANDS[name][0]}")
+    return command.main(argv, prog=f"intapp {name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
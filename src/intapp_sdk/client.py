@@ -1,17 +1,43 @@
-import requests
 import re
 import json
 import logging
 import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from itertools import islice
+
+from .cache import RequestCache
+from .decoding import decode
+from .manifest import AttachmentManifest
+from .metrics import ClientMetrics, endpoint_name
+from .models import Request
+from .query import INACTIVE_STATES, INACTIVE_STATUSES, active_requests_query
+from .roles import CFI_TEAM
+from .scheduler import RequestScheduler
+from .streaming import Base64FieldWriter, STREAM_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
-class IntappIntakeClient:
+# Matches the fan-out width used by get_cfi_team_requests and the examples.
+DEFAULT_MAX_WORKERS = 20
+
+# Format of the API's modifiedOn/createdOn timestamps and filter.modified* bounds
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class IntakeClientBase:
     """
-    A programmatic interface for the Intapp Intake API.
-    Designed for use by both human developers and AI Agents.
+    Transport-independent pieces shared by the sync and async clients:
+    endpoint URLs, query parameters, caching and result shaping. Keeping them
+    here guarantees both clients return identical results.
     """
-    def __init__(self, base_url, token):
+    # Partitioned listings: initial number of time slices, and the narrowest slice worth splitting
+    DEFAULT_SLICES = 16
+    MIN_SLICE = timedelta(seconds=1)
+
+    def __init__(self, base_url, token, cache=None, token_provider=None):
         self.base_url = base_url.rstrip('/')
         self.token = token
         self.headers = {
@@ -19,31 +45,302 @@ class IntappIntakeClient:
             'Authorization': f'Bearer {self.token}',
             'Content-Type': 'application/json'
         }
+        if cache is None:
+            cache = RequestCache()
+        self.cache = cache if cache is not False else None
+        self.token_provider = token_provider
+        self._token_lock = threading.Lock()
+        self.metrics = ClientMetrics()
 
-    def list_requests(self, limit=1000, skip=0, request_types=None, modified_from=None):
+    def _apply_token(self):
         """
-        Retrieves a list of intake requests with optional filtering.
-        Defaults to 'Valuation Request' if no type is specified.
+        Pushes `self.headers` to the transport after the token changes.
+        """
+
+    def _refresh_token(self, rejected_token):
+        """
+        Called after a 401. Asks `token_provider` for a new token unless a
+        concurrent call already replaced the rejected one, so a burst of
+        401s resolves the token only once. Returns True if the request
+        should be retried with the current token.
         """
-        url = f"{self.base_url}/api/intake/v1/requests"
-        
+        if self.token_provider is None:
+            return False
+        with self._token_lock:
+            if self.token == rejected_token:
+                token = self.token_provider()
+                if not token or token == rejected_token:
+                    return False
+                logger.info("Access token rejected; using a refreshed token")
+                self.token = token
+                self.headers['Authorization'] = f'Bearer {token}'
+                self._apply_token()
+        return True
+
+    def _requests_url(self):
+        return f"{self.base_url}/api/intake/v1/requests"
+
+    def _request_url(self, request_id):
+        return f"{self.base_url}/api/intake/v1/requests/{request_id}"
+
+    def _attachment_url(self, request_id, attachment_id):
+        return f"{self.base_url}/api/intake/v1/requests/{request_id}/attachments/{attachment_id}"
+
+    @staticmethod
+    def _list_params(limit, skip, request_types, modified_from, modified_to=None):
         # Default to Valuation Request if none provided
         if request_types is None:
             request_types = ["Valuation Request"]
-            
+
         params = {
             'filter.rowsToTake': limit,
             'filter.rowsToSkip': skip
         }
-        
+
         if request_types:
             params['filter.requestTypes'] = request_types
         if modified_from:
             params['filter.modifiedFrom'] = modified_from
+        if modified_to:
+            params['filter.modifiedTo'] = modified_to
+        return params
 
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        return response.json()
+    def _time_slices(self, modified_from, modified_to, slices):
+        """
+        Splits `[modified_from, modified_to)` into about `slices` equal time
+        ranges. Without `modified_to` the last range is open-ended (its upper
+        bound is None), so rows stamped after this machine's clock are kept.
+        Neighbouring ranges share their boundary timestamp; rows are
+        de-duplicated by ID, so an inclusive or exclusive `filter.modifiedTo`
+        both leave no gaps.
+        """
+        from datetime import datetime
+
+        if not modified_from:
+            raise ValueError("A partitioned listing needs a modified_from lower bound")
+        start = datetime.fromisoformat(str(modified_from)[:19])
+        end = datetime.fromisoformat(str(modified_to or self._lookback_start(0))[:19])
+        if end <= start:
+            return [] if modified_to else [(start.strftime(TIMESTAMP_FORMAT), None)]
+        step = max((end - start) / max(1, slices or self.DEFAULT_SLICES), self.MIN_SLICE)
+        points = [start]
+        while points[-1] + step < end:
+            points.append((points[-1] + step).replace(microsecond=0))
+        points = [p.strftime(TIMESTAMP_FORMAT) for p in points]
+        points.append(str(modified_to)[:19] if modified_to else None)
+        return list(zip(points, points[1:]))
+
+    def _split_slice(self, bounds, rows):
+        """
+        Splits a time range that came back full, using the rows it returned
+        as a sample: at their median `modifiedOn`, or around the one second
+        holding at least half of them (a bulk update) so that second is paged
+        directly instead of being halved down to. Returns None when the range
+        is already as narrow as `MIN_SLICE` (the caller then pages through it).
+        """
+        from collections import Counter
+        from datetime import datetime
+
+        stamps = sorted(s for s in ((row.get('modifiedOn') or '')[:19] for row in rows)
+                        if bounds[0] <= s and (bounds[1] is None or s < bounds[1]))
+        a = datetime.fromisoformat(bounds[0])
+        if bounds[1] is not None:
+            b = datetime.fromisoformat(bounds[1])
+        else:
+            # Open-ended: split below the newest row seen (or now) and keep the top open
+            b = datetime.fromisoformat(self._lookback_start(0))
+            if stamps:
+                b = max(b, datetime.fromisoformat(stamps[-1]) + self.MIN_SLICE)
+        if b - a <= self.MIN_SLICE:
+            return None
+        cuts = []
+        if stamps:
+            busiest, count = Counter(stamps).most_common(1)[0]
+            if count * 2 >= len(stamps):
+                second = datetime.fromisoformat(busiest)
+                cuts = [second, second + self.MIN_SLICE]
+            else:
+                cuts = [datetime.fromisoformat(stamps[len(stamps) // 2])]
+        cuts = [t for t in cuts if a < t < b] or [(a + (b - a) / 2).replace(microsecond=0)]
+        points = [bounds[0], *(t.strftime(TIMESTAMP_FORMAT) for t in cuts), bounds[1]]
+        return list(zip(points, points[1:]))
+
+    @staticmethod
+    def _slice_leaked(rows, bounds):
+        # Rows modified after the range's end mean the API ignored filter.modifiedTo
+        return bounds[1] is not None and any((row.get('modifiedOn') or '')[:19] > bounds[1] for row in rows)
+
+    @staticmethod
+    def _typed(data, typed):
+        """
+        Converts API JSON to `Request` models when the caller asked for `typed=True`.
+        """
+        if not typed or data is None:
+            return data
+        if isinstance(data, list):
+            return [Request(row) for row in data]
+        return Request(data)
+
+    # Listing rows always keep these under a projection: the cache and the partitioned listing rely on them
+    LISTING_KEYS = ('id', 'modifiedOn')
+
+    @staticmethod
+    def _decode(response, projection=None):
+        """
+        Decodes a JSON response body with the fastest available backend,
+        keeping only the parts selected by `projection` (a `Projection`).
+        """
+        return decode(response.content, projection)
+
+    def _observe_listing(self, data):
+        if self.cache is not None:
+            for row in data:
+                self.cache.observe(row)
+        return data
+
+    def _cached_request(self, request_id, use_cache, projection=None):
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(request_id)
+            return cached if projection is None or cached is None else projection.apply(cached)
+        return None
+
+    def _remember_request(self, request_id, data, projection=None):
+        # Projected details are partial, so only full ones are cached
+        if self.cache is not None and projection is None:
+            self.cache.put(request_id, data)
+        return data
+
+    def cache_stats(self):
+        """
+        Returns hit/miss counters for the request cache (None when disabled).
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def stats(self):
+        """
+        Snapshot of where time goes: per-endpoint (list, detail, attachment)
+        latency histograms, bytes, status codes, retries and errors, the
+        scheduler's concurrency and throttling counters, and cache hits.
+        """
+        return {
+            'http': self.metrics.snapshot(),
+            'scheduler': self.scheduler.stats(),
+            'cache': self.cache_stats(),
+        }
+
+    @staticmethod
+    def _open_partial(output_path):
+        """
+        Opens a temp file next to `output_path`; `_commit_partial` renames it
+        into place so readers never see a half-written attachment.
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(output_path)}.", suffix=".part",
+                                        dir=os.path.dirname(os.path.abspath(output_path)))
+        return os.fdopen(fd, 'wb'), tmp_path
+
+    @staticmethod
+    def _commit_partial(tmp_path, output_path):
+        os.replace(tmp_path, output_path)
+
+    @staticmethod
+    def _discard_partial(tmp_path):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _finish_attachment(writer, attachment_id):
+        """
+        Flushes the decoder and returns `(size, sha256)` of the written bytes.
+        """
+        writer.close()
+        if not writer.bytes_written:
+            raise ValueError(f"No content found for attachment {attachment_id}")
+        return writer.bytes_written, writer.sha256.hexdigest()
+
+    def _attachment_targets(self, request, output_dir):
+        """
+        Yields `(attachment_id, raw_name, output_path, attachment)` for every
+        downloadable attachment. Names that collide within a request get the
+        attachment ID appended so parallel downloads never share a path.
+        """
+        used = set()
+        for att in request.get('attachments', []):
+            att_id = att.get('id')
+            raw_name = att.get('fileName') or att.get('name')
+            if not att_id or not raw_name:
+                continue
+
+            safe_name = self.sanitize_filename(raw_name)
+            if safe_name in used:
+                stem, ext = os.path.splitext(safe_name)
+                safe_name = f"{stem}_{att_id}{ext}"
+            used.add(safe_name)
+            yield att_id, raw_name, os.path.join(output_dir, safe_name), att
+
+    def _plan_downloads(self, request, output_dir, manifest, overwrite, verify_hash):
+        """
+        Splits a request's attachments into those still to download and the
+        paths already on disk and current according to the manifest.
+        """
+        todo = []
+        current = []
+        for target in self._attachment_targets(request, output_dir):
+            att_id, raw_name, output_path, att = target
+            filename = os.path.basename(output_path)
+            if not overwrite and manifest.is_current(filename, manifest.fingerprint(att), verify_hash):
+                logger.info(f"Up to date: {output_path}")
+                current.append(output_path)
+            else:
+                todo.append(target)
+        return todo, current
+
+    @staticmethod
+    def _stage_in_store(store, attachment):
+        """
+        Returns `(sha256, None)` when the store already holds the attachment,
+        otherwise `(None, staged_path)` to download into.
+        """
+        sha256 = store.lookup(attachment)
+        if sha256 is not None:
+            return sha256, None
+        return None, store.staging_path()
+
+    @staticmethod
+    def _record_download(manifest, request_id, target, size, sha256):
+        att_id, _, output_path, att = target
+        manifest.record(os.path.basename(output_path), request_id, att_id, manifest.fingerprint(att), size, sha256)
+
+    @staticmethod
+    def _record_failure(failures, request_id, error):
+        """
+        Logs a request that failed after retries and, when the caller passed a
+        `failures` dict, records it there as `{request_id: error message}`.
+        """
+        logger.warning(f"Giving up on request {request_id}: {error}")
+        if failures is not None:
+            failures[request_id] = str(error)
+
+    @staticmethod
+    def _answer_matches(req, detail, needle):
+        """
+        Yields search hits for every answer whose display value contains `needle` (lowercase).
+        """
+        for a in detail.get('answers', []):
+            display_val = str(a.get('displayValue', ''))
+            if needle in display_val.lower():
+                yield {
+                    'request_id': req['id'],
+                    'request_name': req['name'],
+                    'field_name': a.get('questionName'),
+                    'value': display_val
+                }
+
+    @staticmethod
+    def _lookback_start(lookback_days):
+        from datetime import datetime
+        return (datetime.now() - timedelta(days=lookback_days)).strftime(TIMESTAMP_FORMAT)
 
     def get_request_url(self, request_id):
         """
@@ -51,51 +348,36 @@ class IntappIntakeClient:
         """
         return f"https://marcum-flow.open.intapp.com/app/app/index.html#/requests/{request_id}"
 
-    def get_cfi_team_requests(self, limit=15, lookback_days=60):
+    @staticmethod
+    def is_cfi_team_request(detail):
         """
-        Specialized search for the CFI Team (Mark Rob as QC/Reviewer or Michael Sloan as Analyst).
+        True when an active request has Mark Rob as QC/Reviewer or Michael Sloan as Analyst.
         """
-        from datetime import datetime, timedelta
-        from concurrent.futures import ThreadPoolExecutor
-        
-        modified_from = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y-%m-%dT%H:%M:%S")
-        all_reqs = self.list_requests(limit=1000, modified_from=modified_from)
-        
-        matches = []
-        
-        def process_req(req):
-            req_id = req['id']
-            try:
-                detail = self.get_request(req_id)
-                if not detail: return None
-                
-                qc_match = False
-                analyst_match = False
-                
-                for a in detail.get('answers', []):
-                    val = str(a.get('displayValue', '')).lower()
-                    field = a.get('questionName', '')
-                    
-                    if "mark rob" in val and ("Reviewer" in field or "QC" in field):
-                        qc_match = True
-                    if "michael sloan" in val and "Analyst" in field:
-                        analyst_match = True
-                
-                if qc_match or analyst_match:
-                    # Skip canceled, completed or finalized requests
-                    if detail.get('currentState') in ["Canceled", "Finalized"] or detail.get('status') == "Complete":
-                        return None
-                    return detail
-            except:
-                pass
-            return None
+        if not CFI_TEAM(detail):
+            return False
+        # Skip canceled, completed or finalized requests
+        return not (detail.get('currentState') in INACTIVE_STATES or detail.get('status') in INACTIVE_STATUSES)
 
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            results = list(executor.map(process_req, all_reqs))
-            matches = [r for r in results if r]
+    def _cfi_team_query(self, lookback_days):
+        # Finished requests are dropped from the listing rows, before their details are fetched
+        return active_requests_query(modified_from=self._lookback_start(lookback_days),
+                                     where_detail=self.is_cfi_team_request)
 
-        matches.sort(key=lambda x: x.get('id', 0), reverse=True)
-        return matches[:limit]
+    @staticmethod
+    def _wave_size(needed, done, matched, cap):
+        """
+        How many detail fetches to keep in flight for an ordered top-N search:
+        enough to find the `needed` remaining matches at the match rate seen
+        so far (optimistic until results arrive), capped at `cap`.
+        """
+        rate = (matched + 1) / (done + 2)
+        return max(1, min(cap, int(needed / rate + 0.999)))
+
+    @staticmethod
+    def _query_stats(stats):
+        stats = {} if stats is None else stats
+        stats.update(listed=0, fetched=0, matched=0)
+        return stats
 
     @staticmethod
     def format_request_table(requests_data):
@@ -111,9 +393,9 @@ class IntappIntakeClient:
         # Header
         header = f"{'ID':<8} | {'Date':<10} | {'Status':<12} | {'Current State':<25} | {'Type':<20} | {'Name'}"
         separator = "-" * 130
-        
+
         lines = [header, separator]
-        
+
         for r in sorted_data:
             req_id = str(r.get('id', ''))
             date = str(r.get('createdOn', ''))[:10]
@@ -121,9 +403,9 @@ class IntappIntakeClient:
             state = str(r.get('currentState', ''))[:25]
             req_type = str(r.get('requestType', ''))[:20]
             name = str(r.get('name', ''))
-            
+
             lines.append(f"{req_id:<8} | {date:<10} | {status:<12} | {state:<25} | {req_type:<20} | {name}")
-            
+
         return "\n".join(lines)
 
     @staticmethod
@@ -140,7 +422,7 @@ class IntappIntakeClient:
         # Markdown table header
         lines = ["| ID | Date | Status | Current State | Type | Name |"]
         lines.append("| --- | --- | --- | --- | --- | --- |")
-        
+
         for r in sorted_data:
             req_id = str(r.get('id', ''))
             date = str(r.get('createdOn', ''))[:10]
@@ -148,50 +430,455 @@ class IntappIntakeClient:
             state = str(r.get('currentState', ''))
             req_type = str(r.get('requestType', ''))
             name = str(r.get('name', '')).replace('|', '\\|')  # Escape pipe characters
-            
+
             lines.append(f"| {req_id} | {date} | {status} | {state} | {req_type} | {name} |")
-            
+
         return "\n".join(lines)
 
-    def get_request(self, request_id):
+    @staticmethod
+    def sanitize_filename(name):
+        """
+        Utility to convert a request title into a safe filename.
+        """
+        safe = re.sub(r'[\\/*?:\"<>|]', '', name).strip()
+        return re.sub(r'\s+', '_', safe)
+
+
+class IntappIntakeClient(IntakeClientBase):
+    """
+    A programmatic interface for the Intapp Intake API.
+    Designed for use by both human developers and AI Agents.
+    """
+    def __init__(self, base_url, token, max_workers=DEFAULT_MAX_WORKERS, pool_size=None, cache=None,
+                 token_provider=None, scheduler=None, timeout=60.0):
+        """
+        `max_workers` is the thread fan-out used by the bulk helpers. The HTTP
+        connection pool defaults to the same size so that every worker can keep
+        its own keep-alive connection; override it with `pool_size`.
+
+        `cache` is the RequestCache used by `get_request`. A default cache is
+        created when omitted; pass False to disable caching.
+
+        `token_provider` is an optional callable returning a fresh bearer
+        token. When set, a 401 response triggers one refresh and a retry, so
+        long-lived clients survive token rotation.
+
+        `scheduler` is the RequestScheduler every HTTP call goes through
+        (rate limit, adaptive concurrency, retry with backoff). By default
+        each client gets one capped at `pool_size` concurrent calls; share
+        one between clients to give them a common budget.
+
+        `timeout` (seconds, as in `requests`) bounds connecting and each read,
+        so a hung socket raises `requests.Timeout` (retried by the scheduler)
+        instead of holding a scheduler slot forever. Pass None to wait
+        indefinitely.
+        """
+        super().__init__(base_url, token, cache=cache, token_provider=token_provider)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Imported here so importing the module (e.g. for the offline CLI commands) does not load requests
+        import requests
+        self._transport_errors = (requests.ConnectionError, requests.Timeout)
+        self.pool_size = pool_size or max_workers
+        self.scheduler = scheduler or RequestScheduler(max_concurrency=self.pool_size)
+        self.session = self._create_session()
+
+    def _create_session(self):
+        """
+        Builds the shared keep-alive session used by every endpoint.
+        The adapter blocks when the pool is exhausted instead of opening
+        throwaway connections, so the pool size is a hard cap on sockets.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _apply_token(self):
+        self.session.headers.update(self.headers)
+
+    def _get(self, url, params=None, consume=None, **kwargs):
+        endpoint = endpoint_name(url)
+        attempts = 0
+        kwargs.setdefault('timeout', self.timeout)
+
+        def send():
+            nonlocal attempts
+            attempts += 1
+            self.metrics.begin(endpoint, retry=attempts > 1)
+            started = time.monotonic()
+            try:
+                token = self.token
+                response = self.session.get(url, params=params, **kwargs)
+                if response.status_code == 401 and self._refresh_token(token):
+                    response.close()
+                    response = self.session.get(url, params=params, **kwargs)
+            except BaseException:
+                self.metrics.end(endpoint, time.monotonic() - started, error=True)
+                raise
+            self.metrics.end(endpoint, time.monotonic() - started, response.status_code)
+            if not kwargs.get('stream'):
+                self.metrics.add_bytes(endpoint, len(response.content))
+            return response
+
+        return self.scheduler.call(send, url=url, consume=consume,
+                                   retry_on=self._transport_errors)
+
+    def scheduler_stats(self):
+        """
+        Returns the scheduler's current concurrency limit and retry/throttle counters.
+        """
+        return self.scheduler.stats()
+
+    def close(self):
+        """
+        Releases the pooled connections held by the client.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def list_requests(self, limit=1000, skip=0, request_types=None, modified_from=None, typed=False,
+                      modified_to=None, projection=None):
+        """
+        Retrieves a list of intake requests with optional filtering.
+        Defaults to 'Valuation Request' if no type is specified.
+        Pass `typed=True` to get compact `Request` models instead of dicts,
+        and a `Projection` to keep only some fields of each row (`id` and
+        `modifiedOn` are always kept).
+        """
+        params = self._list_params(limit, skip, request_types, modified_from, modified_to)
+        response = self._get(self._requests_url(), params=params)
+        response.raise_for_status()
+        if projection is not None:
+            projection = projection.keeping(*self.LISTING_KEYS)
+        return self._typed(self._observe_listing(self._decode(response, projection)), typed)
+
+    def iter_requests(self, page_size=1000, request_types=None, modified_from=None, max_rows=None, typed=False,
+                      modified_to=None, projection=None):
+        """
+        Streams every intake request matching the filters, walking
+        `filter.rowsToSkip` pages until the API runs out of rows.
+
+        The next page is fetched in the background while the caller consumes
+        the current one, so at most two pages are held in memory at a time.
+        Stops early once `max_rows` rows have been yielded. Pass
+        `typed=True` to get `Request` models instead of dicts, or a
+        `Projection` as in `list_requests`.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if max_rows is not None and max_rows <= 0:
+            return
+
+        def fetch(skip):
+            take = page_size if max_rows is None else min(page_size, max_rows - skip)
+            return take, self.list_requests(
+                limit=take, skip=skip, request_types=request_types, modified_from=modified_from,
+                modified_to=modified_to, projection=projection
+            )
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        pending = executor.submit(fetch, 0)
+        skip = 0
+        try:
+            while pending is not None:
+                take, page = pending.result()
+                skip += len(page)
+                done = len(page) < take or (max_rows is not None and skip >= max_rows)
+                pending = None if done else executor.submit(fetch, skip)
+                if typed:
+                    for row in page:
+                        yield Request(row)
+                else:
+                    yield from page
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_requests_partitioned(self, modified_from, modified_to=None, request_types=None, slices=None,
+                                  page_size=1000, max_workers=None, typed=False):
+        """
+        Lists every request modified in `[modified_from, modified_to)` by
+        splitting the range into `slices` time slices fetched concurrently.
+        A slice that comes back full is split again and re-fetched, so
+        nothing is cut off at the page size; a one-second slice that is still
+        full is paged through. Rows are de-duplicated by ID and yielded as
+        their slices complete (not in any particular order).
+
+        If the API turns out to ignore `filter.modifiedTo`, this falls back
+        to a serial `iter_requests` walk, still without duplicates.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        def fetch(bounds):
+            return self.list_requests(limit=page_size, request_types=request_types,
+                                      modified_from=bounds[0], modified_to=bounds[1])
+
+        seen = set()
+        leaked = False
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.max_workers)
+        pending = {}
+        try:
+            for bounds in self._time_slices(modified_from, modified_to, slices):
+                pending[executor.submit(fetch, bounds)] = bounds
+            while pending and not leaked:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    bounds = pending.pop(future)
+                    rows = future.result()
+                    if self._slice_leaked(rows, bounds):
+                        leaked = True
+                        break
+                    if len(rows) >= page_size:
+                        parts = self._split_slice(bounds, rows)
+                        if parts:
+                            for part in parts:
+                                pending[executor.submit(fetch, part)] = part
+                            continue
+                        rows = self.iter_requests(page_size, request_types, modified_from=bounds[0],
+                                                  modified_to=bounds[1])
+                    for row in rows:
+                        if row.get('id') not in seen:
+                            seen.add(row.get('id'))
+                            yield self._typed(row, typed)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        if leaked:
+            logger.warning("The API ignored filter.modifiedTo; falling back to a serial listing")
+            for row in self.iter_requests(page_size, request_types, modified_from=modified_from):
+                if row.get('id') not in seen and (not modified_to or (row.get('modifiedOn') or '')[:19] < modified_to):
+                    seen.add(row.get('id'))
+                    yield self._typed(row, typed)
+
+    def iter_request_details(self, requests_list, max_workers=None, failures=None, typed=False, projection=None):
+        """
+        Fetches full details for listing rows concurrently and yields
+        `(summary, detail)` as each arrives (`detail` is None for a 404).
+        Requests that still fail after the scheduler's retries are logged and
+        recorded in `failures` (a dict) rather than silently dropped.
+        With a `Projection` only the selected fields / answers are decoded.
+        """
+        fetch = lambda req: self.get_request(req['id'], typed=typed, projection=projection)
+        for req, detail, error in self._fan_out(requests_list, fetch, max_workers):
+            if error is not None:
+                self._record_failure(failures, req['id'], error)
+                continue
+            yield req, detail
+
+    def get_cfi_team_requests(self, limit=15, lookback_days=60, failures=None):
+        """
+        Specialized search for the CFI Team (Mark Rob as QC/Reviewer or Michael Sloan as Analyst).
+        Pass a dict as `failures` to learn which request IDs could not be checked.
+        """
+        return self.top_query(self._cfi_team_query(lookback_days), limit, failures=failures)
+
+    def top_query(self, query, limit, max_workers=None, failures=None, stats=None, typed=False):
+        """
+        Returns the `limit` highest-ID requests matching a `RequestQuery`.
+
+        Details are fetched in ID order (highest first) in waves sized from
+        the match rate seen so far, and no new fetches are scheduled once
+        `limit` matches are confirmed with no lower ID still pending, so a
+        top-15 query costs roughly 15 / match-rate detail calls rather than
+        one per request in the window. Same result as sorting every match.
+        """
+        stats = self._query_stats(stats)
+        rows = []
+        for row in self.iter_requests(**query.list_params):
+            stats['listed'] += 1
+            if query.matches_summary(row):
+                rows.append(row)
+        rows.sort(key=lambda x: x.get('id', 0), reverse=True)
+        if not query.needs_detail:
+            stats['matched'] = min(limit, len(rows))
+            return self._typed(rows[:limit], typed)
+
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        cap = max_workers or self.max_workers
+        outcomes = {}
+        pending = {}
+        matches = []
+        confirmed = 0
+        executor = ThreadPoolExecutor(max_workers=cap)
+        try:
+            while True:
+                # Matches only count once every higher ID has been checked
+                while confirmed in outcomes:
+                    detail = outcomes.pop(confirmed)
+                    confirmed += 1
+                    if detail is not None:
+                        matches.append(detail)
+                if len(matches) >= limit or confirmed >= len(rows):
+                    break
+                found = len(matches) + sum(1 for d in outcomes.values() if d is not None)
+                want = self._wave_size(limit - found, confirmed + len(outcomes), found, cap)
+                start = confirmed + len(outcomes) + len(pending)
+                for position in range(start, min(len(rows), start + max(0, want - len(pending)))):
+                    future = executor.submit(self.get_request, rows[position]['id'], typed=typed)
+                    pending[future] = position
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position = pending.pop(future)
+                    stats['fetched'] += 1
+                    try:
+                        detail = future.result()
+                    except Exception as e:
+                        self._record_failure(failures, rows[position]['id'], e)
+                        detail = None
+                    outcomes[position] = detail if detail is not None and query.matches_detail(detail) else None
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+        stats['matched'] = len(matches[:limit])
+        return matches[:limit]
+
+    def iter_query(self, query, details=None, max_workers=None, failures=None, stats=None, typed=False,
+                   partitioned=False):
+        """
+        Yields the requests matching a `RequestQuery`. Filters the API
+        supports are sent as list parameters, summary-level conditions are
+        applied to listing rows as they stream in, and details are fetched
+        (concurrently) only for rows that can still match, so detail calls
+        track the candidates rather than the whole window.
+
+        Yields full details when the query needs them (or `details=True`),
+        otherwise listing rows. Pass a dict as `stats` to get the number of
+        rows listed, details fetched and matches. `partitioned=True` lists a
+        bounded date range with `iter_requests_partitioned`.
+        """
+        stats = self._query_stats(stats)
+        params = query.list_params
+        if partitioned and params['modified_from']:
+            rows = self.iter_requests_partitioned(**params, max_workers=max_workers)
+        else:
+            rows = self.iter_requests(**params)
+
+        def candidates():
+            for row in rows:
+                stats['listed'] += 1
+                if query.matches_summary(row):
+                    yield row
+
+        if not (query.needs_detail if details is None else details):
+            for row in candidates():
+                stats['matched'] += 1
+                yield self._typed(row, typed)
+            return
+
+        for _, detail in self.iter_request_details(candidates(), max_workers, failures, typed):
+            stats['fetched'] += 1
+            if detail is not None and query.matches_detail(detail):
+                stats['matched'] += 1
+                yield detail
+
+    def get_request(self, request_id, use_cache=True, typed=False, projection=None):
         """
         Retrieves full details for a specific intake request by ID.
+        Served from the client cache when a fresh entry exists; pass
+        `use_cache=False` to force a round-trip (the result is still cached).
+        With `typed=True` a `Request` model is returned, whose answers are
+        indexed by question name.
+
+        A `Projection` (e.g. `Projection(fields=['id', 'name'],
+        questions=['ARI - Fee'])`) keeps only those fields and answers; the
+        rest of the payload is never decoded into Python objects. Projected
+        details are not cached, but are cut from a cached full detail.
         """
-        url = f"{self.base_url}/api/intake/v1/requests/{request_id}"
-        response = requests.get(url, headers=self.headers)
+        cached = self._cached_request(request_id, use_cache, projection)
+        if cached is not None:
+            return self._typed(cached, typed)
+
+        response = self._get(self._request_url(request_id))
         if response.status_code == 404:
             return None
         response.raise_for_status()
-        return response.json()
+        return self._typed(self._remember_request(request_id, self._decode(response, projection), projection), typed)
 
-    def download_attachment(self, request_id, attachment_id, output_path):
+    def download_attachment(self, request_id, attachment_id, output_path, store=None):
         """
         Downloads an attachment and saves it to the specified path.
+        The JSON body is streamed and its base64 `content` decoded chunk by
+        chunk into a temp file that is renamed into place once complete.
+
+        With an `AttachmentStore`, the bytes are kept once in the store and
+        `output_path` becomes a link to them; attachments the store already
+        holds are not downloaded again.
         """
-        import base64
-        url = f"{self.base_url}/api/intake/v1/requests/{request_id}/attachments/{attachment_id}"
-        params = {'includeContent': 'true'}
-        
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        content_b64 = data.get('content')
-        
-        if not content_b64:
-            raise ValueError(f"No content found for attachment {attachment_id}")
-            
-        file_content = base64.b64decode(content_b64)
-        
-        with open(output_path, 'wb') as f:
-            f.write(file_content)
-        
+        self._fetch_attachment(request_id, {'id': attachment_id}, output_path, store)
         return output_path
 
-    def download_all_attachments(self, request_id, output_dir):
+    def _fetch_attachment(self, request_id, attachment, output_path, store):
+        if store is None:
+            return self._download_attachment(request_id, attachment['id'], output_path)
+
+        sha256, staged = self._stage_in_store(store, attachment)
+        if staged is not None:
+            try:
+                _, sha256 = self._download_attachment(request_id, attachment['id'], staged)
+            except BaseException:
+                self._discard_partial(staged)
+                raise
+            store.commit(staged, sha256, attachment)
+        return store.materialize(sha256, output_path)
+
+    def _download_attachment(self, request_id, attachment_id, output_path):
+        params = {'includeContent': 'true'}
+
+        def consume(response):
+            with response:
+                response.raise_for_status()
+                f, tmp_path = self._open_partial(output_path)
+                received = 0
+                try:
+                    with f:
+                        writer = Base64FieldWriter(f)
+                        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                            received += len(chunk)
+                            writer.feed(chunk)
+                        result = self._finish_attachment(writer, attachment_id)
+                    self._commit_partial(tmp_path, output_path)
+                    return result
+                except BaseException:
+                    self._discard_partial(tmp_path)
+                    raise
+                finally:
+                    self.metrics.add_bytes('attachment', received)
+
+        url = self._attachment_url(request_id, attachment_id)
+        return self._get(url, params=params, stream=True, consume=consume)
+
+    def download_all_attachments(self, request_id, output_dir, max_workers=None, overwrite=False,
+                                 verify_hash=False, store=None):
         """
         Downloads all attachments for a specific request to the given directory.
         Returns a list of paths to the downloaded files.
+
+        Attachments are fetched concurrently (`max_workers`, defaulting to the
+        client's fan-out width). A manifest in `output_dir` records each file's
+        size and hash, so re-runs skip files that are already complete and
+        whose attachment metadata is unchanged; pass `overwrite=True` to
+        re-download everything, or `verify_hash=True` to re-hash files on disk.
+        Pass an `AttachmentStore` to deduplicate content across requests.
         """
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
@@ -201,61 +888,102 @@ class IntappIntakeClient:
             logger.warning(f"Request {request_id} not found.")
             return []
 
-        attachments = request.get('attachments', [])
-        downloaded_files = []
+        manifest = AttachmentManifest(output_dir)
+        todo, downloaded_files = self._plan_downloads(request, output_dir, manifest, overwrite, verify_hash)
 
-        for att in attachments:
-            att_id = att.get('id')
-            raw_name = att.get('fileName') or att.get('name')
-            if not att_id or not raw_name:
+        fetch = lambda target: self._fetch_attachment(request_id, target[3], target[2], store)
+        for target, result, error in self._fan_out(todo, fetch, max_workers):
+            att_id, raw_name, output_path, _ = target
+            if error is not None:
+                logger.error(f"Failed to download attachment {att_id} ({raw_name}): {error}")
                 continue
-
-            safe_name = self.sanitize_filename(raw_name)
-            output_path = os.path.join(output_dir, safe_name)
-            
-            try:
-                self.download_attachment(request_id, att_id, output_path)
-                downloaded_files.append(output_path)
-                logger.info(f"Downloaded: {output_path}")
-            except Exception as e:
-                logger.error(f"Failed to download attachment {att_id} ({raw_name}): {e}")
+            self._record_download(manifest, request_id, target, *result)
+            downloaded_files.append(output_path)
+            logger.info(f"Downloaded: {output_path}")
 
         return downloaded_files
 
-    def search_requests_by_answer(self, query, limit=50):
+    def _fan_out(self, items, fn, max_workers=None):
         """
-        Searches the most recent requests for a specific string in any answer field.
-        Returns a list of matching requests with the specific matching field details.
+        Runs `fn` over `items` on a bounded thread pool and yields
+        `(item, result, error)` as each call completes. Items are pulled lazily
+        so at most `max_workers` calls are in flight; closing the generator
+        cancels everything that has not started yet.
         """
-        results = []
-        requests_list = self.list_requests()[:limit]
-        
-        for req in requests_list:
-            req_id = req['id']
-            try:
-                detail = self.get_request(req_id)
-                if not detail:
-                    continue
-                
-                answers = detail.get('answers', [])
-                for a in answers:
-                    display_val = str(a.get('displayValue', ''))
-                    if query.lower() in display_val.lower():
-                        results.append({
-                            'request_id': req_id,
-                            'request_name': req['name'],
-                            'field_name': a.get('questionName'),
-                            'value': display_val
-                        })
-            except Exception as e:
-                logger.error(f"Error searching request {req_id}: {e}")
-                
-        return results
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-    @staticmethod
-    def sanitize_filename(name):
+        max_workers = max_workers or self.max_workers
+        items = iter(items)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            for item in islice(items, max_workers):
+                pending[executor.submit(fn, item)] = item
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    for next_item in islice(items, 1):
+                        pending[executor.submit(fn, next_item)] = next_item
+                    try:
+                        yield item, future.result(), None
+                    except Exception as e:
+                        yield item, None, e
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search_answers(self, query, limit, max_matches, max_workers, failures=None):
+        needle = query.lower()
+        found = 0
+        listing = enumerate(self.iter_requests(max_rows=limit))
+        fetch = lambda entry: self.get_request(entry[1]['id'])
+        # With `max_matches`, each request's matches are held until every earlier request is checked,
+        # so the search stops at the first N matches in listing order whatever order fetches finish in
+        held = {}
+        confirmed = 0
+
+        for (position, req), detail, error in self._fan_out(listing, fetch, max_workers):
+            if error is not None:
+                self._record_failure(failures, req['id'], error)
+                detail = None
+            matches = list(self._answer_matches(req, detail, needle)) if detail else []
+            if max_matches is None:
+                for match in matches:
+                    yield position, match
+                continue
+
+            held[position] = matches
+            while confirmed in held:
+                for match in held.pop(confirmed):
+                    yield confirmed, match
+                    found += 1
+                    if found >= max_matches:
+                        return
+                confirmed += 1
+
+    def iter_search_requests_by_answer(self, query, limit=50, max_matches=None, max_workers=None, failures=None):
         """
-        Utility to convert a request title into a safe filename.
+        Streaming form of `search_requests_by_answer`: fetches request details
+        concurrently and yields each matching field as soon as its request
+        arrives. With `max_matches`, matches are instead yielded in listing
+        order (once every earlier request has been checked), so the first
+        `max_matches` in listing order are returned; outstanding fetches are
+        cancelled once they have been yielded (or when the caller stops
+        iterating).
         """
-        safe = re.sub(r'[\\/*?:\"<>|]', '', name).strip()
-        return re.sub(r'\s+', '_', safe)
+        for _, match in self._search_answers(query, limit, max_matches, max_workers, failures):
+            yield match
+
+    def search_requests_by_answer(self, query, limit=50, max_matches=None, max_workers=None, failures=None):
+        """
+        Searches the most recent requests for a specific string in any answer field.
+        Returns a list of matching requests with the specific matching field details,
+        in listing order. With `max_matches`, returns the first `max_matches`
+        matches in listing order and stops fetching once they are known.
+        Requests that could not be fetched are recorded in `failures` (a dict) when given.
+        """
+        results = list(self._search_answers(query, limit, max_matches, max_workers, failures))
+        results.sort(key=lambda entry: entry[0])
+        return [match for _, match in results]
@@ -0,0 +1,30 @@
+"""
+Subcommands of the `intapp` CLI (see `intapp_sdk.cli`). Each module has a
+`main(argv=None, prog=None)`; the scripts in `tools/` are thin wrappers
+around the same functions.
+"""
+
+
+def load_dotenv():
+    """
+    Loads `.env` when python-dotenv is installed (it is optional for the CLI),
+    looking in the working directory first so an installed `intapp` picks up
+    the project's file.
+    """
+    try:
+        from dotenv import find_dotenv, load_dotenv as load
+    except ImportError:
+        return
+    load(find_dotenv(usecwd=True) or None)
+
+
+def connect(**kwargs):
+    """
+    An `IntappIntakeClient` for the configured tenant. The token comes from
+    the token cache when possible, and a 401 re-resolves it bypassing the cache.
+    """
+    from ..auth import get_intapp_base_url, get_intapp_token
+    from ..client import IntappIntakeClient
+
+    return IntappIntakeClient(get_intapp_base_url(), get_intapp_token(),
+                              token_provider=lambda: get_intapp_token(use_cache=False), **kwargs)
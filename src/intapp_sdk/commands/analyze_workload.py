@@ -0,0 +1,115 @@
+import argparse
+from collections import Counter
+
+from . import connect, load_dotenv
+from ..metrics import format_stats
+from ..query import RequestQuery
+
+def print_trend(history, weeks):
+    """
+    Prints aging and flow figures computed from the local workload history.
+    """
+    from datetime import datetime, timedelta
+    until = datetime.now()
+    since = until - timedelta(weeks=weeks)
+
+    print(f"\nTime in State (stays ended in the last {weeks} weeks, plus open ones):")
+    print("-" * 90)
+    print(f"{'Current State':<40} | {'Done':>5} | {'Mean':>6} | {'Median':>6} | {'P90':>6} | {'Open':>5} | {'Age':>6}")
+    print("-" * 90)
+    fmt = lambda v: "-" if v is None else f"{v:.1f}"
+    for state, s in history.time_in_state(since=since, until=until, now=until).items():
+        print(f"{state:<40} | {s['completed']:>5} | {fmt(s['mean_days']):>6} | {fmt(s['median_days']):>6} | "
+              f"{fmt(s['p90_days']):>6} | {s['open']:>5} | {fmt(s['open_mean_days']):>6}")
+
+    throughput = history.throughput(since=since, until=until)
+    backlog = history.backlog(since=since, until=until)
+    states = Counter()
+    for counts in backlog.values():
+        states.update(counts)
+    states = [state for state, _ in states.most_common(5)]
+
+    print("\nWeekly Throughput (requests leaving) and Backlog (active at week end):")
+    print("-" * 90)
+    print(f"{'Week starting':<20} | {'Left':>5} | {'Backlog':>7} | " + " | ".join(f"{s[:14]:>14}" for s in states))
+    print("-" * 90)
+    for (week, left), counts in zip(throughput.items(), backlog.values()):
+        print(f"{week[:10]:<20} | {sum(left.values()):>5} | {sum(counts.values()):>7} | "
+              + " | ".join(f"{counts.get(s, 0):>14}" for s in states))
+
+def main(argv=None, prog=None):
+    # Imported when the command runs; `requests` is only loaded once a client is connected
+    from ..client import IntappIntakeClient
+    from ..history import WorkloadHistory, DEFAULT_HISTORY_PATH
+    from ..mirror import RequestMirror, DEFAULT_MIRROR_PATH
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(prog=prog, description="Summarize InProgress valuation requests by workflow state.")
+    parser.add_argument("--mirror", nargs="?", const=DEFAULT_MIRROR_PATH,
+                        help=f"Answer from a local mirror, syncing changes first (default path: {DEFAULT_MIRROR_PATH})")
+    parser.add_argument("--history", nargs="?", const=DEFAULT_HISTORY_PATH,
+                        help=f"Record a state snapshot into a local history and answer from it (default path: {DEFAULT_HISTORY_PATH})")
+    parser.add_argument("--trend", nargs="?", type=int, const=12, metavar="WEEKS",
+                        help="With --history, also print time-in-state, weekly throughput and backlog (default: 12 weeks)")
+    parser.add_argument("--offline", action="store_true", help="With --mirror/--history, skip the sync and use local data only")
+    parser.add_argument("--stats", action="store_true", help="Print per-endpoint API latency, retry and cache metrics at the end")
+    args = parser.parse_args(argv)
+
+    print("Analyzing current Intapp workload (InProgress Valuation Requests)...")
+    
+    client = None
+    try:
+        # Stream all valuation requests modified in the last 60 days
+        from datetime import datetime, timedelta
+        sixty_days_ago = (datetime.now() - timedelta(days=60)).strftime("%Y-%m-%dT%H:%M:%S")
+        
+        if args.history:
+            client = None if args.offline else connect()
+            history = WorkloadHistory(args.history)
+            if client:
+                history.sync(client)
+            active_requests = history.current(status="InProgress", modified_from=sixty_days_ago)
+        elif args.mirror:
+            client = None if args.offline else connect()
+            mirror = RequestMirror(args.mirror, client)
+            if client:
+                mirror.sync(fetch_details=False)
+            active_requests = mirror.list_requests(status="InProgress", modified_from=sixty_days_ago)
+        else:
+            client = connect()
+            # Filter for InProgress while streaming through every page; no details are needed
+            query = RequestQuery(status="InProgress", modified_from=sixty_days_ago)
+            active_requests = list(client.iter_query(query))
+        
+        if not active_requests:
+            print("No InProgress requests found in the last 60 days.")
+            return
+
+        print(f"\nSummary of {len(active_requests)} Active Requests:")
+        print("-" * 60)
+        
+        # Breakdown by Current State
+        state_counts = Counter(r.get('currentState', 'Unknown') for r in active_requests)
+        print(f"{ 'Current State':<40} | {'Count'}")
+        print("-" * 60)
+        for state, count in state_counts.most_common():
+            print(f"{state:<40} | {count}")
+            
+        # Optional: Show the top 5 oldest active requests
+        print("\nTop 5 Oldest Active Requests (Might need attention):")
+        active_requests.sort(key=lambda x: x.get('createdOn', ''))
+        print(IntappIntakeClient.format_request_table(active_requests[:5]))
+
+        if args.history and args.trend:
+            print_trend(history, args.trend)
+        
+    except Exception as e:
+        print(f"Error during analysis: {e}")
+    finally:
+        if args.stats and client:
+            print("\nAPI metrics:")
+            print(format_stats(client.stats()))
+
+if __name__ == "__main__":
+    main()
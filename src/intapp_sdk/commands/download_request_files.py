@@ -0,0 +1,86 @@
+import argparse
+import os
+
+"""
+Download Request Files Tool
+---------------------------
+Downloads all attachments for a specific Intapp request.
+Files are saved to a directory named 'downloads_<request_id>' by default,
+or a custom directory if specified. Re-running against the same directory
+only transfers attachments that are missing or changed. With --store, file
+bytes are kept once in a shared content-addressed store and the output
+directory is filled with hardlinks, so attachments shared across requests
+are downloaded and stored only once.
+
+Usage:
+    python tools/download_request_files.py <REQUEST_ID> [--output-dir <DIR>] [--workers N] [--force] [--store [PATH]] [--stats]
+
+Example:
+    python tools/download_request_files.py 528623
+"""
+
+from . import connect
+from ..metrics import format_stats
+from ..store import AttachmentStore, DEFAULT_STORE_ROOT
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Download all attachments for an Intapp Request.")
+    parser.add_argument("request_id", type=int, help="The Request ID")
+    parser.add_argument("--output-dir", help="Directory to save files (default: downloads_<request_id>)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads (default: 8)")
+    parser.add_argument("--force", action="store_true", help="Re-download files already present in the manifest")
+    parser.add_argument("--verify", action="store_true", help="Re-hash existing files before skipping them")
+    parser.add_argument("--store", nargs="?", const=DEFAULT_STORE_ROOT, metavar="PATH",
+                        help=f"Deduplicate through a shared attachment store (default path: {DEFAULT_STORE_ROOT})")
+    parser.add_argument("--stats", action="store_true", help="Print per-endpoint API latency, retry and cache metrics at the end")
+    
+    args = parser.parse_args(argv)
+    
+    # Determine output directory
+    if args.output_dir:
+        output_dir = args.output_dir
+    else:
+        output_dir = os.path.join(os.getcwd(), f"downloads_{args.request_id}")
+
+    try:
+        client = connect()
+    except Exception as e:
+        print(f"Authentication Error: {e}")
+        return
+
+    store = AttachmentStore(args.store) if args.store else None
+    
+    print(f"Fetching request {args.request_id}...")
+    # We verify request exists first
+    req = client.get_request(args.request_id)
+    if not req:
+        print("Request not found.")
+        return
+
+    count = len(req.get('attachments', []))
+    print(f"Found {count} attachments.")
+    
+    if count == 0:
+        return
+
+    print(f"Downloading to: {output_dir}")
+    try:
+        downloaded = client.download_all_attachments(
+            args.request_id, output_dir, max_workers=args.workers, overwrite=args.force, verify_hash=args.verify,
+            store=store
+        )
+        print(f"\n{len(downloaded)} files up to date:")
+        for path in downloaded:
+            print(f" - {os.path.basename(path)}")
+        if store:
+            stats = store.stats()
+            print(f"Store {stats['root']}: {stats['objects']} objects, {stats['bytes']} bytes")
+    except Exception as e:
+        print(f"Error downloading files: {e}")
+    finally:
+        if args.stats:
+            print("\nAPI metrics:")
+            print(format_stats(client.stats()))
+
+if __name__ == "__main__":
+    main()
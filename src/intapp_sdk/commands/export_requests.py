@@ -0,0 +1,102 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+"""
+Export Requests Tool
+--------------------
+Streams requests and their answers into columnar files for analysis, so a
+notebook can load tens of thousands of requests without calling the API.
+
+Usage:
+    python tools/export_requests.py [--days 365] [--status InProgress] [-o data/export]
+    python tools/export_requests.py --answers wide --question "ARI - Fee" --question "ARI - Assigned Analyst"
+    python tools/export_requests.py --mirror --offline --format jsonl
+
+Writes `requests.<ext>` (one row per request) and, with the default long
+layout, `answers.<ext>` (one row per request and question). Parquet is used
+when `pyarrow` is installed, CSV otherwise:
+
+    import pandas as pd
+    requests = pd.read_parquet("data/export/requests.parquet")
+    answers = pd.read_parquet("data/export/answers.parquet")
+"""
+
+from . import connect, load_dotenv
+from ..export import ANSWER_LAYOUTS, FORMATS, RequestExporter
+from ..metrics import format_stats
+from ..query import RequestQuery
+
+def main(argv=None, prog=None):
+    # Imported when the command runs; an offline mirror export never loads `requests`
+    from ..mirror import RequestMirror, DEFAULT_MIRROR_PATH
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(prog=prog, description="Export Intapp requests and answers to Parquet, CSV or JSON Lines.")
+    parser.add_argument("-o", "--output-dir", default=os.path.join("data", "export"), help="Directory for the exported files (default: data/export)")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: parquet if pyarrow is installed, else csv)")
+    parser.add_argument("--answers", choices=ANSWER_LAYOUTS, default="long",
+                        help="long: separate answers table; wide: one column per question; none: request fields only")
+    parser.add_argument("--question", action="append", dest="questions", metavar="NAME",
+                        help="With --answers wide, a question to export as a column (repeatable; default: those seen in the first batch)")
+    parser.add_argument("-t", "--type", default="Valuation Request", help="Request type to export (default: 'Valuation Request')")
+    parser.add_argument("--all-types", action="store_true", help="Export every request type (ignores -t)")
+    parser.add_argument("--status", help="Only export requests with this status")
+    parser.add_argument("--days", type=int, default=365, help="Requests modified in the last N days (default: 365)")
+    parser.add_argument("--workers", type=int, help="Concurrent detail fetches (default: client setting)")
+    parser.add_argument("--mirror", nargs="?", const=DEFAULT_MIRROR_PATH,
+                        help=f"Export from a local mirror, syncing changes first (default path: {DEFAULT_MIRROR_PATH})")
+    parser.add_argument("--offline", action="store_true", help="With --mirror, skip the sync and use local data only")
+    parser.add_argument("--stats", action="store_true", help="Print per-endpoint API latency, retry and cache metrics at the end")
+    args = parser.parse_args(argv)
+
+    modified_from = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%dT%H:%M:%S")
+    query = RequestQuery(request_types=[] if args.all_types else [args.type], status=args.status,
+                         modified_from=modified_from)
+    with_answers = args.answers != "none"
+
+    client = None
+    failures = {}
+    try:
+        exporter = RequestExporter(args.output_dir, args.format, args.answers, args.questions)
+        if args.mirror:
+            client = None if args.offline else connect()
+            mirror = RequestMirror(args.mirror, client)
+            if client:
+                mirror.sync(fetch_details=with_answers)
+            if with_answers:
+                rows = (d for d in mirror.iter_details(modified_from=modified_from) if query.matches_detail(d))
+            else:
+                rows = mirror.list_requests(status=args.status, request_types=query.request_types,
+                                            modified_from=modified_from)
+        else:
+            client = connect()
+            rows = client.iter_query(query, details=with_answers, max_workers=args.workers, failures=failures)
+
+        print(f"Exporting {args.answers} answers as {exporter.format} to {args.output_dir}...", file=sys.stderr)
+        with exporter:
+            for count, row in enumerate(rows, 1):
+                exporter.write(row)
+                if count % 1000 == 0:
+                    print(f"  {count} requests exported...", file=sys.stderr)
+
+        stats = exporter.stats
+        print(f"Exported {stats['requests']} requests and {stats['answers']} answers:")
+        for path in exporter.paths.values():
+            print(f"  {path}")
+        if stats['dropped_answers']:
+            print(f"  ({stats['dropped_answers']} answers to questions outside the wide columns were skipped)")
+        if failures:
+            print(f"Warning: {len(failures)} requests could not be fetched: {sorted(failures)[:20]}", file=sys.stderr)
+
+    except Exception as e:
+        print(f"Error during export: {e}")
+    finally:
+        if args.stats and client:
+            print("\nAPI metrics:")
+            print(format_stats(client.stats()))
+
+if __name__ == "__main__":
+    main()
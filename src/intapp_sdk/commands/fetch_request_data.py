@@ -0,0 +1,388 @@
+import argparse
+import csv
+import json
+import sys
+import re
+from itertools import islice
+
+"""
+Fetch Request Data Tool
+-----------------------
+A unified tool to retrieve various details about an Intapp request.
+Combines functionality for retrieving People, Dates, Valuation Details,
+General Info, and Financials (Fee/Materiality).
+
+Usage:
+    python tools/fetch_request_data.py <REQUEST_ID> [options]
+    python tools/fetch_request_data.py <ID> <ID> ... --output sheet.csv [options]
+    python tools/fetch_request_data.py --ids-file ids.txt --output sheet.jsonl [options]
+    python tools/fetch_request_data.py --query [--status InProgress] [--days 60] --output sheet.csv
+
+Batch mode (several IDs, --ids-file, --query or --output) fetches the details
+concurrently and writes one row per request to CSV or JSON Lines as each
+completes (stdout when --output is omitted).
+
+Options:
+    --all           Fetch all available data (default)
+    --people        Fetch team and personnel info
+    --dates         Fetch key dates
+    --valuation     Fetch technical valuation details
+    --general       Fetch general scope and client info
+    --financials    Fetch fee and materiality info
+    --attachments   Fetch the attachment list
+"""
+
+from . import connect
+from ..decoding import Projection
+from ..models import Request, parse_people
+
+def parse_name_email(value):
+    """Parses 'Name (email)' format into separate components."""
+    if not value or value == "None":
+        return None, None
+    match = re.search(r'(.*?)\s*\((.*?@.*?)\)', value)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return value.strip(), None
+
+def get_answers_map(request):
+    # Typed requests already index their answers by question name
+    if isinstance(request, Request):
+        return request.answers or {}
+    return {ans.get('questionName'): ans for ans in request.get('answers', [])}
+
+def print_section(title, data):
+    print(f"\n[{title}]")
+    print("-" * 60)
+    for k, v in data.items():
+        if isinstance(v, list):
+            print(f"{k}:")
+            for item in v:
+                if isinstance(item, dict):
+                    # specific formatting for people list
+                    print(f"  - Name: {item.get('name', 'N/A'):<25} Email: {item.get('email', 'N/A')}")
+                else:
+                    print(f"  - {item}")
+        elif isinstance(v, dict):
+             # specific formatting for single person
+             print(f"{k:<25}: {v.get('name', 'N/A')}")
+             if v.get('email'):
+                 print(f"{ ' ' * 27}Email: {v.get('email')}")
+        else:
+            # Handle long text
+            val_str = str(v)
+            if len(val_str) > 80:
+                print(f"{k}:")
+                print(f"  {val_str}")
+            else:
+                print(f"{k:<25}: {v}")
+
+def fetch_people(request, answers):
+    people_data = {}
+    
+    # Creator
+    creator = request.get('requestedBy') or request.get('createdBy')
+    people_data['Creator'] = {'name': creator, 'email': None}
+
+    # Helper
+    def process(key, label):
+        val = answers.get(key, {}).get('displayValue')
+        n, e = parse_name_email(val)
+        people_data[label] = {'name': n, 'email': e}
+
+    process('ARI - Partner Assigned', 'CVG QC')
+    process('ARI - Assigned Analyst', 'CVG Analyst')
+    process('ARI - Engagement Partner', 'Engagement Shareholder')
+    process('ARI - Engagement Quality Reviewer', 'Engagement Quality Reviewer')
+
+    # Additional Analysts and Other Audit Team hold several 'Name (email)' entries
+    add_analysts = answers.get('ARI - Additional Analyst', {}).get('displayValue')
+    people_data['Additional Analysts'] = [{'name': n, 'email': e} for n, e in parse_people(add_analysts)]
+
+    team = answers.get('RSD - Engagement Team Members', {}).get('displayValue')
+    people_data['Other Audit Team'] = [{'name': n, 'email': e} for n, e in parse_people(team)]
+
+    return people_data
+
+def fetch_dates(request, answers):
+    dates = {}
+    # Helper to find value even if key is slightly different (though map keys are exact from API)
+    # We use the exact keys found in previous dumps
+    
+    def get_val(key):
+        return answers.get(key, {}).get('displayValue') or "Not found"
+
+    dates["Valuation Date"] = get_val("ARI - ValuationDate")
+    dates["Docs Upload Expected"] = get_val("ARI - DeliverabletoMVG")
+    dates["Requested Due Date"] = get_val("ARI - Due Date")
+    dates["Issuance/Filing Date"] = get_val("ARI - Filing Date")
+    dates["Planning Meeting Date"] = get_val("ARI - Planning Date")
+    
+    return dates
+
+def fetch_valuation(request, answers):
+    def get_val(key):
+        return answers.get(key, {}).get('displayValue') or "Not specified"
+
+    return {
+        "Valuation Category": get_val('ARI - Category'),
+        "Valuation Type": get_val('ARI - SubType') if get_val('ARI - SubType') != "Not specified" else get_val('ARI - ValuationOtherType'),
+        "Monte Carlo Sim?": get_val('ARI - Monte Carlo'),
+        "Reporting Framework": get_val('RSD - Accounting Basis') if get_val('RSD - Accounting Basis') != "Not specified" else get_val('ARI - FrameworkOther'),
+        "Applicable Standards": get_val('ARI - Standard'),
+        "Balance Sheet Class": get_val('ARI - ClassType'),
+        "Specialist Firm": get_val('ARI - Appraisal Firm') if get_val('ARI - Appraisal Firm') != "Not specified" else get_val('ARI - Appraiser')
+    }
+
+def fetch_general(request, answers):
+    def get_val(key, default="Not specified"):
+        return answers.get(key, {}).get('displayValue') or default
+
+    return {
+        "Client Name": request.get('clientName') or get_val('ARI - Client Name'),
+        "Public Company": get_val('ARI - Public Company', "No"),
+        "Ticker": get_val('ARI - PublicTicker', "N/A"),
+        "Current State": request.get('currentState'),
+        "Created Date": request.get('createdOn'),
+        "Scope": get_val('ARI - Scope'),
+        "Document Matters": get_val('ARI - Informmatters', "None"),
+        "Expected Deliverable": get_val('ARI - ExpecftedDeliverable'),
+        "Docs Provided Now?": get_val('ARI - PBCBeforehand', "Unknown")
+    }
+
+def fetch_financials(request, answers):
+    def get_val(key):
+        # Prefer displayValue, fallback to numeric/text
+        a = answers.get(key, {})
+        return a.get('displayValue') or a.get('numericAnswer') or a.get('textAnswer') or "Not found"
+
+    return {
+        "Fee": get_val("ARI - Fee"),
+        "Materiality (Trivial)": get_val("ARI - Materiality Trivial"),
+        "Materiality (Perf)": get_val("ARI - Materiality Performance")
+    }
+
+def fetch_attachments(request, answers):
+    return [att.get('fileName') or att.get('name') or "Unknown" for att in request.get('attachments', [])]
+
+SECTIONS = [
+    ('general', "General Info", fetch_general),
+    ('dates', "Key Dates", fetch_dates),
+    ('people', "People & Team", fetch_people),
+    ('financials', "Financials", fetch_financials),
+    ('valuation', "Valuation Details", fetch_valuation),
+]
+
+# Top-level fields and questions each section reads; batch mode decodes only these
+SECTION_INPUTS = {
+    'general': (('clientName', 'currentState', 'createdOn'),
+                ('ARI - Client Name', 'ARI - Public Company', 'ARI - PublicTicker', 'ARI - Scope',
+                 'ARI - Informmatters', 'ARI - ExpecftedDeliverable', 'ARI - PBCBeforehand')),
+    'dates': ((), ('ARI - ValuationDate', 'ARI - DeliverabletoMVG', 'ARI - Due Date', 'ARI - Filing Date',
+                   'ARI - Planning Date')),
+    'people': (('requestedBy', 'createdBy'),
+               ('ARI - Partner Assigned', 'ARI - Assigned Analyst', 'ARI - Engagement Partner',
+                'ARI - Engagement Quality Reviewer', 'ARI - Additional Analyst', 'RSD - Engagement Team Members')),
+    'financials': ((), ('ARI - Fee', 'ARI - Materiality Trivial', 'ARI - Materiality Performance')),
+    'valuation': ((), ('ARI - Category', 'ARI - SubType', 'ARI - ValuationOtherType', 'ARI - Monte Carlo',
+                       'RSD - Accounting Basis', 'ARI - FrameworkOther', 'ARI - Standard', 'ARI - ClassType',
+                       'ARI - Appraisal Firm', 'ARI - Appraiser')),
+}
+
+def section_projection(sections, attachments=False):
+    """A Projection keeping just what `extract_record` reads for these sections."""
+    fields = ['id', 'name']
+    questions = []
+    for key in sections:
+        section_fields, section_questions = SECTION_INPUTS[key]
+        fields.extend(section_fields)
+        questions.extend(section_questions)
+    if attachments:
+        fields.append('attachments')
+    return Projection(fields=fields, questions=questions, answer_fields=['displayValue', 'numericAnswer', 'textAnswer'])
+
+def format_person(person):
+    if not person.get('name'):
+        return ""
+    return f"{person['name']} ({person['email']})" if person.get('email') else person['name']
+
+def extract_record(request, sections, attachments=False):
+    """Runs the selected extractors on one request and returns {section title: data}."""
+    answers = get_answers_map(request)
+    record = {"Request ID": request.get('id'), "Request Name": request.get('name')}
+    for key, title, fetch in SECTIONS:
+        if key in sections:
+            record[title] = fetch(request, answers)
+    if attachments:
+        record["Attachments"] = fetch_attachments(request, answers)
+    return record
+
+def flatten_record(record):
+    """Flattens a record into one CSV row; people become 'Name (email)', lists are joined with '; '."""
+    row = {}
+    for title, data in record.items():
+        if not isinstance(data, dict):
+            row[title] = "; ".join(data) if isinstance(data, list) else data
+            continue
+        for label, value in data.items():
+            if isinstance(value, dict):
+                value = format_person(value)
+            elif isinstance(value, list):
+                value = "; ".join(filter(None, (format_person(v) if isinstance(v, dict) else str(v) for v in value)))
+            row[label] = value
+    return row
+
+class RecordWriter:
+    """Streams records to CSV or JSON Lines, flushing after every row."""
+
+    def __init__(self, f, fmt):
+        self.f = f
+        self.fmt = fmt
+        self.csv = None
+
+    def write(self, record):
+        if self.fmt == 'jsonl':
+            self.f.write(json.dumps(record, default=str) + "\n")
+        else:
+            row = flatten_record(record)
+            if self.csv is None:
+                # Every record has the same sections, so the first row fixes the columns
+                self.csv = csv.DictWriter(self.f, fieldnames=list(row), extrasaction='ignore')
+                self.csv.writeheader()
+            self.csv.writerow(row)
+        self.f.flush()
+
+def read_ids(path):
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        ids = []
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            ids.extend(int(part) for part in re.split(r'[\s,]+', line) if part)
+        return ids
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def select_requests(client, args):
+    """Listing rows (or bare {'id': ...} stubs) for batch mode, de-duplicated in input order."""
+    if args.query:
+        rows = client.iter_requests(
+            request_types=[] if args.all_types else [args.type],
+            modified_from=client._lookback_start(args.days),
+        )
+        if args.status:
+            rows = (r for r in rows if r.get('status') == args.status)
+        return list(islice(rows, args.limit))
+
+    return [{'id': request_id} for request_id in dict.fromkeys(args.request_ids)]
+
+def run_batch(client, args, sections):
+    requests_list = select_requests(client, args)
+    if not requests_list:
+        print("No requests to fetch.", file=sys.stderr)
+        return
+
+    fmt = args.format or ('jsonl' if args.output and args.output.endswith(('.jsonl', '.json')) else 'csv')
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    failures = {}
+    written = 0
+    print(f"Fetching {len(requests_list)} requests...", file=sys.stderr)
+    try:
+        writer = RecordWriter(out, fmt)
+        details = client.iter_request_details(requests_list, max_workers=args.workers, failures=failures, typed=True,
+                                              projection=section_projection(sections, args.attachments))
+        for summary, request in details:
+            if request is None:
+                failures[summary['id']] = "not found"
+                continue
+            writer.write(extract_record(request, sections, args.attachments))
+            written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Wrote {written} rows{f' to {args.output}' if args.output else ''}.", file=sys.stderr)
+    if failures:
+        print(f"{len(failures)} requests failed:", file=sys.stderr)
+        for request_id, error in failures.items():
+            print(f"  - {request_id}: {error}", file=sys.stderr)
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Fetch unified data for one or many Intapp Requests.")
+    parser.add_argument("request_ids", type=int, nargs="*", metavar="REQUEST_ID", help="Request ID(s)")
+    parser.add_argument("--ids-file", help="File with request IDs (one per line, '#' comments; '-' for stdin)")
+    parser.add_argument("--query", action="store_true", help="Select the requests from a listing query instead of IDs")
+    parser.add_argument("-t", "--type", default="Valuation Request", help="With --query: request type (default: 'Valuation Request')")
+    parser.add_argument("--all-types", action="store_true", help="With --query: any request type (ignores -t)")
+    parser.add_argument("--status", help="With --query: only requests with this status (e.g. InProgress)")
+    parser.add_argument("--days", type=int, default=60, help="With --query: modified within this many days (default: 60)")
+    parser.add_argument("--limit", type=int, default=None, help="With --query: at most this many requests")
+    parser.add_argument("-o", "--output", help="Batch output file (.csv or .jsonl); stdout if omitted")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Batch output format (default: from --output, else csv)")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent detail fetches in batch mode (default: client max_workers)")
+    parser.add_argument("--all", action="store_true", help="Fetch all sections (default)")
+    parser.add_argument("--people", action="store_true", help="Fetch people/team info")
+    parser.add_argument("--dates", action="store_true", help="Fetch key dates")
+    parser.add_argument("--valuation", action="store_true", help="Fetch valuation details")
+    parser.add_argument("--general", action="store_true", help="Fetch general info")
+    parser.add_argument("--financials", action="store_true", help="Fetch fee and materiality")
+    parser.add_argument("--attachments", action="store_true", help="Fetch attachment list")
+    
+    args = parser.parse_args(argv)
+
+    batch = len(args.request_ids) > 1 or args.ids_file or args.query or args.output
+    if not batch and not args.request_ids:
+        parser.error("give a REQUEST_ID, several IDs, --ids-file or --query")
+    if args.ids_file:
+        # Read before connecting, so a bad file is reported as a usage error rather than a traceback
+        try:
+            args.request_ids = list(args.request_ids) + read_ids(args.ids_file)
+        except OSError as e:
+            parser.error(f"cannot read --ids-file: {e}")
+        except ValueError as e:
+            parser.error(f"bad request ID in --ids-file {args.ids_file}: {e}")
+
+    # Default to all if no specific flag set
+    if not any([args.people, args.dates, args.valuation, args.general, args.financials, args.attachments]):
+        args.all = True
+    args.attachments = args.attachments or args.all
+    sections = {key for key, _, _ in SECTIONS if args.all or getattr(args, key)}
+
+    try:
+        client = connect()
+    except Exception as e:
+        print(f"Authentication Error: {e}")
+        return
+
+    if batch:
+        run_batch(client, args, sections)
+        return
+
+    request_id = args.request_ids[0]
+    print(f"Fetching data for Request {request_id}...")
+    request = client.get_request(request_id, typed=True)
+    
+    if not request:
+        print("Request not found.")
+        return
+
+    answers_map = get_answers_map(request)
+
+    for key, title, fetch in SECTIONS:
+        if key in sections:
+            print_section(title, fetch(request, answers_map))
+
+    if args.attachments:
+        atts = request.get('attachments', [])
+        print(f"\n[Attachments] (Count: {len(atts)})")
+        print("-" * 60)
+        if atts:
+            for att in atts:
+                name = att.get('fileName') or att.get('name') or "Unknown"
+                print(f"  - {name} (ID: {att.get('id')})")
+        else:
+            print("  No attachments found.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import sys
+import argparse
+
+from . import connect, load_dotenv
+from ..metrics import format_stats
+
+def main(argv=None, prog=None):
+    # Set UTF-8 encoding for stdout
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(prog=prog, description="List recent Intapp requests.")
+    parser.add_argument("-n", "--count", type=int, default=15, help="Number of requests to return (default: 15)")
+    parser.add_argument("-t", "--type", type=str, default="Valuation Request", help="Request type to filter by (default: 'Valuation Request')")
+    parser.add_argument("--all", action="store_true", help="List all request types (ignores -t)")
+    parser.add_argument("-o", "--output", type=str, help="Output file path (.md file)")
+    parser.add_argument("--stats", action="store_true", help="Print per-endpoint API latency, retry and cache metrics at the end")
+    
+    args = parser.parse_args(argv)
+
+    client = connect()
+    
+    req_type = None if args.all else [args.type]
+    type_display = "All Types" if args.all else args.type
+    
+    # Calculate a date 30 days ago to ensure we get recent items
+    from datetime import datetime, timedelta
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S")
+    
+    print(f"Fetching the {args.count} most recent requests ({type_display})...")
+    
+    try:
+        # Fetch every page since 30 days ago to ensure accurate local sorting
+        requests = list(client.iter_requests(
+            request_types=req_type,
+            modified_from=thirty_days_ago
+        ))
+        
+        # Sort by createdOn descending
+        requests.sort(key=lambda x: x.get('createdOn', ''), reverse=True)
+        
+        print(f"\nFound {len(requests)} matching requests modified recently.")
+        
+        recent_requests = requests[:args.count]
+        
+        if args.output:
+            # Output to markdown file
+            markdown_table = client.format_request_table_markdown(recent_requests)
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(f"# {args.count} Most Recent Requests ({type_display})\n\n")
+                f.write(f"Found {len(requests)} matching requests modified recently.\n\n")
+                f.write(markdown_table)
+            print(f"\n{args.count} Most Recent Results:")
+            print(client.format_request_table(recent_requests))
+            print(f"\n✓ Table saved to {args.output}")
+        else:
+            print(f"\n{args.count} Most Recent Results:")
+            print(client.format_request_table(recent_requests))
+        
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if args.stats:
+            print("\nAPI metrics:")
+            print(format_stats(client.stats()))
+
+if __name__ == "__main__":
+    main()
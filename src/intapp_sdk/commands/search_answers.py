@@ -0,0 +1,48 @@
+import argparse
+
+from . import connect, load_dotenv
+from ..metrics import format_stats
+
+def main(argv=None, prog=None):
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(prog=prog, description="Search recent requests for a name or text in any answer.")
+    parser.add_argument("query", help="Text to look for, e.g. a person's name (case-insensitive)")
+    parser.add_argument("-n", "--limit", type=int, default=200, help="Number of most recent requests to scan (default: 200)")
+    parser.add_argument("--max-matches", type=int, help="Stop once this many matching fields were found")
+    parser.add_argument("--workers", type=int, help="Concurrent detail fetches (default: client setting)")
+    parser.add_argument("--stats", action="store_true", help="Print per-endpoint API latency, retry and cache metrics at the end")
+    args = parser.parse_args(argv)
+
+    print(f"Searching for '{args.query}' in the most recent {args.limit} requests...")
+    print("-" * 80)
+
+    client = None
+    count = 0
+    failures = {}
+    try:
+        client = connect()
+        for m in client.iter_search_requests_by_answer(args.query, limit=args.limit, max_matches=args.max_matches,
+                                                       max_workers=args.workers, failures=failures):
+            count += 1
+            print(f"Request ID: {m['request_id']}")
+            print(f"Name      : {m['request_name']}")
+            print(f"Field     : {m['field_name']}")
+            print(f"Value     : {m['value']}")
+            print("-" * 80)
+
+        if count:
+            print(f"\nFound {count} matches.")
+        else:
+            print(f"\nNo requests found with '{args.query}' in the last {args.limit} requests.")
+        if failures:
+            print(f"Warning: {len(failures)} requests could not be checked: {sorted(failures)[:20]}")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if args.stats and client:
+            print("\nAPI metrics:")
+            print(format_stats(client.stats()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+
+from . import connect, load_dotenv
+from ..metrics import format_stats
+
+def main(argv=None, prog=None):
+    # Imported when the command runs; `--mirror --offline` never loads `requests`
+    from ..client import IntappIntakeClient
+    from ..mirror import RequestMirror, DEFAULT_MIRROR_PATH
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(prog=prog, description="Search active CFI Team requests.")
+    parser.add_argument("--mirror", nargs="?", const=DEFAULT_MIRROR_PATH,
+                        help=f"Answer from a local mirror, syncing changes first (default path: {DEFAULT_MIRROR_PATH})")
+    parser.add_argument("--offline", action="store_true", help="With --mirror, skip the sync and use local data only")
+    parser.add_argument("--stats", action="store_true", help="Print per-endpoint API latency, retry and cache metrics at the end")
+    args = parser.parse_args(argv)
+
+    print("Searching for CFI Team requests (Mark Rob as QC or Michael Sloan as Analyst)...")
+    print("Excluding Canceled, Complete and Finalized requests.")
+    
+    client = None
+    try:
+        if args.mirror:
+            client = None if args.offline else connect()
+            source = RequestMirror(args.mirror, client)
+            if client:
+                source.sync()
+        else:
+            client = source = connect()
+
+        # Use the SDK method which now includes the cancellation and completion filter
+        matches = source.get_cfi_team_requests(limit=15, lookback_days=60)
+        
+        print(f"\nFound {len(matches)} matching (active) requests.")
+        print(f"Top 15 Most Recent Team Results:")
+        print(IntappIntakeClient.format_request_table(matches))
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if args.stats and client:
+            print("\nAPI metrics:")
+            print(format_stats(client.stats()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+
+# Optional decoders, fastest first. `INTAPP_JSON_BACKEND=json` forces the standard library.
+BACKENDS = ('orjson', 'msgspec', 'json')
+
+_backend = None
+_loads = None
+_lock = threading.Lock()
+
+
+def _resolve():
+    global _backend, _loads
+    forced = os.getenv("INTAPP_JSON_BACKEND")
+    for name in ((forced,) if forced in BACKENDS else BACKENDS):
+        if name == 'orjson':
+            try:
+                import orjson  # type: ignore
+            except ImportError:
+                continue
+            loads = orjson.loads
+        elif name == 'msgspec':
+            try:
+                import msgspec  # type: ignore
+            except ImportError:
+                continue
+            loads = _msgspec_loads(msgspec)
+        else:
+            loads = json.loads
+        _backend, _loads = name, loads
+        return
+
+
+def _msgspec_loads(msgspec):
+    decode = msgspec.json.decode
+
+    def loads(content):
+        try:
+            return decode(content)
+        except msgspec.DecodeError as e:
+            # Callers expect the ValueError that json/orjson raise
+            raise ValueError(str(e)) from e
+    return loads
+
+
+def backend():
+    """
+    Name of the JSON decoder in use: 'orjson', 'msgspec' or 'json'.
+    """
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _resolve()
+    return _backend
+
+
+def loads(content):
+    """
+    Decodes a JSON document (bytes or str) with the fastest available backend.
+    """
+    if _loads is None:
+        backend()
+    return _loads(content)
+
+
+def decode(content, projection=None):
+    return loads(content) if projection is None else projection.decode(content)
+
+
+def _msgspec():
+    if os.getenv("INTAPP_JSON_BACKEND", "msgspec") != "msgspec":
+        return None
+    try:
+        import msgspec  # type: ignore
+    except ImportError:
+        return None
+    return msgspec
+
+
+class Projection:
+    """
+    The parts of a listing or detail payload a caller needs:
+
+    - `fields`: top-level keys to keep (None keeps all; 'answers' is added
+      when an answer filter is set);
+    - `questions`: `questionName`s whose answers are kept (None keeps all);
+    - `answer_fields`: keys kept in each answer (None keeps all;
+      `questionName` is always kept).
+
+    With `msgspec` installed and `fields` given, the payload is decoded
+    straight into structs holding only those keys, so skipped fields (and
+    skipped answer keys) are never turned into Python objects; answers to
+    other questions are dropped right after decoding. Otherwise the payload
+    is decoded with `loads()` and trimmed before it is returned. Either way
+    the result is plain dicts and lists, as from `response.json()`.
+    """
+
+    def __init__(self, fields=None, questions=None, answer_fields=None):
+        self.questions = None if questions is None else frozenset(
+            [questions] if isinstance(questions, str) else questions)
+        self.answer_fields = None if answer_fields is None else tuple(
+            dict.fromkeys(('questionName', *answer_fields)))
+        self.fields = None if fields is None else tuple(dict.fromkeys(fields))
+        if self.fields is not None and self.filters_answers and 'answers' not in self.fields:
+            self.fields += ('answers',)
+        self._decoder = None
+        self._decoder_lock = threading.Lock()
+        self._widened = {}
+
+    def keeping(self, *keys):
+        """
+        This projection with `keys` added to `fields` (itself if they are
+        already kept). The widened copy is remembered, so repeated calls
+        reuse one decoder.
+        """
+        if self.fields is None or all(k in self.fields for k in keys):
+            return self
+        widened = self._widened.get(keys)
+        if widened is None:
+            widened = self._widened[keys] = Projection((*self.fields, *keys), self.questions,
+                                                       None if self.answer_fields is None else self.answer_fields[1:])
+        return widened
+
+    @property
+    def filters_answers(self):
+        return self.questions is not None or self.answer_fields is not None
+
+    def __repr__(self):
+        return (f"Projection(fields={self.fields!r}, questions={sorted(self.questions) if self.questions else None!r}, "
+                f"answer_fields={self.answer_fields!r})")
+
+    def apply(self, data):
+        """
+        Trims already decoded data (a row, a detail or a list of them).
+        """
+        if isinstance(data, list):
+            return [self._row(row) for row in data]
+        return None if data is None else self._row(data)
+
+    def _row(self, row):
+        if not isinstance(row, dict):
+            return row
+        out = row if self.fields is None else {k: row[k] for k in self.fields if k in row}
+        answers = out.get('answers')
+        if isinstance(answers, list) and self.filters_answers:
+            if out is row:
+                out = dict(row)
+            out['answers'] = [self._answer(a) for a in answers
+                              if self.questions is None or (isinstance(a, dict) and a.get('questionName') in self.questions)]
+        return out
+
+    def _answer(self, answer):
+        if self.answer_fields is None or not isinstance(answer, dict):
+            return answer
+        return {k: answer[k] for k in self.answer_fields if k in answer}
+
+    def decode(self, content):
+        """
+        Decodes a JSON payload keeping only the projected parts.
+        """
+        decoder = self._struct_decoder()
+        if decoder is not None:
+            try:
+                return decoder(content)
+            except ValueError:
+                # Unexpected shapes (e.g. an error document) fall back to the generic path
+                pass
+        return self.apply(loads(content))
+
+    def _struct_decoder(self):
+        if self.fields is None:
+            return None
+        if self._decoder is None:
+            with self._decoder_lock:
+                if self._decoder is None:
+                    msgspec = _msgspec()
+                    self._decoder = False if msgspec is None else self._build_decoder(msgspec)
+        return self._decoder or None
+
+    def _build_decoder(self, msgspec):
+        from typing import Any, List, Optional, Union
+
+        unset = msgspec.UNSET
+
+        def struct(name, keys, types=None):
+            # Attribute names are positional so any JSON key works; `rename` maps them back
+            attrs = [f"f{i}" for i in range(len(keys))]
+            cls = msgspec.defstruct(name, [(a, (types or {}).get(k, Any), unset) for a, k in zip(attrs, keys)],
+                                    rename=dict(zip(attrs, keys)))
+            return cls, tuple(zip(attrs, keys))
+
+        def to_dict(obj, names):
+            out = {}
+            for attr, key in names:
+                value = getattr(obj, attr)
+                if value is not unset:
+                    out[key] = value
+            return out
+
+        answer_names = None
+        types = {}
+        if self.answer_fields is not None:
+            answer_cls, answer_names = struct('ProjectedAnswer', self.answer_fields)
+            types['answers'] = Optional[List[answer_cls]]
+        row_cls, row_names = struct('ProjectedRow', self.fields, types)
+        decoder = msgspec.json.Decoder(Union[List[row_cls], row_cls])
+        questions = self.questions
+
+        def row_dict(obj):
+            out = to_dict(obj, row_names)
+            answers = out.get('answers')
+            if isinstance(answers, list):
+                if answer_names is not None:
+                    question = answer_names[0][0]
+                    out['answers'] = [to_dict(a, answer_names) for a in answers
+                                      if questions is None or getattr(a, question) in questions]
+                elif questions is not None:
+                    out['answers'] = [a for a in answers if isinstance(a, dict) and a.get('questionName') in questions]
+            return out
+
+        def decode(content):
+            try:
+                data = decoder.decode(content)
+            except (msgspec.DecodeError, msgspec.ValidationError) as e:
+                raise ValueError(str(e)) from e
+            if isinstance(data, list):
+                return [row_dict(row) for row in data]
+            return row_dict(data)
+        return decode
@@ -0,0 +1,248 @@
+import csv
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('parquet', 'csv', 'jsonl')
+ANSWER_LAYOUTS = ('long', 'wide', 'none')
+
+# Rows buffered per table before they are written (one Parquet row group per batch)
+DEFAULT_BATCH_SIZE = 5000
+
+REQUEST_COLUMNS = (('id', 'int'), ('name', 'str'), ('requestType', 'str'), ('status', 'str'),
+                   ('currentState', 'str'), ('createdOn', 'str'), ('modifiedOn', 'str'))
+ANSWER_COLUMNS = (('request_id', 'int'), ('question', 'str'), ('display_value', 'str'),
+                  ('numeric_answer', 'float'), ('text_answer', 'str'))
+
+_EXTENSIONS = {'parquet': '.parquet', 'csv': '.csv', 'jsonl': '.jsonl'}
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_format(fmt=None):
+    """
+    The output format to use: Parquet when `pyarrow` is installed, CSV otherwise.
+    """
+    if fmt is None:
+        return 'parquet' if _has_pyarrow() else 'csv'
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if fmt == 'parquet' and not _has_pyarrow():
+        raise RuntimeError(
+            "Parquet export requires `pyarrow`. Install it via:\n"
+            "  pip install pyarrow"
+        )
+    return fmt
+
+
+def _coerce(value, kind):
+    if value is None or value == '':
+        return None
+    if kind == 'str':
+        return value if isinstance(value, str) else str(value)
+    try:
+        return int(value) if kind == 'int' else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _CsvTable:
+    def __init__(self, path, columns):
+        self.f = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.f)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.f.close()
+
+
+class _JsonlTable:
+    def __init__(self, path, columns):
+        self.f = open(path, 'w', encoding='utf-8')
+        self.names = [name for name, _ in columns]
+
+    def write(self, rows):
+        self.f.writelines(json.dumps(dict(zip(self.names, row)), default=str) + "\n" for row in rows)
+
+    def close(self):
+        self.f.close()
+
+
+class _ParquetTable:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string()}
+        self.pa = pa
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        arrays = [self.pa.array(values, type=field.type) for values, field in zip(zip(*rows), self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+_TABLES = {'parquet': _ParquetTable, 'csv': _CsvTable, 'jsonl': _JsonlTable}
+
+
+class RequestExporter:
+    """
+    Streams request details into columnar files under `directory`, one row
+    per request in `requests.<ext>`. Answers go either
+
+    - `long`: to `answers.<ext>`, one row per (request, question) with
+      `display_value`, `numeric_answer` and `text_answer`; or
+    - `wide`: into the requests table, one column per question (display
+      values). The columns are `questions` when given, otherwise those seen
+      in the first batch; answers to questions first seen later are counted
+      in `stats['dropped_answers']`.
+
+    Rows are buffered `batch_size` at a time and written out, so memory stays
+    bounded however many requests are exported. Listing rows (no answers)
+    can be exported with `answers='none'`. Details may be dicts or
+    `Request` models.
+    """
+
+    def __init__(self, directory, format=None, answers='long', questions=None, batch_size=DEFAULT_BATCH_SIZE):
+        if answers not in ANSWER_LAYOUTS:
+            raise ValueError(f"Unknown answers layout {answers!r}; expected one of {', '.join(ANSWER_LAYOUTS)}")
+        self.format = resolve_format(format)
+        self.answers = answers
+        self.questions = list(dict.fromkeys(questions)) if questions else None
+        self._inferred = self.questions is None
+        self.batch_size = batch_size
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        extension = _EXTENSIONS[self.format]
+        self.paths = {'requests': os.path.join(directory, f"requests{extension}")}
+        if answers == 'long':
+            self.paths['answers'] = os.path.join(directory, f"answers{extension}")
+        self.stats = {'requests': 0, 'answers': 0, 'dropped_answers': 0}
+        self._tables = {}
+        self._closed = False
+        self._pending = {'requests': [], 'answers': []}
+        # Wide mode: question -> column position, fixed once the requests table is opened
+        self._columns = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, detail):
+        request_id = _coerce(detail.get('id'), 'int')
+        row = [_coerce(detail.get(name), kind) for name, kind in REQUEST_COLUMNS]
+        answers = (detail.get('answers') or []) if self.answers != 'none' else []
+        self.stats['requests'] += 1
+        self.stats['answers'] += len(answers)
+
+        if self.answers == 'wide':
+            # Questions are resolved when the first batch is flushed, so keep them by name until then
+            row.append({a.get('questionName'): _coerce(a.get('displayValue'), 'str') for a in answers})
+        elif self.answers == 'long':
+            pending = self._pending['answers']
+            for a in answers:
+                pending.append((request_id, _coerce(a.get('questionName'), 'str'),
+                                _coerce(a.get('displayValue'), 'str'), _coerce(a.get('numericAnswer'), 'float'),
+                                _coerce(a.get('textAnswer'), 'str')))
+            if len(pending) >= self.batch_size:
+                self._flush('answers')
+
+        self._pending['requests'].append(row)
+        if len(self._pending['requests']) >= self.batch_size:
+            self._flush('requests')
+
+    def write_all(self, details):
+        """
+        Writes every detail, closes the files and returns the stats.
+        """
+        with self:
+            for detail in details:
+                self.write(detail)
+        return self.stats
+
+    def _open(self, name):
+        if name == 'answers':
+            columns = ANSWER_COLUMNS
+        else:
+            columns = REQUEST_COLUMNS
+            if self.answers == 'wide':
+                if self.questions is None:
+                    seen = {}
+                    for row in self._pending['requests']:
+                        seen.update(dict.fromkeys(row[-1]))
+                    self.questions = [q for q in seen if q is not None]
+                self._columns = {q: i for i, q in enumerate(self.questions)}
+                columns = columns + tuple((q, 'str') for q in self.questions)
+        return _TABLES[self.format](self.paths[name], columns)
+
+    def _flush(self, name):
+        rows = self._pending[name]
+        if not rows and name in self._tables:
+            return
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = self._open(name)
+        if name == 'requests' and self.answers == 'wide':
+            rows = [self._widen(row) for row in rows]
+        if rows:
+            table.write(rows)
+        self._pending[name] = []
+
+    def _widen(self, row):
+        values = row.pop()
+        wide = [None] * len(self._columns)
+        for question, value in values.items():
+            position = self._columns.get(question)
+            if position is None:
+                # Only unexpected when the columns were guessed from the first batch
+                self.stats['dropped_answers'] += self._inferred
+            else:
+                wide[position] = value
+        return row + wide
+
+    def close(self):
+        """
+        Writes any buffered rows and closes the files (empty tables still get a header/schema).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            for name in self.paths:
+                self._flush(name)
+        finally:
+            for table in self._tables.values():
+                table.close()
+            self._tables = {}
+        if self.stats['dropped_answers']:
+            logger.warning(f"{self.stats['dropped_answers']} answers to questions outside the wide columns "
+                           f"were not exported; pass `questions` or use the long layout to keep them")
+
+
+def export_requests(details, directory, format=None, answers='long', questions=None,
+                    batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Exports request details (e.g. from `iter_query(..., details=True)` or
+    `RequestMirror.iter_details()`) with a `RequestExporter`. Returns the
+    stats together with the paths written.
+    """
+    exporter = RequestExporter(directory, format, answers, questions, batch_size)
+    stats = exporter.write_all(details)
+    return dict(stats, format=exporter.format, paths=exporter.paths)
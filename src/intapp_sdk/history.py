@@ -0,0 +1,368 @@
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+from .client import TIMESTAMP_FORMAT
+from .query import INACTIVE_STATES, INACTIVE_STATUSES
+from .watermark import SYNC_STATE_SCHEMA, SyncStateMixin, modified_stamp, next_watermark
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = os.path.join("data", "intapp_workload_history.db")
+
+_DAY = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    request_type TEXT,
+    created_on TEXT,
+    modified_on TEXT
+);
+CREATE TABLE IF NOT EXISTS codes (
+    code INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    request_id INTEGER NOT NULL,
+    at REAL NOT NULL,
+    status INTEGER,
+    state INTEGER,
+    modified_on TEXT,
+    PRIMARY KEY (request_id, at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    modified_from TEXT,
+    listed INTEGER NOT NULL,
+    changed INTEGER NOT NULL
+);
+""" + SYNC_STATE_SCHEMA
+
+
+def _epoch(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)[:19]).timestamp()
+    except ValueError:
+        return None
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch).strftime(TIMESTAMP_FORMAT)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class WorkloadHistory(SyncStateMixin):
+    """
+    Compact history of request workflow states in a local SQLite file.
+
+    Each `record()` / `sync()` is a snapshot, but only changes are stored:
+    a row in `transitions` when a request's (status, currentState) differs
+    from the last one recorded, with status and state dictionary-coded as
+    small integers. A transition is dated by the request's `modifiedOn`
+    (the change happened at that modification), clamped to the snapshot.
+
+    The analytics load the transitions once as parallel `array` columns
+    and aggregate them in a single sweep, so months of history report in
+    well under a second without touching the API.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            # Files created before requests.modified_on was added
+            if 'modified_on' not in {row[1] for row in self._conn.execute("PRAGMA table_info(requests)")}:
+                self._conn.execute("ALTER TABLE requests ADD COLUMN modified_on TEXT")
+        self._codes = {row["value"]: row["code"] for row in self._conn.execute("SELECT code, value FROM codes")}
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _code(self, value):
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._codes) + 1
+            self._conn.execute("INSERT INTO codes (code, value) VALUES (?, ?)", (code, value))
+        return code
+
+    def _decode(self):
+        names = [None] * (len(self._codes) + 1)
+        for value, code in self._codes.items():
+            names[code] = value
+        return names
+
+    def _latest(self):
+        # SQLite returns the other columns from the row holding MAX(at)
+        return {row[0]: (row[1], row[2], row[3]) for row in self._conn.execute(
+            "SELECT request_id, MAX(at), status, state FROM transitions GROUP BY request_id")}
+
+    def record(self, rows, taken_at=None, modified_from=None):
+        """
+        Stores a snapshot of listing rows. Returns how many rows were seen, how
+        many state changes were recorded and the newest `modifiedOn` seen.
+        """
+        taken_at = taken_at or datetime.now()
+        now = taken_at.timestamp()
+        listed = 0
+        changed = 0
+        newest = ''
+        with self._lock, self._conn:
+            latest = self._latest()
+            for row in rows:
+                listed += 1
+                newest = max(newest, modified_stamp(row))
+                request_id = row['id']
+                status = self._code(row.get('status'))
+                state = self._code(row.get('currentState'))
+                # modified_on keeps the request's latest modifiedOn, changed state or not
+                self._conn.execute(
+                    "INSERT INTO requests (id, name, request_type, created_on, modified_on) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET name = COALESCE(excluded.name, name), "
+                    "request_type = COALESCE(excluded.request_type, request_type), "
+                    "created_on = COALESCE(excluded.created_on, created_on), "
+                    "modified_on = CASE WHEN excluded.modified_on > IFNULL(modified_on, '') "
+                    "THEN excluded.modified_on ELSE modified_on END",
+                    (request_id, row.get('name'), row.get('requestType'), row.get('createdOn'),
+                     row.get('modifiedOn')),
+                )
+                previous = latest.get(request_id)
+                if previous is not None and previous[1:] == (status, state):
+                    continue
+                at = min(_epoch(row.get('modifiedOn')) or now, now)
+                if previous is not None and at <= previous[0]:
+                    at = previous[0] + 0.001
+                self._conn.execute(
+                    "INSERT INTO transitions (request_id, at, status, state, modified_on) VALUES (?, ?, ?, ?, ?)",
+                    (request_id, at, status, state, row.get('modifiedOn')),
+                )
+                latest[request_id] = (at, status, state)
+                changed += 1
+            self._conn.execute(
+                "INSERT INTO snapshots (taken_at, modified_from, listed, changed) VALUES (?, ?, ?, ?)",
+                (taken_at.strftime(TIMESTAMP_FORMAT), modified_from, listed, changed),
+            )
+        return {'listed': listed, 'changed': changed, 'newest_modified': newest or None}
+
+    def sync(self, client, request_types=None, initial_lookback_days=60, full=False):
+        """
+        Snapshots every request modified since the previous sync (or the last
+        `initial_lookback_days` on the first run / when `full` is set). Rows
+        that did not change since then keep their recorded state.
+        """
+        started = datetime.now()
+        since = None if full else self.get_watermark(request_types)
+        if since is None:
+            since = (started - timedelta(days=initial_lookback_days)).strftime(TIMESTAMP_FORMAT)
+        result = self.record(client.iter_requests(request_types=request_types, modified_from=since),
+                             taken_at=started, modified_from=since)
+
+        watermark = next_watermark(since, result['newest_modified'])
+        self._save_watermark(request_types, watermark, started)
+        logger.info(f"Workload history sync: {result['listed']} listed, {result['changed']} state changes")
+        return dict(result, modified_from=since, watermark=watermark)
+
+    def current(self, status=None, modified_from=None):
+        """
+        The latest recorded state of every request as listing-style rows
+        (`id`, `name`, `requestType`, `status`, `currentState`, `createdOn`,
+        `modifiedOn`), newest ID first. `modifiedOn` (and the `modified_from`
+        filter) is the request's latest modification seen, which may be newer
+        than its last state change.
+        """
+        names = self._decode()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.request_id, MAX(t.at), t.status, t.state, COALESCE(r.modified_on, t.modified_on), "
+                "r.name, r.request_type, r.created_on "
+                "FROM transitions t LEFT JOIN requests r ON r.id = t.request_id "
+                "GROUP BY t.request_id ORDER BY t.request_id DESC"
+            ).fetchall()
+        result = []
+        for request_id, _, status_code, state_code, modified_on, name, request_type, created_on in rows:
+            row_status = names[status_code or 0]
+            if status is not None and row_status != status:
+                continue
+            if modified_from and (modified_on or '') < modified_from:
+                continue
+            result.append({'id': request_id, 'name': name, 'requestType': request_type, 'status': row_status,
+                           'currentState': names[state_code or 0], 'createdOn': created_on,
+                           'modifiedOn': modified_on})
+        return result
+
+    def _columns(self):
+        """
+        All transitions as parallel arrays ordered by (request, time):
+        request IDs, epoch seconds, status codes and state codes (0 = unknown).
+        """
+        ids, at, status, state = array('q'), array('d'), array('i'), array('i')
+        with self._lock:
+            for row in self._conn.execute(
+                    "SELECT request_id, at, IFNULL(status, 0), IFNULL(state, 0) FROM transitions "
+                    "ORDER BY request_id, at"):
+                ids.append(row[0])
+                at.append(row[1])
+                status.append(row[2])
+                state.append(row[3])
+        return ids, at, status, state
+
+    def _inactive_codes(self):
+        """
+        Per status/state code, whether a request with that value is finished.
+        """
+        inactive = array('b', bytes(len(self._codes) + 1))
+        for value in INACTIVE_STATUSES + INACTIVE_STATES:
+            if value in self._codes:
+                inactive[self._codes[value]] = 1
+        return inactive
+
+    @staticmethod
+    def _bounds(since, until, default_days):
+        until = until or datetime.now()
+        since = since or until - timedelta(days=default_days)
+        return since.timestamp(), until.timestamp()
+
+    def time_in_state(self, since=None, until=None, now=None):
+        """
+        How long requests stay in each `currentState`:
+        `{state: {'completed', 'mean_days', 'median_days', 'p90_days', 'open', 'open_mean_days'}}`.
+        Completed stays are those left between `since` and `until` (default:
+        the last 90 days); open stays are requests still in the state, aged up
+        to `now`. Stays in finished states are not reported.
+        """
+        start, end = self._bounds(since, until, 90)
+        now = (now or datetime.now()).timestamp()
+        ids, at, status, state = self._columns()
+        inactive = self._inactive_codes()
+        names = self._decode()
+        completed = [array('d') for _ in names]
+        open_days = [array('d') for _ in names]
+        last = len(ids) - 1
+        entered = 0.0
+        for i in range(len(ids)):
+            # A stay starts when the request enters a state; status-only changes do not end it
+            if i == 0 or ids[i - 1] != ids[i] or state[i - 1] != state[i]:
+                entered = at[i]
+            same_request = i < last and ids[i + 1] == ids[i]
+            if same_request and state[i + 1] == state[i]:
+                continue
+            # Judged by the stay's last recorded status (a finished request has no open stay)
+            if inactive[status[i]] or inactive[state[i]]:
+                continue
+            if same_request:
+                left = at[i + 1]
+                if start <= left <= end:
+                    completed[state[i]].append((left - entered) / _DAY)
+            else:
+                open_days[state[i]].append(max(0.0, now - entered) / _DAY)
+
+        result = {}
+        for code, name in enumerate(names):
+            done = sorted(completed[code])
+            still = open_days[code]
+            if not done and not still:
+                continue
+            result[name or 'Unknown'] = {
+                'completed': len(done),
+                'mean_days': round(sum(done) / len(done), 1) if done else None,
+                'median_days': round(_percentile(done, 0.5), 1) if done else None,
+                'p90_days': round(_percentile(done, 0.9), 1) if done else None,
+                'open': len(still),
+                'open_mean_days': round(sum(still) / len(still), 1) if still else None,
+            }
+        return dict(sorted(result.items(), key=lambda item: -(item[1]['completed'] + item[1]['open'])))
+
+    def throughput(self, period_days=7, since=None, until=None):
+        """
+        Requests leaving each `currentState` per period:
+        `{period start: {state: count}}` between `since` and `until`
+        (default: the last 12 weeks).
+        """
+        start, end = self._bounds(since, until, 12 * period_days)
+        period = period_days * _DAY
+        buckets = max(1, int(-(-(end - start) // period)))
+        ids, at, status, state = self._columns()
+        names = self._decode()
+        width = len(names)
+        counts = array('l', bytes(buckets * width * array('l').itemsize))
+        for i in range(len(ids) - 1):
+            # Only a change of state is a departure; status-only transitions stay put
+            if ids[i + 1] != ids[i] or state[i + 1] == state[i]:
+                continue
+            left = at[i + 1]
+            if start <= left <= end:
+                # A change exactly at `until` closes the last period rather than opening a new one
+                bucket = min(int((left - start) // period), buckets - 1)
+                counts[bucket * width + state[i]] += 1
+        return self._unpack(counts, buckets, width, start, period, names)
+
+    def backlog(self, period_days=7, since=None, until=None):
+        """
+        Active requests per `currentState` at the end of each period:
+        `{period end: {state: count}}` between `since` and `until` (default:
+        the last 12 weeks). Requests in finished statuses/states are not
+        counted. Computed in one time-ordered sweep over the transitions.
+        """
+        start, end = self._bounds(since, until, 12 * period_days)
+        period = period_days * _DAY
+        buckets = max(1, int(-(-(end - start) // period)))
+        ids, at, status, state = self._columns()
+        inactive = self._inactive_codes()
+        names = self._decode()
+        width = len(names)
+        levels = array('l', bytes(width * array('l').itemsize))
+        counts = array('l', bytes(buckets * width * array('l').itemsize))
+        # Active state code each request currently holds (-1: none)
+        holding = {}
+        bucket = 0
+        boundary = start + period
+        for i in sorted(range(len(ids)), key=at.__getitem__):
+            while at[i] > boundary and bucket < buckets:
+                counts[bucket * width:(bucket + 1) * width] = levels
+                bucket += 1
+                boundary += period
+            previous = holding.get(ids[i], -1)
+            if previous >= 0:
+                levels[previous] -= 1
+            code = -1 if inactive[status[i]] or inactive[state[i]] else state[i]
+            if code >= 0:
+                levels[code] += 1
+            holding[ids[i]] = code
+        while bucket < buckets:
+            counts[bucket * width:(bucket + 1) * width] = levels
+            bucket += 1
+        return self._unpack(counts, buckets, width, start + period, period, names)
+
+    @staticmethod
+    def _unpack(counts, buckets, width, first, period, names):
+        result = {}
+        for bucket in range(buckets):
+            row = counts[bucket * width:(bucket + 1) * width]
+            result[_iso(first + bucket * period)] = {names[code] or 'Unknown': n
+                                                     for code, n in enumerate(row) if n}
+        return result
@@ -0,0 +1,192 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from fnmatch import fnmatchcase
+
+_TOKEN_RE = re.compile(r'\w+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(value):
+    """
+    Case-folds and collapses whitespace so lookups ignore formatting differences.
+    """
+    return _SPACE_RE.sub(' ', str(value)).strip().casefold()
+
+
+def _field_matcher(field):
+    """
+    Builds a predicate over question names. `field` may be a glob such as
+    `*Reviewer*`, a plain substring such as `QC`, or a list of either
+    (any match wins). Matching is case-insensitive.
+    """
+    if field is None:
+        return None
+    patterns = [field] if isinstance(field, str) else list(field)
+    globs = [p.casefold() for p in patterns if any(c in p for c in '*?[')]
+    subs = [p.casefold() for p in patterns if not any(c in p for c in '*?[')]
+
+    def matches(question_name):
+        name = question_name.casefold()
+        return any(s in name for s in subs) or any(fnmatchcase(name, g) for g in globs)
+    return matches
+
+
+class AnswerIndex:
+    """
+    Inverted index from answer text to (request_id, questionName, occurrence).
+
+    Answer values are tokenized into words; a query is resolved by
+    intersecting the postings of its words and then confirming the full
+    normalized substring, so results match `search_requests_by_answer`
+    without scanning every answer. Requests can be added, replaced or
+    removed one at a time as their details change.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._values = {}
+        self._keys_by_request = defaultdict(set)
+        self._request_names = {}
+        self._vocab = None
+        self._vocab_reversed = None
+        self._containing = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_requests(cls, details):
+        index = cls()
+        for detail in details:
+            index.add_request(detail)
+        return index
+
+    def __len__(self):
+        return len(self._keys_by_request)
+
+    def __contains__(self, request_id):
+        return request_id in self._keys_by_request
+
+    def add_request(self, detail):
+        """
+        Indexes (or re-indexes) every answer of a request detail.
+        """
+        request_id = detail['id']
+        with self._lock:
+            self._remove(request_id)
+            self._request_names[request_id] = detail.get('name')
+            # A question answered more than once keeps every answer, as the live search does
+            seen = Counter()
+            for a in detail.get('answers', []):
+                question = a.get('questionName')
+                value = a.get('displayValue')
+                if not question or value in (None, ''):
+                    continue
+                key = (request_id, question, seen[question])
+                seen[question] += 1
+                normalized = normalize_text(value)
+                self._values[key] = (normalized, str(value))
+                self._keys_by_request[request_id].add(key)
+                for token in set(_TOKEN_RE.findall(normalized)):
+                    self._postings[token].add(key)
+            self._vocab = None
+
+    def remove_request(self, request_id):
+        with self._lock:
+            self._remove(request_id)
+            self._vocab = None
+
+    def _remove(self, request_id):
+        keys = self._keys_by_request.pop(request_id, ())
+        for key in keys:
+            normalized, _ = self._values.pop(key)
+            for token in set(_TOKEN_RE.findall(normalized)):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.discard(key)
+                    if not postings:
+                        del self._postings[token]
+        self._request_names.pop(request_id, None)
+
+    def _ensure_vocab(self):
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+            self._vocab_reversed = sorted(t[::-1] for t in self._postings)
+            self._containing = {}
+
+    @staticmethod
+    def _prefixed(sorted_tokens, prefix):
+        start = bisect_left(sorted_tokens, prefix)
+        for i in range(start, len(sorted_tokens)):
+            if not sorted_tokens[i].startswith(prefix):
+                break
+            yield sorted_tokens[i]
+
+    def _union(self, tokens):
+        keys = set()
+        for token in tokens:
+            keys |= self._postings[token]
+        return keys
+
+    def _candidates(self, query_tokens):
+        """
+        Keys whose words can contain the query as a substring: the first query
+        word may end a token, the last may start one, the middle ones are exact.
+        """
+        if len(query_tokens) == 1:
+            token = query_tokens[0]
+            if token not in self._containing:
+                self._containing[token] = [t for t in self._vocab if token in t]
+            return self._union(self._containing[token])
+
+        first, *middle, last = query_tokens
+        sets = [
+            self._union(t[::-1] for t in self._prefixed(self._vocab_reversed, first[::-1])),
+            self._union(self._prefixed(self._vocab, last)),
+        ]
+        sets.extend(self._postings.get(t, set()) for t in middle)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for s in sets[1:]:
+            result &= s
+            if not result:
+                break
+        return result
+
+    def search(self, query, field=None, limit=None):
+        """
+        Finds answers whose display value contains `query`, optionally
+        restricted to question names matching `field` (glob, substring or
+        list of either). Returns dicts shaped like `search_requests_by_answer`,
+        newest request first.
+        """
+        needle = normalize_text(query)
+        field_matches = _field_matcher(field)
+        with self._lock:
+            self._ensure_vocab()
+            query_tokens = _TOKEN_RE.findall(needle)
+            keys = self._candidates(query_tokens) if query_tokens else self._values.keys()
+
+            results = []
+            for key in sorted(keys, key=lambda k: (k[0], k[1], -k[2]), reverse=True):
+                request_id, question, _ = key
+                normalized, display_value = self._values[key]
+                if needle not in normalized:
+                    continue
+                if field_matches is not None and not field_matches(question):
+                    continue
+                results.append({
+                    'request_id': request_id,
+                    'request_name': self._request_names.get(request_id),
+                    'field_name': question,
+                    'value': display_value,
+                })
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def request_ids(self, query, field=None):
+        """
+        Returns the set of request IDs with at least one matching answer.
+        """
+        return {r['request_id'] for r in self.search(query, field=field)}
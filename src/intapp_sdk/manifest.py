@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".intapp_manifest.json"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write_bytes(path, data):
+    """
+    Writes `data` to a temp file next to `path` and renames it into place.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".part",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class AttachmentManifest:
+    """
+    Per-directory record of downloaded attachments, used to make
+    `download_all_attachments` resumable.
+
+    Each file is keyed by name and remembers the attachment it came from, a
+    fingerprint of that attachment's metadata, and the size and SHA-256 of the
+    bytes written. A file is considered current when the metadata fingerprint
+    is unchanged and the file on disk still has the recorded size (and, with
+    `verify_hash`, the recorded hash).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.files = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.files = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+
+    @staticmethod
+    def fingerprint(attachment):
+        """
+        Stable digest of an attachment's metadata; changes whenever the API
+        reports any change to the attachment.
+        """
+        encoded = json.dumps(attachment, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def is_current(self, filename, fingerprint, verify_hash=False):
+        with self._lock:
+            entry = self.files.get(filename)
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return False
+        path = os.path.join(self.directory, filename)
+        try:
+            if os.path.getsize(path) != entry.get('size'):
+                return False
+        except OSError:
+            return False
+        return not verify_hash or file_sha256(path) == entry.get('sha256')
+
+    def record(self, filename, request_id, attachment_id, fingerprint, size, sha256):
+        with self._lock:
+            self.files[filename] = {
+                'request_id': request_id,
+                'attachment_id': attachment_id,
+                'fingerprint': fingerprint,
+                'size': size,
+                'sha256': sha256,
+                'downloaded_at': datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self._save()
+
+    def _save(self):
+        data = json.dumps({'files': self.files}, indent=2, sort_keys=True).encode('utf-8')
+        atomic_write_bytes(self.path, data)
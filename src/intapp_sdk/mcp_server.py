@@ -1,13 +1,22 @@
 import os
 import sys
+import asyncio
+import atexit
 import logging
+import threading
 from typing import Optional, List, Any
 from fastmcp import FastMCP
 
 # Add src to path so we can import the local SDK
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from intapp_sdk import IntappIntakeClient
-from intapp_sdk.auth import get_intapp_token
+from intapp_sdk import IntappIntakeClient, RequestCache
+from intapp_sdk.async_client import AsyncIntappIntakeClient
+from intapp_sdk.auth import get_intapp_base_url, get_intapp_token
+from intapp_sdk.mirror import RequestMirror, DEFAULT_MIRROR_PATH
+from intapp_sdk.query import active_requests_query
+from intapp_sdk.recent import RecentRequestsView
+from intapp_sdk.roles import AssignmentTable
+from intapp_sdk.store import AttachmentStore, DEFAULT_STORE_ROOT
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,11 +25,112 @@ logger = logging.getLogger("intapp-mcp")
 # Initialize MCP Server
 mcp = FastMCP("Intapp Valuation Tools")
 
-# Initialize SDK Client
+BASE_URL = get_intapp_base_url()
+
+# Process-wide state shared by every tool call: the token is resolved once (keyring lookups
+# are slow) and only re-resolved after a 401, and both clients share one request cache.
+_lock = threading.Lock()
+_token = None
+_cache = RequestCache()
+_client = None
+_async_client = None
+_store = None
+_mirror = None
+# Serializes mirror syncs with the first answer-index build, so no synced detail is missed by the index
+_mirror_lock = threading.Lock()
+_recent = None
+
+def _get_token():
+    global _token
+    with _lock:
+        if _token is None:
+            _token = get_intapp_token()
+        return _token
+
+def _refresh_token():
+    global _token
+    # Called after a 401, so the cached (rejected) token must not be returned again
+    token = get_intapp_token(use_cache=False)
+    with _lock:
+        _token = token
+    return token
+
+# Initialize SDK Client (one pooled client for the life of the server)
 def get_client():
-    BASE_URL = "https://marcum-flow.open.intapp.com/api"
-    TOKEN = get_intapp_token()
-    return IntappIntakeClient(BASE_URL, TOKEN)
+    global _client
+    token = _get_token()
+    with _lock:
+        if _client is None:
+            _client = IntappIntakeClient(BASE_URL, token, cache=_cache, token_provider=_refresh_token)
+            atexit.register(_client.close)
+        return _client
+
+# Async client for fan-out tools so they don't block the server's event loop.
+# httpx connections belong to the loop that opened them, so it is rebuilt only if the loop
+# changes, and the client it replaces is closed rather than left holding its sockets.
+async def get_async_client():
+    global _async_client
+    loop = asyncio.get_running_loop()
+    # The first lookup may hit the keyring, which blocks, so it runs off the loop
+    token = _token if _token is not None else await asyncio.to_thread(_get_token)
+    stale = None
+    with _lock:
+        if _async_client is None or _async_client[0] is not loop:
+            stale = _async_client
+            _async_client = (loop, AsyncIntappIntakeClient(BASE_URL, token, cache=_cache,
+                                                            token_provider=_refresh_token))
+        client = _async_client[1]
+    if stale is not None:
+        await _close_async_client(*stale)
+    return client
+
+async def _close_async_client(loop, client):
+    # Closed on its own loop when that loop still runs (in another thread); otherwise its loop
+    # is gone and closing here only releases what can still be released.
+    try:
+        if loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.close(), loop))
+        else:
+            await client.close()
+    except Exception as e:
+        logger.debug(f"Closing the previous async client failed: {e}")
+
+# Local SQLite mirror (path overridable via INTAPP_MIRROR_PATH). One per process, so the answer
+# index built over it survives between tool calls and sync_local_mirror keeps it up to date.
+def get_mirror():
+    global _mirror
+    with _lock:
+        if _mirror is None:
+            _mirror = RequestMirror(os.getenv("INTAPP_MIRROR_PATH", DEFAULT_MIRROR_PATH))
+            atexit.register(_mirror.close)
+        return _mirror
+
+def get_answer_index():
+    mirror = get_mirror()
+    if mirror.index is None:
+        with _mirror_lock:
+            if mirror.index is None:
+                mirror.build_answer_index()
+    return mirror.index
+
+# Shared attachment store (path overridable via INTAPP_STORE_PATH)
+def get_store():
+    global _store
+    with _lock:
+        if _store is None:
+            _store = AttachmentStore(os.getenv("INTAPP_STORE_PATH", DEFAULT_STORE_ROOT))
+        return _store
+
+# Pre-sorted view of the last 30 days, refreshed in the background (interval via INTAPP_RECENT_REFRESH_SECONDS)
+def get_recent_view():
+    global _recent
+    client = get_client()
+    with _lock:
+        if _recent is None:
+            interval = int(os.getenv("INTAPP_RECENT_REFRESH_SECONDS", "300"))
+            _recent = RecentRequestsView(client, window_days=30, refresh_interval=interval).start()
+            atexit.register(_recent.stop, 1)
+        return _recent
 
 @mcp.tool()
 def open_request_in_browser(request_id: int) -> str:
@@ -38,78 +148,166 @@ def open_request_in_browser(request_id: int) -> str:
     return f"Opened: {url}"
 
 @mcp.tool()
-def get_cfi_team_requests(limit: int = 15) -> str:
+async def get_cfi_team_requests(limit: int = 15, use_mirror: bool = False) -> str:
     """
     Get the most recent requests for the CFI Team (Mark Rob as QC/Reviewer or Michael Sloan as Analyst).
     Returns a formatted ASCII table of the matching requests.
+    Set use_mirror=True to answer instantly from the local mirror (see sync_local_mirror).
     """
-    client = get_client()
-    logger.info(f"Fetching CFI Team requests (limit={limit})")
-    data = client.get_cfi_team_requests(limit=limit)
-    return client.format_request_table(data)
+    logger.info(f"Fetching CFI Team requests (limit={limit}, use_mirror={use_mirror})")
+    failures = {}
+    if use_mirror:
+        data = get_mirror().get_cfi_team_requests(limit=limit)
+    else:
+        client = await get_async_client()
+        data = await client.get_cfi_team_requests(limit=limit, failures=failures)
+    table = IntappIntakeClient.format_request_table(data)
+    if failures:
+        table += f"\nCould not check {len(failures)} requests after retries: {', '.join(map(str, sorted(failures)))}"
+    return table
+
+@mcp.tool()
+def sync_local_mirror(full: bool = False) -> dict:
+    """
+    Incrementally syncs the local request mirror with Intapp, fetching only requests
+    modified since the last sync (or a full re-crawl when full=True).
+    Returns counts of listed and fetched requests and the new watermark.
+    """
+    logger.info(f"Syncing local mirror (full={full})")
+    mirror = get_mirror()
+    if mirror.client is None:
+        mirror.client = get_client()
+    # The mirror updates its answer index (if built) as details are refreshed
+    with _mirror_lock:
+        result = mirror.sync(full=full)
+    result['mirror'] = mirror.stats()
+    return result
+
+def _recent_requests(limit, refresh):
+    view = get_recent_view()
+    if refresh:
+        view.refresh()
+    return view.get(limit)
 
 @mcp.tool()
-def list_valuation_requests(limit: int = 50) -> List[dict]:
+def list_valuation_requests(limit: int = 50, refresh: bool = False) -> dict:
     """
     List the most recent intake requests from Intapp.
-    Defaults to 'Valuation Request' type from the last 30 days.
+    Defaults to 'Valuation Request' type from the last 30 days, newest first.
+    Answers from an in-memory view refreshed in the background; `data_age_seconds` says how
+    old it is. Set refresh=True to pull the latest changes first.
     """
-    from datetime import datetime, timedelta
-    client = get_client()
-    logger.info(f"Listing {limit} requests")
-    
-    # Use a 30-day window to ensure we get current data
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S")
-    
-    # Fetch a large batch to ensure we can sort and get the absolute newest ones
-    data = client.list_requests(limit=1000, modified_from=thirty_days_ago)
-    data.sort(key=lambda x: x.get('createdOn', ''), reverse=True)
-    return data[:limit]
+    logger.info(f"Listing {limit} requests (refresh={refresh})")
+    data, age = _recent_requests(limit, refresh)
+    return {'requests': data, 'data_age_seconds': round(age, 1)}
 
 @mcp.tool()
-def get_formatted_request_table(limit: int = 10) -> str:
+def get_formatted_request_table(limit: int = 10, refresh: bool = False) -> str:
     """
     Returns a human-readable ASCII table of the most recent valuation requests.
     Useful for displaying a summary directly to the user.
+    Set refresh=True to pull the latest changes before rendering.
     """
-    from datetime import datetime, timedelta
-    client = get_client()
-    logger.info(f"Fetching formatted table for {limit} requests")
-    
-    # Use a 30-day window to ensure we get current data
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S")
-    
-    # Fetch a large batch to ensure we can sort and get the absolute newest ones
-    data = client.list_requests(limit=1000, modified_from=thirty_days_ago)
-    data.sort(key=lambda x: x.get('createdOn', ''), reverse=True)
-    return client.format_request_table(data[:limit])
+    logger.info(f"Fetching formatted table for {limit} requests (refresh={refresh})")
+    data, age = _recent_requests(limit, refresh)
+    return IntappIntakeClient.format_request_table(data) + f"\nData age: {age:.0f}s"
+
+@mcp.tool()
+def refresh_recent_requests(full: bool = False) -> dict:
+    """
+    Forces an immediate refresh of the in-memory recent-requests view used by
+    list_valuation_requests and get_formatted_request_table (full=True re-lists the whole window).
+    """
+    return get_recent_view().refresh(full=full)
 
 @mcp.tool()
-def get_request_details(request_id: int) -> dict:
+def get_request_details(request_id: int, use_mirror: bool = False) -> dict:
     """
     Get full metadata for a specific intake request including answers and status.
+    Set use_mirror=True to read from the local mirror, falling back to the API if it is not mirrored.
     """
-    client = get_client()
     logger.info(f"Fetching details for request {request_id}")
+    if use_mirror:
+        detail = get_mirror().get_request(request_id)
+        if detail is not None:
+            return detail
+    client = get_client()
     return client.get_request(request_id)
 
 @mcp.tool()
-def search_by_team_member(name: str = "Mark Rob", limit: int = 100) -> List[dict]:
+async def search_by_team_member(name: str = "Mark Rob", limit: int = 100, use_mirror: bool = False,
+                          field: Optional[str] = None, max_matches: Optional[int] = None) -> List[dict]:
     """
     Search for requests where a specific person is assigned to QC, Reviewer, or Analyst roles.
     Useful for finding assignments for specific individuals.
+    Set use_mirror=True to search every mirrored request through the answer index instead of
+    the last `limit` requests; `field` narrows matches by question name (e.g. "*Reviewer*", "QC").
+    `max_matches` stops the search as soon as that many matches are found.
     """
-    client = get_client()
+    if use_mirror:
+        logger.info(f"Searching for user '{name}' in the local mirror")
+        # Built once per process (off the event loop) and then updated by sync_local_mirror
+        index = await asyncio.to_thread(get_answer_index)
+        return index.search(name, field=field, limit=max_matches or limit)
+
     logger.info(f"Searching for user '{name}' in last {limit} requests")
     
     # We use our custom search logic from the SDK
-    results = client.search_requests_by_answer(name, limit=limit)
+    failures = {}
+    client = await get_async_client()
+    results = await client.search_requests_by_answer(name, limit=limit, max_matches=max_matches,
+                                                     failures=failures)
+    if failures:
+        logger.warning(f"Search skipped {len(failures)} requests that failed after retries: {sorted(failures)}")
     return results
 
+@mcp.tool()
+async def get_team_workload(people: Optional[List[str]] = None, lookback_days: int = 60,
+                            use_mirror: bool = False) -> dict:
+    """
+    Who holds which role on active requests modified in the last `lookback_days`: returns
+    {person: {role: request count}} for everyone, or only for `people` (names or emails, e.g. a
+    team). Roles come from one pass over the request details (CVG QC, CVG Analyst, Engagement
+    Shareholder, Audit Team, ...). Set use_mirror=True to read the details from the local mirror.
+    """
+    query = active_requests_query(modified_from=IntappIntakeClient._lookback_start(lookback_days))
+    table = AssignmentTable()
+    failures = {}
+    if use_mirror:
+        for detail in get_mirror().iter_details(modified_from=query.modified_from):
+            if query.matches_summary(detail):
+                table.add_request(detail)
+    else:
+        client = await get_async_client()
+        async for detail in client.iter_query(query, details=True, failures=failures):
+            table.add_request(detail)
+    result = {'requests': len(table), 'workload': table.workload(people)}
+    if failures:
+        result['failed_request_ids'] = sorted(failures)
+    return result
+
+@mcp.tool()
+def get_client_metrics(reset: bool = False) -> dict:
+    """
+    Returns the server's live API metrics: per-endpoint latency histograms, bytes, status codes,
+    retries and errors, scheduler concurrency/throttling and cache hit rates, for both the sync
+    and async clients. Set reset=True to start a fresh measurement window afterwards.
+    """
+    result = {'sync': _client.stats() if _client else None,
+              'async': _async_client[1].stats() if _async_client else None}
+    if _recent is not None:
+        result['recent_view'] = {'data_age_seconds': _recent.age(), 'last_error': _recent.last_error}
+    if reset:
+        for client in (_client, _async_client[1] if _async_client else None):
+            if client:
+                client.metrics.reset()
+    return result
+
 @mcp.tool()
 def download_attachment_to_data_dir(request_id: int, attachment_id: int, filename: str) -> str:
     """
     Downloads an attachment from a request and saves it to the local data directory.
+    Attachments already in the shared store are linked in without downloading again.
     Returns the full local path to the saved file.
     """
     client = get_client()
@@ -118,7 +316,7 @@ def download_attachment_to_data_dir(request_id: int, attachment_id: int, filenam
     output_path = os.path.join("data", safe_filename)
     
     logger.info(f"Downloading attachment {attachment_id} to {output_path}")
-    client.download_attachment(request_id, attachment_id, output_path)
+    client.download_attachment(request_id, attachment_id, output_path, store=get_store())
     return os.path.abspath(output_path)
 
 if __name__ == "__main__":
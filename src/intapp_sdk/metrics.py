@@ -0,0 +1,161 @@
+import re
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; slower calls land in an overflow bucket.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ATTACHMENT_PATH = re.compile(r"/requests/[^/]+/attachments/[^/]+$")
+_DETAIL_PATH = re.compile(r"/requests/[^/]+$")
+
+
+def endpoint_name(url):
+    """
+    Maps an API URL onto the endpoint it is reported under: `attachment`,
+    `detail`, `list` or `other`.
+    """
+    path = url.split('?', 1)[0]
+    if _ATTACHMENT_PATH.search(path):
+        return 'attachment'
+    if _DETAIL_PATH.search(path):
+        return 'detail'
+    if path.endswith('/requests'):
+        return 'list'
+    return 'other'
+
+
+class _EndpointMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.statuses = {}
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, q):
+        """
+        Upper bound of the histogram bucket holding the q-th percentile.
+        """
+        if not self.calls:
+            return None
+        rank = q * self.calls
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return round(min(bound, self.latency_max), 4)
+        return round(self.latency_max, 4)
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'statuses': dict(sorted(self.statuses.items())),
+            'latency': {
+                'mean': round(self.latency_total / self.calls, 4) if self.calls else None,
+                'p50': self.percentile(0.5),
+                'p90': self.percentile(0.9),
+                'p99': self.percentile(0.99),
+                'max': round(self.latency_max, 4),
+                'histogram': dict(zip([f"<={b}s" for b in LATENCY_BUCKETS] + ['>30s'], self.buckets)),
+            },
+        }
+
+
+class ClientMetrics:
+    """
+    Thread-safe per-endpoint instrumentation for a client: call counts,
+    latency histograms (time to response headers), response bytes, status
+    codes, retries and errors, plus current and peak in-flight calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started = time.time()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _endpoint(self, endpoint):
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics()
+        return metrics
+
+    def begin(self, endpoint, retry=False):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if retry:
+                self._endpoint(endpoint).retries += 1
+
+    def end(self, endpoint, latency, status=None, error=False):
+        with self._lock:
+            self.in_flight -= 1
+            metrics = self._endpoint(endpoint)
+            metrics.calls += 1
+            metrics.latency_total += latency
+            metrics.latency_max = max(metrics.latency_max, latency)
+            metrics.buckets[sum(1 for bound in LATENCY_BUCKETS if latency > bound)] += 1
+            if error:
+                metrics.errors += 1
+            if status is not None:
+                metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+                if status >= 400:
+                    metrics.errors += 1
+
+    def add_bytes(self, endpoint, nbytes):
+        if nbytes:
+            with self._lock:
+                self._endpoint(endpoint).bytes += nbytes
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'endpoints': {name: m.snapshot() for name, m in sorted(self._endpoints.items())},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.started = time.time()
+            self.peak_in_flight = self.in_flight
+
+
+def format_stats(stats):
+    """
+    Renders a client `stats()` snapshot as a short plain-text report.
+    """
+    metrics = stats.get('http') or {}
+    lines = [
+        f"{'Endpoint':<12} | {'Calls':>6} | {'Errors':>6} | {'Retries':>7} | {'MB':>8} | "
+        f"{'Mean s':>7} | {'p50 s':>6} | {'p90 s':>6} | {'Max s':>6}",
+        "-" * 90,
+    ]
+    for name, m in metrics.get('endpoints', {}).items():
+        lat = m['latency']
+        lines.append(
+            f"{name:<12} | {m['calls']:>6} | {m['errors']:>6} | {m['retries']:>7} | {m['bytes'] / 1e6:>8.2f} | "
+            f"{lat['mean'] or 0:>7.3f} | {lat['p50'] or 0:>6.3f} | {lat['p90'] or 0:>6.3f} | {lat['max']:>6.3f}"
+        )
+    lines.append(f"Peak in-flight calls: {metrics.get('peak_in_flight', 0)}")
+
+    scheduler = stats.get('scheduler')
+    if scheduler:
+        lines.append(
+            f"Scheduler: limit {scheduler['concurrency_limit']}/{scheduler['max_concurrency']}, "
+            f"{scheduler['retries']} retries, {scheduler['throttled']} throttled, "
+            f"{scheduler.get('latency_backoffs', 0)} latency backoffs"
+        )
+    cache = stats.get('cache')
+    if cache:
+        lines.append(f"Cache: {cache['hits']} hits, {cache['misses']} misses (hit rate {cache['hit_rate']})")
+    return "\n".join(lines)
@@ -0,0 +1,275 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from .client import IntappIntakeClient, TIMESTAMP_FORMAT
+from .decoding import loads
+from .index import AnswerIndex
+from .roles import AssignmentTable
+from .watermark import SYNC_STATE_SCHEMA, SyncStateMixin, modified_stamp, next_watermark
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRROR_PATH = os.path.join("data", "intapp_mirror.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY,
+    request_type TEXT,
+    status TEXT,
+    current_state TEXT,
+    created_on TEXT,
+    modified_on TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS details (
+    id INTEGER PRIMARY KEY,
+    modified_on TEXT,
+    fetched_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summaries_status ON summaries (status, current_state);
+CREATE INDEX IF NOT EXISTS idx_summaries_modified ON summaries (modified_on);
+""" + SYNC_STATE_SCHEMA
+
+
+class RequestMirror(SyncStateMixin):
+    """
+    A local SQLite mirror of intake request summaries and full details.
+
+    `sync()` remembers the `filter.modifiedFrom` watermark per request-type
+    scope and only pulls rows changed since the previous run, fetching details
+    for those rows alone. The query helpers then answer from disk without
+    touching the API.
+    """
+
+    def __init__(self, path=DEFAULT_MIRROR_PATH, client=None):
+        self.path = path
+        self.client = client
+        self.index = None
+        self.assignments = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def sync(self, request_types=None, initial_lookback_days=365, full=False, fetch_details=True):
+        """
+        Pulls every request modified since the stored watermark (or the last
+        `initial_lookback_days` on first run / when `full` is set) and refreshes
+        the details of rows that changed. Returns a summary of the work done.
+        """
+        if self.client is None:
+            raise RuntimeError("RequestMirror.sync() requires a client")
+
+        scope = self._scope(request_types)
+        started = datetime.now()
+        since = None if full else self.get_watermark(request_types)
+        if since is None:
+            since = (started - timedelta(days=initial_lookback_days)).strftime(TIMESTAMP_FORMAT)
+
+        listed = 0
+        newest = ''
+        for summary in self.client.iter_requests(request_types=request_types, modified_from=since):
+            listed += 1
+            newest = max(newest, modified_stamp(summary))
+            self._upsert_summary(summary)
+        with self._lock:
+            self._conn.commit()
+
+        # Rows whose detail is missing (new, or a previous fetch failed) or older than the summary
+        with self._lock:
+            stale_ids = [row[0] for row in self._conn.execute(
+                "SELECT s.id FROM summaries s LEFT JOIN details d ON d.id = s.id "
+                "WHERE d.id IS NULL OR (s.modified_on IS NOT NULL AND d.modified_on IS NOT s.modified_on)"
+            )]
+
+        failed = []
+        fetched = 0
+        if fetch_details and stale_ids:
+            fetched, failed = self._fetch_details(stale_ids)
+
+        watermark = next_watermark(since, newest)
+        self._save_watermark(request_types, watermark, started)
+
+        logger.info(f"Mirror sync ({scope}): {listed} listed, {fetched} details fetched, {len(failed)} failed")
+        return {
+            'scope': scope,
+            'modified_from': since,
+            'listed': listed,
+            'details_fetched': fetched,
+            'failed_ids': failed,
+            'watermark': watermark,
+        }
+
+    def _upsert_summary(self, summary):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries "
+                "(id, request_type, status, current_state, created_on, modified_on, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    summary['id'],
+                    summary.get('requestType'),
+                    summary.get('status'),
+                    summary.get('currentState'),
+                    summary.get('createdOn'),
+                    summary.get('modifiedOn'),
+                    json.dumps(summary),
+                ),
+            )
+
+    def _store_detail(self, request_id, detail):
+        with self._lock:
+            # Fall back to the summary stamp so the staleness check has something to compare
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details (id, modified_on, fetched_at, data) "
+                "VALUES (?, COALESCE(?, (SELECT modified_on FROM summaries WHERE id = ?)), ?, ?)",
+                (
+                    request_id,
+                    detail.get('modifiedOn'),
+                    request_id,
+                    datetime.now().strftime(TIMESTAMP_FORMAT),
+                    json.dumps(detail),
+                ),
+            )
+        if self.index is not None:
+            self.index.add_request(dict(detail, id=request_id))
+        if self.assignments is not None:
+            self.assignments.add_request(dict(detail, id=request_id))
+
+    def _fetch_details(self, request_ids):
+        fetched = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.client.max_workers) as executor:
+            futures = {
+                executor.submit(self.client.get_request, req_id, use_cache=False): req_id
+                for req_id in request_ids
+            }
+            for future in as_completed(futures):
+                req_id = futures[future]
+                try:
+                    detail = future.result()
+                except Exception as e:
+                    logger.error(f"Mirror failed to fetch request {req_id}: {e}")
+                    failed.append(req_id)
+                    continue
+                if detail:
+                    self._store_detail(req_id, detail)
+                    fetched += 1
+        with self._lock:
+            self._conn.commit()
+        return fetched, failed
+
+    # -- Queries -----------------------------------------------------------
+
+    def list_requests(self, status=None, request_types=None, modified_from=None, exclude_states=None):
+        """
+        Returns mirrored request summaries, newest ID first.
+        """
+        clauses = []
+        args = []
+        if status:
+            clauses.append("status = ?")
+            args.append(status)
+        if request_types:
+            clauses.append(f"request_type IN ({','.join('?' * len(request_types))})")
+            args.extend(request_types)
+        if modified_from:
+            clauses.append("(modified_on IS NULL OR modified_on >= ?)")
+            args.append(modified_from)
+        if exclude_states:
+            clauses.append(f"(current_state IS NULL OR current_state NOT IN ({','.join('?' * len(exclude_states))}))")
+            args.extend(exclude_states)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT data FROM summaries {where} ORDER BY id DESC", args).fetchall()
+        return [loads(row["data"]) for row in rows]
+
+    def get_request(self, request_id):
+        """
+        Returns the mirrored full detail for a request, or None if it is not mirrored.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM details WHERE id = ?", (request_id,)).fetchone()
+        return loads(row["data"]) if row else None
+
+    def iter_details(self, modified_from=None):
+        """
+        Yields mirrored request details, newest ID first.
+        """
+        sql = "SELECT d.data FROM details d LEFT JOIN summaries s ON s.id = d.id"
+        args = []
+        if modified_from:
+            sql += " WHERE COALESCE(s.modified_on, d.modified_on) IS NULL OR COALESCE(s.modified_on, d.modified_on) >= ?"
+            args.append(modified_from)
+        sql += " ORDER BY d.id DESC"
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        for row in rows:
+            yield loads(row["data"])
+
+    def get_cfi_team_requests(self, limit=15, lookback_days=60):
+        """
+        Local equivalent of `IntappIntakeClient.get_cfi_team_requests`.
+        """
+        modified_from = (datetime.now() - timedelta(days=lookback_days)).strftime(TIMESTAMP_FORMAT)
+        matches = []
+        for detail in self.iter_details(modified_from=modified_from):
+            if IntappIntakeClient.is_cfi_team_request(detail):
+                matches.append(detail)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def build_answer_index(self):
+        """
+        Builds an AnswerIndex over every mirrored detail and keeps it attached,
+        so later syncs update it incrementally as details are refreshed.
+        """
+        self.index = AnswerIndex.from_requests(
+            dict(detail, id=request_id) for request_id, detail in self._iter_detail_rows()
+        )
+        return self.index
+
+    def build_assignment_table(self):
+        """
+        Builds an AssignmentTable (who holds which role on which request)
+        over every mirrored detail; later syncs keep it up to date.
+        """
+        self.assignments = AssignmentTable.from_requests(
+            dict(detail, id=request_id) for request_id, detail in self._iter_detail_rows()
+        )
+        return self.assignments
+
+    def _iter_detail_rows(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM details").fetchall()
+        for row in rows:
+            yield row["id"], loads(row["data"])
+
+    def stats(self):
+        with self._lock:
+            summaries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            details = self._conn.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+            scopes = {
+                row["scope"]: {'watermark': row["watermark"], 'synced_at': row["synced_at"]}
+                for row in self._conn.execute("SELECT scope, watermark, synced_at FROM sync_state")
+            }
+        return {'path': os.path.abspath(self.path), 'summaries': summaries, 'details': details, 'scopes': scopes}
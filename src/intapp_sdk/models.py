@@ -0,0 +1,265 @@
+import re
+import sys
+from datetime import datetime
+
+_MISSING = object()
+
+# Short values ("Yes", "No", people) repeat across thousands of requests; longer ones rarely do.
+_INTERN_MAX_LENGTH = 80
+
+_PERSON = re.compile(r'[\s,;]*(.*?)\s*\(([^()]*@[^()]*)\)')
+_NUMBER_JUNK = re.compile(r'[,$%\s]')
+
+# JSON key -> slot name for the fields promoted to attributes
+_ANSWER_FIELDS = {
+    'questionName': 'question',
+    'displayValue': 'display_value',
+    'numericAnswer': 'numeric_answer',
+    'textAnswer': 'text_answer',
+}
+_REQUEST_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'requestType': 'request_type',
+    'status': 'status',
+    'currentState': 'current_state',
+    'createdOn': 'created_on',
+    'modifiedOn': 'modified_on',
+}
+_REQUEST_KNOWN = set(_REQUEST_FIELDS) | {'answers', 'attachments'}
+
+
+# Canonical tuples of "other" JSON keys; every answer with the same shape shares one
+_KEY_SHAPES = {}
+
+
+def _split_extra(data, known):
+    """
+    Returns `(keys, values)` tuples for the JSON keys not promoted to slots.
+    The keys tuple is shared by every object with the same shape, so the
+    per-object cost is one tuple of values instead of a dict.
+    """
+    keys = tuple(k for k in data if k not in known)
+    if not keys:
+        return (), ()
+    keys = _KEY_SHAPES.setdefault(keys, keys)
+    return keys, tuple(_intern(data[k]) for k in keys)
+
+
+def _extra_get(keys, values, key, default):
+    try:
+        return values[keys.index(key)]
+    except ValueError:
+        return default
+
+
+def _intern(value):
+    if type(value) is str and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def parse_people(value):
+    """
+    Parses an answer value such as "Jane Doe (jd@x.com), Bob (b@x.com)"
+    into `((name, email), ...)`. Values without emails are split on commas
+    with the email set to None; empty values and "None" give `()`.
+    """
+    if not value or not isinstance(value, str) or value == "None":
+        return ()
+    # The '@' check keeps the (backtracking) person pattern off long free-text answers
+    found = '@' in value and tuple((name, email.strip()) for name, email in _PERSON.findall(value))
+    if found:
+        return found
+    return tuple((name.strip(), None) for name in value.split(',') if name.strip())
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+class Answer:
+    """
+    One answer of a request. Question names (and short values) are interned,
+    so thousands of requests share a single copy of each. `number` and
+    `people` are parsed from the raw values on first use.
+
+    `get()` / `[]` accept the API's JSON keys, so code written against raw
+    answer dicts keeps working (null fields read as missing).
+    """
+
+    __slots__ = ('question', 'display_value', 'numeric_answer', 'text_answer', '_extra_keys', '_extra_values',
+                 '_number', '_people')
+
+    def __init__(self, data):
+        self.question = _intern(data.get('questionName'))
+        self.display_value = _intern(data.get('displayValue'))
+        self.numeric_answer = data.get('numericAnswer')
+        self.text_answer = data.get('textAnswer')
+        self._extra_keys, self._extra_values = _split_extra(data, _ANSWER_FIELDS)
+        self._number = _MISSING
+        self._people = None
+
+    @property
+    def number(self):
+        """
+        `numericAnswer`, falling back to the display value parsed as a number
+        ("1,250", "$3,000", "15%"). None when neither is numeric.
+        """
+        if self._number is _MISSING:
+            number = self.numeric_answer
+            if number is None and isinstance(self.display_value, str):
+                try:
+                    number = float(_NUMBER_JUNK.sub('', self.display_value))
+                    if number.is_integer():
+                        number = int(number)
+                except ValueError:
+                    number = None
+            self._number = number
+        return self._number
+
+    @property
+    def people(self):
+        """
+        `[(name, email), ...]` parsed from values like "Jane Doe (jd@x.com), Bob (b@x.com)".
+        """
+        if self._people is None:
+            self._people = parse_people(self.display_value)
+        return self._people
+
+    def get(self, key, default=None):
+        slot = _ANSWER_FIELDS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            return default if value is None else value
+        return _extra_get(self._extra_keys, self._extra_values, key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self):
+        data = {key: getattr(self, slot) for key, slot in _ANSWER_FIELDS.items()
+                if getattr(self, slot) is not None}
+        data.update(zip(self._extra_keys, self._extra_values))
+        return data
+
+    def __repr__(self):
+        return f"Answer({self.question!r}: {self.display_value!r})"
+
+
+class Request:
+    """
+    Compact typed form of an intake request (a listing row or a full detail).
+
+    Common fields are attributes (`id`, `name`, `status`, `current_state`,
+    `created_on`, ...); answers are `Answer` objects indexed by question
+    name in `answers`, so `request.answer("ARI - Fee")` is a dict lookup.
+    If a question appears twice the last answer wins in that index, as with a
+    `{questionName: answer}` map, and answers without a question name are
+    left out of it. Listing rows have `answers` set to None.
+
+    Like `Answer`, `get()` / `[]` accept the API's JSON keys (`'answers'`
+    yields every Answer object in the API's order, duplicates and unnamed
+    ones included), so helpers such as `is_cfi_team_request` and
+    `AnswerIndex.add_request` give the same results for either form.
+    """
+
+    __slots__ = ('id', 'name', 'request_type', 'status', 'current_state', 'created_on', 'modified_on',
+                 'answers', 'attachments', '_answer_list', '_extra_keys', '_extra_values')
+
+    def __init__(self, data):
+        self.id = data.get('id')
+        self.name = data.get('name')
+        self.request_type = _intern(data.get('requestType'))
+        self.status = _intern(data.get('status'))
+        self.current_state = _intern(data.get('currentState'))
+        self.created_on = data.get('createdOn')
+        self.modified_on = data.get('modifiedOn')
+        answers = data.get('answers')
+        if answers is None:
+            self.answers = None
+            self._answer_list = None
+        else:
+            # The full ordered tuple backs get('answers') / to_dict(); the dict is only a lookup index
+            self._answer_list = tuple(Answer(raw) for raw in answers)
+            self.answers = {answer.question: answer for answer in self._answer_list if answer.question is not None}
+        self.attachments = data.get('attachments')
+        self._extra_keys, self._extra_values = _split_extra(data, _REQUEST_KNOWN)
+
+    @classmethod
+    def from_json(cls, data):
+        return None if data is None else cls(data)
+
+    @property
+    def is_detail(self):
+        return self.answers is not None
+
+    def answer(self, question):
+        """
+        The `Answer` to `question`, or None.
+        """
+        return self.answers.get(question) if self.answers else None
+
+    def value(self, question, default=None):
+        """
+        Display value of the answer to `question`, or `default`.
+        """
+        answer = self.answer(question)
+        if answer is None or answer.display_value is None:
+            return default
+        return answer.display_value
+
+    @property
+    def created(self):
+        return _parse_timestamp(self.created_on)
+
+    @property
+    def modified(self):
+        return _parse_timestamp(self.modified_on)
+
+    def get(self, key, default=None):
+        slot = _REQUEST_FIELDS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            return default if value is None else value
+        if key == 'answers':
+            return default if self._answer_list is None else list(self._answer_list)
+        if key == 'attachments':
+            return default if self.attachments is None else self.attachments
+        return _extra_get(self._extra_keys, self._extra_values, key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self):
+        """
+        Rebuilds the API's JSON shape (fields that were null are omitted).
+        """
+        data = {key: getattr(self, slot) for key, slot in _REQUEST_FIELDS.items()
+                if getattr(self, slot) is not None}
+        data.update(zip(self._extra_keys, self._extra_values))
+        if self._answer_list is not None:
+            data['answers'] = [a.to_dict() for a in self._answer_list]
+        if self.attachments is not None:
+            data['attachments'] = self.attachments
+        return data
+
+    def __repr__(self):
+        return f"Request({self.id!r}, {self.name!r})"
@@ -0,0 +1,154 @@
+from datetime import date, datetime
+
+from .index import _field_matcher, normalize_text
+
+# Requests in these states/statuses are finished and dropped by the "active only" helpers
+INACTIVE_STATES = ("Canceled", "Finalized")
+INACTIVE_STATUSES = ("Complete",)
+
+
+def _timestamp(value):
+    """
+    Normalises a datetime, date or ISO string bound to the API's
+    `YYYY-MM-DDTHH:MM:SS` form, which compares correctly as a string.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%S")
+    if isinstance(value, date):
+        return f"{value.isoformat()}T00:00:00"
+    return str(value)[:19]
+
+
+def _as_set(value):
+    if value is None:
+        return None
+    return frozenset([value] if isinstance(value, str) else value)
+
+
+def _value_matcher(expected):
+    """
+    Predicate over an answer's display value: a substring (case-insensitive),
+    a list of substrings (any wins) or a callable taking the raw value.
+    """
+    if callable(expected):
+        return expected
+    needles = [normalize_text(e) for e in ([expected] if isinstance(expected, str) else expected)]
+
+    def matches(value):
+        if value is None:
+            return False
+        text = normalize_text(value)
+        return any(n in text for n in needles)
+    return matches
+
+
+class RequestQuery:
+    """
+    Declarative filter over intake requests, split into three stages so each
+    condition is evaluated as early (and as cheaply) as possible:
+
+    - server: request types and the `modified_from` / `modified_to` range
+      become `filter.*` list parameters. `created_from` also tightens `modified_from`, since a
+      request cannot be modified before it was created.
+    - summary: status / state / date bounds and `where(row)` run on listing
+      rows, before any detail is fetched.
+    - detail: `answers` and `where_detail(detail)` need the full request, so
+      details are only fetched for rows that passed the summary stage.
+
+    `status`, `state` and their `exclude_*` counterparts take a value or a
+    collection. `answers` maps a question name (substring or glob, as in
+    `AnswerIndex.search`) to an expected display value (substring, list of
+    substrings or a callable); all entries must match.
+    """
+
+    def __init__(self, request_types=None, status=None, state=None, exclude_status=None, exclude_state=None,
+                 modified_from=None, modified_to=None, created_from=None, created_to=None,
+                 answers=None, where=None, where_detail=None):
+        self.request_types = request_types
+        self.status = _as_set(status)
+        self.state = _as_set(state)
+        self.exclude_status = _as_set(exclude_status)
+        self.exclude_state = _as_set(exclude_state)
+        self.modified_from = _timestamp(modified_from)
+        self.modified_to = _timestamp(modified_to)
+        self.created_from = _timestamp(created_from)
+        self.created_to = _timestamp(created_to)
+        self.answers = [(question, _field_matcher(question), _value_matcher(expected))
+                        for question, expected in (answers or {}).items()]
+        self.where = where
+        self.where_detail = where_detail
+
+    @property
+    def list_params(self):
+        """
+        Keyword arguments for `list_requests` / `iter_requests` (the pushed-down part).
+        """
+        bounds = [b for b in (self.modified_from, self.created_from) if b]
+        return {'request_types': self.request_types, 'modified_from': max(bounds) if bounds else None,
+                'modified_to': self.modified_to}
+
+    @property
+    def needs_detail(self):
+        return bool(self.answers) or self.where_detail is not None
+
+    def matches_summary(self, row):
+        status = row.get('status')
+        state = row.get('currentState')
+        if self.status is not None and status not in self.status:
+            return False
+        if self.state is not None and state not in self.state:
+            return False
+        if self.exclude_status and status in self.exclude_status:
+            return False
+        if self.exclude_state and state in self.exclude_state:
+            return False
+        if not self._in_range(row.get('modifiedOn'), self.modified_from, self.modified_to):
+            return False
+        if not self._in_range(row.get('createdOn'), self.created_from, self.created_to):
+            return False
+        return self.where is None or bool(self.where(row))
+
+    def matches_detail(self, detail):
+        # The detail is re-checked against the summary stage: it may be newer than the listing row
+        if not self.matches_summary(detail):
+            return False
+        for _, question_matches, value_matches in self.answers:
+            if not any(question_matches(a.get('questionName') or '') and value_matches(a.get('displayValue'))
+                       for a in detail.get('answers', [])):
+                return False
+        return self.where_detail is None or bool(self.where_detail(detail))
+
+    @staticmethod
+    def _in_range(value, start, end):
+        if start is None and end is None:
+            return True
+        if not value:
+            # Unknown timestamps are kept; the server-side bound already applied
+            return True
+        value = value[:19]
+        return (start is None or value >= start) and (end is None or value <= end)
+
+    def explain(self):
+        """
+        Describes where each condition is evaluated.
+        """
+        summary = [name for name in ('status', 'state', 'exclude_status', 'exclude_state',
+                                     'created_from', 'created_to', 'where') if getattr(self, name) is not None]
+        detail = [f"answers[{question!r}]" for question, _, _ in self.answers]
+        if self.where_detail is not None:
+            detail.append('where_detail')
+        return {'server': {k: v for k, v in self.list_params.items() if v is not None},
+                'summary': summary, 'detail': detail}
+
+    def __repr__(self):
+        return f"RequestQuery({self.explain()})"
+
+
+def active_requests_query(modified_from=None, **kwargs):
+    """
+    A query that skips canceled, finalized and completed requests.
+    """
+    return RequestQuery(modified_from=modified_from, exclude_state=INACTIVE_STATES,
+                        exclude_status=INACTIVE_STATUSES, **kwargs)
@@ -0,0 +1,123 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from .client import TIMESTAMP_FORMAT
+from .watermark import modified_stamp, next_watermark
+
+logger = logging.getLogger(__name__)
+
+
+class RecentRequestsView:
+    """
+    In-memory, pre-sorted view of the requests modified in the last
+    `window_days`, newest `createdOn` first.
+
+    The first `refresh()` lists the whole window; later ones only ask for
+    rows modified since the previous refresh (`filter.modifiedFrom`), merge
+    them by ID and drop rows that aged out of the window. Readers get a
+    slice of the already-sorted list together with the age of the data.
+    `start()` keeps the view fresh from a background thread.
+    """
+
+    def __init__(self, client, window_days=30, refresh_interval=300, request_types=None):
+        self.client = client
+        self.window_days = window_days
+        self.refresh_interval = refresh_interval
+        self.request_types = request_types
+        self.refreshed_at = None
+        self.last_error = None
+        self._rows = {}
+        self._sorted = []
+        self._watermark = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self, full=False):
+        """
+        Pulls rows changed since the last refresh (the whole window when
+        `full` is set or nothing is loaded yet) and swaps in the new view.
+        """
+        with self._refresh_lock:
+            started = datetime.now()
+            cutoff = (started - timedelta(days=self.window_days)).strftime(TIMESTAMP_FORMAT)
+            incremental = not full and self._watermark is not None
+            since = max(self._watermark, cutoff) if incremental else cutoff
+
+            changed = list(self.client.iter_requests(request_types=self.request_types, modified_from=since))
+
+            rows = dict(self._rows) if incremental else {}
+            for row in changed:
+                rows[row['id']] = row
+            # Rows not modified since the cutoff have left the window
+            rows = {rid: row for rid, row in rows.items()
+                    if not row.get('modifiedOn') or row['modifiedOn'] >= cutoff}
+            ordered = sorted(rows.values(), key=lambda x: x.get('createdOn') or '', reverse=True)
+
+            with self._lock:
+                self._rows = rows
+                self._sorted = ordered
+                self._watermark = next_watermark(since, max(map(modified_stamp, changed), default=''))
+                self.refreshed_at = started
+                self.last_error = None
+
+            logger.info(f"Recent requests view: {len(changed)} changed since {since}, {len(ordered)} in window")
+            return {'modified_from': since, 'listed': len(changed), 'rows': len(ordered), 'full': not incremental}
+
+    def age(self):
+        """
+        Seconds since the last successful refresh, or None if never loaded.
+        """
+        refreshed_at = self.refreshed_at
+        if refreshed_at is None:
+            return None
+        return (datetime.now() - refreshed_at).total_seconds()
+
+    def get(self, limit=None, max_age=None):
+        """
+        Returns `(rows, age_seconds)` for the newest `limit` requests.
+        Loads the view synchronously if it is empty or older than `max_age`.
+        """
+        if self._is_stale(max_age):
+            with self._refresh_lock:
+                # Another caller (or the background thread) may have refreshed while we waited
+                if self._is_stale(max_age):
+                    self.refresh()
+        with self._lock:
+            rows = self._sorted[:limit] if limit is not None else list(self._sorted)
+        return rows, self.age()
+
+    def _is_stale(self, max_age):
+        age = self.age()
+        return age is None or (max_age is not None and age > max_age)
+
+    def start(self):
+        """
+        Starts the background refresh thread (idempotent).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="recent-requests-refresh", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            age = self.age()
+            if age is None or age >= self.refresh_interval:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.warning(f"Background refresh of recent requests failed: {e}")
+                age = 0
+            self._stop.wait(max(self.refresh_interval - age, 1))
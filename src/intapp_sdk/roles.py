@@ -0,0 +1,253 @@
+import re
+import threading
+from collections import Counter, defaultdict, namedtuple
+
+from .index import _field_matcher, normalize_text
+from .models import parse_people
+
+# Person-valued questions and the role each assigns (labels as in commands/fetch_request_data.py).
+# Other questions whose values name people keep their question name as the role.
+ROLE_QUESTIONS = {
+    'ARI - Partner Assigned': 'CVG QC',
+    'ARI - Assigned Analyst': 'CVG Analyst',
+    'ARI - Engagement Partner': 'Engagement Shareholder',
+    'ARI - Engagement Quality Reviewer': 'Engagement Quality Reviewer',
+    'ARI - Additional Analyst': 'Additional Analyst',
+    'RSD - Engagement Team Members': 'Audit Team',
+    'ARI - QC Reviewer': 'QC Reviewer',
+    'ARI - Previous Reviewer': 'Previous Reviewer',
+}
+
+Assignment = namedtuple('Assignment', 'request_id person email role question')
+
+
+def person_key(name, email=None):
+    """
+    Identity used to group assignments: the email when known, else the normalized name.
+    """
+    return email.casefold() if email else normalize_text(name)
+
+
+class RoleMatcher:
+    """
+    Precompiled "person X in a question matching P" rules, e.g. Mark Rob in
+    QC/Reviewer fields. All person names are folded into one regex, so each
+    answer value is scanned once however many people are tracked, and each
+    distinct question name is matched against the rules' patterns only once.
+    Person names match as case-insensitive substrings of the value and
+    question patterns follow `AnswerIndex.search`'s `field` syntax.
+    """
+
+    def __init__(self, rules):
+        self.rules = [(normalize_text(person), _field_matcher(field)) for person, field in rules]
+        names = sorted({person for person, _ in self.rules}, key=len, reverse=True)
+        # Case and runs of whitespace are handled by the pattern, so values are scanned as-is
+        self._pattern = re.compile('|'.join(r'\s+'.join(map(re.escape, name.split(' '))) for name in names),
+                                   re.IGNORECASE)
+        self._questions = {}
+
+    def _people_for(self, question):
+        people = self._questions.get(question)
+        if people is None:
+            people = self._questions[question] = frozenset(
+                person for person, field in self.rules if field is None or field(question))
+        return people
+
+    def matches(self, detail):
+        """
+        Returns the `(person, questionName)` pairs of `detail` that satisfy a rule.
+        """
+        found = []
+        for a in detail.get('answers') or []:
+            question = a.get('questionName') or ''
+            people = self._people_for(question)
+            if not people:
+                continue
+            value = a.get('displayValue')
+            if value is None:
+                continue
+            for hit in {normalize_text(h) for h in self._pattern.findall(str(value))}:
+                if hit in people:
+                    found.append((hit, question))
+        return found
+
+    def __call__(self, detail):
+        return bool(self.matches(detail))
+
+
+# The CFI team: Mark Rob as QC/Reviewer or Michael Sloan as Analyst
+CFI_TEAM = RoleMatcher([("Mark Rob", ["QC", "Reviewer"]), ("Michael Sloan", "Analyst")])
+
+
+class AssignmentTable:
+    """
+    Every (person, role, request) assignment, extracted in one pass over
+    request details. Answers to `roles` questions count even when they hold
+    bare names, and so do answers to questions matching `fields` (patterns
+    as in `AnswerIndex.search`); any other answer counts only when its value
+    names people with emails ("Name (email)"). The request's creator is
+    recorded with the role 'Creator'.
+
+    Assignments are kept per request and indexed by person, so per-person
+    and per-team workload queries are dictionary lookups rather than
+    another crawl. Requests can be added or replaced as details change.
+    """
+
+    def __init__(self, roles=ROLE_QUESTIONS, fields=None):
+        self.roles = dict(roles)
+        self._fields = _field_matcher(fields)
+        self._named = {}
+        self._by_request = {}
+        self._by_person = defaultdict(dict)
+        self._role_counts = defaultdict(Counter)
+        self._names = {}
+        self._summaries = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_requests(cls, details, roles=ROLE_QUESTIONS, fields=None):
+        table = cls(roles, fields)
+        for detail in details:
+            table.add_request(detail)
+        return table
+
+    def __len__(self):
+        return len(self._by_request)
+
+    def __contains__(self, request_id):
+        return request_id in self._by_request
+
+    def _takes_names(self, question):
+        # Whether bare names (without emails) count for this question; cached per question name
+        named = self._named.get(question)
+        if named is None:
+            named = self._named[question] = question in self.roles or bool(
+                self._fields is not None and question and self._fields(question))
+        return named
+
+    def extract(self, detail):
+        """
+        Returns the assignments of a single request detail.
+        """
+        request_id = detail.get('id')
+        assignments = []
+        creator = detail.get('requestedBy') or detail.get('createdBy')
+        if creator:
+            assignments.append(Assignment(request_id, creator, None, 'Creator', None))
+        for a in detail.get('answers') or []:
+            question = a.get('questionName')
+            value = a.get('displayValue')
+            named = self._takes_names(question)
+            # Other answers only count when they contain an email
+            if not named and (not isinstance(value, str) or '@' not in value):
+                continue
+            people = parse_people(value)
+            if not people or (not named and people[0][1] is None):
+                continue
+            role = self.roles.get(question, question)
+            for name, email in people:
+                assignments.append(Assignment(request_id, name, email, role, question))
+        return assignments
+
+    def add_request(self, detail):
+        """
+        Records (or replaces) the assignments of a request detail.
+        """
+        request_id = detail['id']
+        assignments = self.extract(detail)
+        roles_by_person = defaultdict(set)
+        for a in assignments:
+            roles_by_person[person_key(a.person, a.email)].add(a.role)
+        with self._lock:
+            self.remove_request(request_id)
+            self._by_request[request_id] = assignments
+            self._summaries[request_id] = {k: detail.get(k) for k in ('id', 'name', 'status', 'currentState')}
+            # Per-person role counts are kept current here, so workload queries never rescan requests
+            for key, roles in roles_by_person.items():
+                self._by_person[key][request_id] = roles
+                self._role_counts[key].update(roles)
+            for a in assignments:
+                key = person_key(a.person, a.email)
+                # Prefer a name seen together with its email
+                if key not in self._names or a.email:
+                    self._names[key] = a.person
+
+    def remove_request(self, request_id):
+        with self._lock:
+            for key in {person_key(a.person, a.email) for a in self._by_request.pop(request_id, ())}:
+                roles = self._by_person[key].pop(request_id, ())
+                self._role_counts[key].subtract(roles)
+                if not self._by_person[key]:
+                    del self._by_person[key]
+                    del self._role_counts[key]
+                    self._names.pop(key, None)
+            self._summaries.pop(request_id, None)
+
+    def people(self):
+        """
+        Returns `{person key: display name}` for everyone with an assignment.
+        """
+        with self._lock:
+            return dict(self._names)
+
+    def find_people(self, person):
+        """
+        Person keys matching `person`: an email, or a case-insensitive name
+        substring (as the answer searches match "Mark Rob").
+        """
+        needle = normalize_text(person)
+        with self._lock:
+            if '@' in needle and needle in self._by_person:
+                return [needle]
+            return [key for key, name in self._names.items() if needle in normalize_text(name) or needle in key]
+
+    def assignments(self, person=None, role=None, question=None, request_id=None):
+        """
+        Assignments filtered by person (see `find_people`), role label,
+        question name pattern and/or request ID.
+        """
+        question_matches = _field_matcher(question)
+        roles = None if role is None else {role} if isinstance(role, str) else set(role)
+        with self._lock:
+            keys = set(self.find_people(person)) if person is not None else None
+            if request_id is not None:
+                request_ids = [request_id] if request_id in self._by_request else []
+            elif keys is not None:
+                request_ids = sorted({rid for key in keys for rid in self._by_person[key]}, reverse=True)
+            else:
+                request_ids = sorted(self._by_request, reverse=True)
+            results = []
+            for rid in request_ids:
+                for a in self._by_request[rid]:
+                    if keys is not None and person_key(a.person, a.email) not in keys:
+                        continue
+                    if roles is not None and a.role not in roles:
+                        continue
+                    if question_matches is not None and not (a.question and question_matches(a.question)):
+                        continue
+                    results.append(a)
+            return results
+
+    def requests_for(self, person, role=None, question=None):
+        """
+        Summaries (id, name, status, currentState) of the requests a person is assigned to, newest ID first.
+        """
+        ids = dict.fromkeys(a.request_id for a in self.assignments(person, role=role, question=question))
+        with self._lock:
+            return [self._summaries[rid] for rid in ids]
+
+    def workload(self, people=None, roles=None):
+        """
+        Returns `{person: {role: request count}}` for everyone, or only for
+        `people` (names or emails; a team is just a list of them).
+        """
+        with self._lock:
+            if people is None:
+                keys = list(self._by_person)
+            else:
+                keys = list(dict.fromkeys(k for p in people for k in self.find_people(p)))
+            result = defaultdict(Counter)
+            for key in keys:
+                result[self._names[key]].update({role: n for role, n in self._role_counts[key].items()
+                                                 if n > 0 and (roles is None or role in roles)})
+            return {name: dict(counts.most_common()) for name, counts in result.items() if counts}
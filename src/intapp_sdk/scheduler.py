@@ -0,0 +1,350 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import count
+
+from .metrics import endpoint_name
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` requests per second with bursts of up to
+    `burst`. `reserve()` never blocks; it takes a token (possibly one that
+    only becomes available later) and returns how long the caller must wait,
+    so the same bucket works for threads and coroutines.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class AIMDLimit:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Each healthy response grows the limit by `increase / limit` (about one
+    slot per round of requests). A throttled or failed response multiplies
+    it by `decrease`, at most once per `cooldown` seconds so a burst of
+    errors from one round only counts once.
+
+    A slow response counts the same way. Latency is judged per endpoint
+    (`key`: list, detail and attachment calls have very different costs)
+    against a smoothed typical latency, once `warmup` samples are in: a
+    response is slow when it takes longer than both `latency_tolerance`
+    times that typical latency and `latency_floor` seconds, so scheduling
+    jitter on fast calls is not mistaken for congestion.
+    """
+
+    def __init__(self, max_limit, min_limit=1, initial=None, increase=1.0, decrease=0.5,
+                 latency_tolerance=4.0, cooldown=1.0, latency_floor=0.1, warmup=20, smoothing=0.05):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(initial or max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.latency_floor = latency_floor
+        self.warmup = warmup
+        self.smoothing = smoothing
+        # key -> (typical latency, samples seen)
+        self.baselines = {}
+        self.latency_decreases = 0
+        self._last_decrease = 0.0
+
+    def on_success(self, latency, key=None):
+        typical, samples = self.baselines.get(key, (latency, 0))
+        ceiling = max(typical * self.latency_tolerance, self.latency_floor)
+        slow = samples >= self.warmup and latency > ceiling
+        # Outliers are capped before averaging, so a congested stretch raises the baseline only slowly
+        self.baselines[key] = (typical + (min(latency, ceiling) - typical) * self.smoothing, samples + 1)
+        if slow:
+            if self.on_congestion():
+                self.latency_decreases += 1
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+    def on_congestion(self):
+        """
+        Shrinks the limit unless it was shrunk within `cooldown`; returns whether it did.
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return False
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        return True
+
+    @property
+    def slots(self):
+        return max(self.min_limit, int(self.limit))
+
+
+class RetryPolicy:
+    """
+    Which responses to retry and how long to wait in between: full-jitter
+    exponential backoff, or the server's `Retry-After` when it sends one.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts=4, backoff=0.5, max_backoff=30.0, max_retry_after=120.0,
+                 statuses=RETRY_STATUSES):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+
+    def should_retry(self, attempt, status):
+        return status in self.statuses and attempt + 1 < self.max_attempts
+
+    def can_retry(self, attempt):
+        return attempt + 1 < self.max_attempts
+
+    @staticmethod
+    def retry_after(headers):
+        """
+        Parses a `Retry-After` header (seconds or an HTTP date) into seconds.
+        """
+        value = headers.get('Retry-After') if headers is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def delay(self, attempt, headers=None):
+        retry_after = self.retry_after(headers)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class _SchedulerBase:
+    """
+    State shared by the thread and asyncio schedulers: the rate limit,
+    the adaptive concurrency limit, the retry policy and counters.
+    """
+
+    def __init__(self, max_concurrency=20, rate=None, burst=None, retry=None, min_concurrency=1):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.limit = AIMDLimit(max_concurrency, min_limit=min_concurrency)
+        self.retry = retry or RetryPolicy()
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self._resume_at = 0.0
+
+    def _start_delay(self):
+        delay = max(0.0, self._resume_at - time.monotonic())
+        if self.bucket is not None:
+            delay = max(delay, self.bucket.reserve())
+        return delay
+
+    def _record(self, latency, congested, url=None):
+        self.requests += 1
+        if congested:
+            self.throttled += 1
+            self.limit.on_congestion()
+        elif latency is not None:
+            self.limit.on_success(latency, endpoint_name(url) if url else None)
+
+    def _plan_retry(self, attempt, url, reason, headers=None):
+        delay = self.retry.delay(attempt, headers)
+        if self.retry.retry_after(headers) is not None:
+            # The server asked everyone to back off, not just this call
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        self.retries += 1
+        logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 2}/{self.retry.max_attempts}): {reason}")
+        return delay
+
+    def stats(self):
+        return {
+            'concurrency_limit': round(self.limit.limit, 2),
+            'max_concurrency': self.limit.max_limit,
+            'in_flight': self.in_flight,
+            'rate_limit': self.bucket.rate if self.bucket else None,
+            'requests': self.requests,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            # Limit decreases triggered by slow (not failed) responses
+            'latency_backoffs': self.limit.latency_decreases,
+            'errors': self.errors,
+        }
+
+
+class RequestScheduler(_SchedulerBase):
+    """
+    Runs HTTP calls from many threads under a shared token-bucket rate limit
+    (`rate` requests/second, optional) and an AIMD concurrency limit between
+    `min_concurrency` and `max_concurrency`. Responses with a retryable status
+    (429/5xx) and transport errors are retried with jittered backoff,
+    honouring `Retry-After`. One scheduler may be shared by several clients.
+    """
+
+    def __init__(self, max_concurrency=20, rate=None, burst=None, retry=None, min_concurrency=1):
+        super().__init__(max_concurrency, rate, burst, retry, min_concurrency)
+        self._cond = threading.Condition()
+
+    def call(self, send, url=None, consume=None, retry_on=()):
+        """
+        Calls `send()` (which returns a response) until it succeeds or runs
+        out of attempts. `consume(response)`, if given, runs while the call
+        still holds its concurrency slot and its result is returned instead
+        of the response. The final response is returned even when its status
+        is an error, so callers keep their own `raise_for_status()` handling.
+        """
+        for attempt in count():
+            self._acquire()
+            started = time.monotonic()
+            try:
+                response = send()
+            except retry_on as e:
+                self._release(None, congested=True, error=True)
+                if not self.retry.can_retry(attempt):
+                    raise
+                with self._cond:
+                    delay = self._plan_retry(attempt, url, e)
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._release(None, congested=False, error=True)
+                raise
+
+            latency = time.monotonic() - started
+            status = response.status_code
+            congested = status in self.retry.statuses
+            if self.retry.should_retry(attempt, status):
+                self._release(latency, congested=True)
+                with self._cond:
+                    delay = self._plan_retry(attempt, url, f"HTTP {status}", response.headers)
+                response.close()
+                time.sleep(delay)
+                continue
+            try:
+                return consume(response) if consume is not None else response
+            finally:
+                self._release(latency, congested=congested, url=url)
+
+    def _acquire(self):
+        delay = self._start_delay()
+        if delay:
+            time.sleep(delay)
+        with self._cond:
+            while self.in_flight >= self.limit.slots:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def _release(self, latency, congested, error=False, url=None):
+        with self._cond:
+            self.in_flight -= 1
+            if error:
+                self.errors += 1
+            self._record(latency, congested, url)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return super().stats()
+
+
+class AsyncRequestScheduler(_SchedulerBase):
+    """
+    asyncio counterpart of `RequestScheduler`; use one per event loop.
+    """
+
+    def __init__(self, max_concurrency=100, rate=None, burst=None, retry=None, min_concurrency=1):
+        super().__init__(max_concurrency, rate, burst, retry, min_concurrency)
+        self._waiters = []
+
+    async def call(self, send, url=None, consume=None, retry_on=()):
+        """
+        Awaits `send()` with the same retry and limiting rules as
+        `RequestScheduler.call`; `consume` is an async callable.
+        """
+        # Imported here so sync-only users (and the CLI) do not pay for asyncio at startup
+        import asyncio
+
+        for attempt in count():
+            await self._acquire()
+            started = time.monotonic()
+            try:
+                response = await send()
+            except retry_on as e:
+                self._release(None, congested=True, error=True)
+                if not self.retry.can_retry(attempt):
+                    raise
+                await asyncio.sleep(self._plan_retry(attempt, url, e))
+                continue
+            except BaseException:
+                self._release(None, congested=False, error=True)
+                raise
+
+            latency = time.monotonic() - started
+            status = response.status_code
+            congested = status in self.retry.statuses
+            if self.retry.should_retry(attempt, status):
+                self._release(latency, congested=True)
+                delay = self._plan_retry(attempt, url, f"HTTP {status}", response.headers)
+                await response.aclose()
+                await asyncio.sleep(delay)
+                continue
+            try:
+                return await consume(response) if consume is not None else response
+            finally:
+                self._release(latency, congested=congested, url=url)
+
+    async def _acquire(self):
+        import asyncio
+
+        delay = self._start_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        while self.in_flight >= self.limit.slots:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def _release(self, latency, congested, error=False, url=None):
+        # Synchronous so it also runs cleanly from `finally` blocks of cancelled tasks
+        self.in_flight -= 1
+        if error:
+            self.errors += 1
+        self._record(latency, congested, url)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
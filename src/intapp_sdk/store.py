@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from .manifest import AttachmentManifest, atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_ROOT = os.path.join("data", "attachment_store")
+
+# Metadata fields that, when the API provides them, identify content across requests.
+CONTENT_HASH_FIELDS = ('sha256', 'contentHash', 'hash', 'checksum', 'md5')
+
+
+class AttachmentStore:
+    """
+    Content-addressed, deduplicated storage for attachment bytes.
+
+    Each distinct file is kept once under `objects/<sha[:2]>/<sha256>`.
+    An index maps attachment identities (attachment ID plus a fingerprint of
+    its metadata, and any content hash the API reports) to the stored object,
+    so an attachment the store already holds is never downloaded again.
+    Per-request directories are views built from hardlinks (falling back to
+    copies where the filesystem cannot link).
+    """
+
+    def __init__(self, root=DEFAULT_STORE_ROOT):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.staging_dir = os.path.join(root, "staging")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable store index {self.index_path}: {e}")
+
+    def object_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    @staticmethod
+    def _keys(attachment):
+        keys = [f"{field}:{attachment[field]}" for field in CONTENT_HASH_FIELDS if attachment.get(field)]
+        if attachment.get('id') is not None:
+            keys.append(f"id:{attachment['id']}")
+        return keys
+
+    def lookup(self, attachment):
+        """
+        Returns the SHA-256 of the stored object for an attachment's metadata,
+        or None if it has to be downloaded. Metadata with only an `id` matches
+        any stored version of that attachment; fuller metadata must match the
+        fingerprint recorded when it was stored.
+        """
+        fingerprint = AttachmentManifest.fingerprint(attachment)
+        id_only = set(attachment) <= {'id'}
+        with self._lock:
+            for key in self._keys(attachment):
+                entry = self._index.get(key)
+                if not entry:
+                    continue
+                if key.startswith("id:") and not id_only and entry.get('fingerprint') != fingerprint:
+                    continue
+                if os.path.exists(self.object_path(entry['sha256'])):
+                    return entry['sha256']
+        return None
+
+    def staging_path(self):
+        """
+        Returns a fresh path inside the store to download into before `commit()`.
+        """
+        fd, path = tempfile.mkstemp(suffix=".part", dir=self.staging_dir)
+        os.close(fd)
+        return path
+
+    def commit(self, staged_path, sha256, attachment):
+        """
+        Moves a downloaded file into the store (dropping it if the content is
+        already present) and records the attachment's identity.
+        """
+        target = self.object_path(sha256)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            os.remove(staged_path)
+        else:
+            os.replace(staged_path, target)
+
+        entry = {
+            'sha256': sha256,
+            'size': os.path.getsize(target),
+            'fingerprint': AttachmentManifest.fingerprint(attachment),
+        }
+        id_only = set(attachment) <= {'id'}
+        with self._lock:
+            for key in self._keys(attachment):
+                existing = self._index.get(key)
+                # Don't let a bare-ID download replace the fingerprint of full metadata
+                if id_only and existing and existing['sha256'] == sha256:
+                    continue
+                self._index[key] = entry
+            atomic_write_bytes(self.index_path, json.dumps(self._index, sort_keys=True).encode('utf-8'))
+        return sha256
+
+    def materialize(self, sha256, output_path):
+        """
+        Places a stored object at `output_path` as a hardlink (or a copy when
+        linking is not possible). Returns `(size, sha256)`.
+        """
+        source = self.object_path(sha256)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(output_path)}.", suffix=".part",
+                                        dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
+        os.remove(tmp_path)
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, output_path)
+        return os.path.getsize(output_path), sha256
+
+    def stats(self):
+        count = 0
+        total = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                count += 1
+                total += os.path.getsize(os.path.join(dirpath, name))
+        with self._lock:
+            references = len(self._index)
+        return {'root': os.path.abspath(self.root), 'objects': count, 'bytes': total, 'references': references}
@@ -0,0 +1,206 @@
+import base64
+import hashlib
+import re
+
+# Read size for streamed attachment bodies; peak memory per download stays around this.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_QUOTE, _BACKSLASH = ord('"'), ord('\\')
+_LBRACE, _RBRACE, _LBRACKET = ord('{'), ord('}'), ord('[')
+_COMMA, _COLON = ord(','), ord(':')
+_WHITESPACE = b' \t\r\n'
+
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+_LITERAL_END = re.compile(rb'[,}\]\s]')
+_ESCAPES = {
+    ord('"'): b'"', ord('\\'): b'\\', ord('/'): b'/', ord('b'): b'\b',
+    ord('f'): b'\f', ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t',
+}
+
+
+def _discard(_segment):
+    pass
+
+
+class Base64FieldWriter:
+    """
+    Incremental decoder for a single base64 string field of a JSON object.
+
+    Chunks of the raw response body are pushed in with `feed()`; the parser
+    walks the top-level object, skips every other value without building it,
+    and base64-decodes the target field (`content` by default) straight into
+    `fileobj` as it arrives. Only the current chunk and fewer than four
+    pending base64 characters are ever held in memory. The SHA-256 of the
+    decoded bytes is computed on the way through.
+    """
+
+    def __init__(self, fileobj, field='content'):
+        self.fileobj = fileobj
+        self.field = field
+        self.found = False
+        self.bytes_written = 0
+        self.sha256 = hashlib.sha256()
+        self._buf = b''
+        self._pos = 0
+        self._carry = b''
+        self._done = False
+        self._parser = self._parse()
+        next(self._parser)
+
+    def feed(self, chunk):
+        if self._done or not chunk:
+            return
+        try:
+            self._parser.send(chunk)
+        except StopIteration:
+            self._done = True
+
+    def close(self):
+        """
+        Signals the end of the body and flushes the last base64 group.
+        Returns the number of decoded bytes written.
+        """
+        if not self._done:
+            try:
+                self._parser.send(b'')
+            except StopIteration:
+                self._done = True
+        if self._carry:
+            self._emit(base64.b64decode(self._carry))
+            self._carry = b''
+        return self.bytes_written
+
+    # -- decoding ----------------------------------------------------------
+
+    def _emit(self, data):
+        self.fileobj.write(data)
+        self.sha256.update(data)
+        self.bytes_written += len(data)
+
+    def _write(self, segment):
+        data = self._carry + segment.translate(None, _WHITESPACE)
+        usable = len(data) - len(data) % 4
+        if usable:
+            self._emit(base64.b64decode(data[:usable]))
+        self._carry = data[usable:]
+
+    # -- parsing (generator-based so it can be driven by pushed chunks) ----
+
+    def _fill(self):
+        chunk = yield
+        if not chunk:
+            raise ValueError("Unexpected end of JSON payload")
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def _peek(self):
+        while True:
+            buf = self._buf
+            while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buf):
+                return buf[self._pos]
+            yield from self._fill()
+
+    def _take(self):
+        c = yield from self._peek()
+        self._pos += 1
+        return c
+
+    def _string(self, sink):
+        """
+        Consumes a string body (opening quote already taken), passing the
+        unescaped bytes to `sink` in segments.
+        """
+        while True:
+            m = _STRING_SPECIAL.search(self._buf, self._pos)
+            if m is None:
+                if self._pos < len(self._buf):
+                    sink(self._buf[self._pos:])
+                self._pos = len(self._buf)
+                yield from self._fill()
+                continue
+
+            i = m.start()
+            if i > self._pos:
+                sink(self._buf[self._pos:i])
+            self._pos = i + 1
+            if self._buf[i] == _QUOTE:
+                return
+
+            while len(self._buf) - self._pos < 1:
+                yield from self._fill()
+            esc = self._buf[self._pos]
+            if esc == ord('u'):
+                while len(self._buf) - self._pos < 5:
+                    yield from self._fill()
+                code = int(self._buf[self._pos + 1:self._pos + 5], 16)
+                sink(chr(code).encode('utf-8', 'surrogatepass'))
+                self._pos += 5
+            elif esc in _ESCAPES:
+                sink(_ESCAPES[esc])
+                self._pos += 1
+            else:
+                raise ValueError(f"Invalid escape sequence in JSON string: \\{chr(esc)}")
+
+    def _skip_value(self):
+        c = yield from self._take()
+        if c == _QUOTE:
+            yield from self._string(_discard)
+            return
+        if c in (_LBRACE, _LBRACKET):
+            depth = 1
+            while depth:
+                m = _STRUCTURAL.search(self._buf, self._pos)
+                if m is None:
+                    self._pos = len(self._buf)
+                    yield from self._fill()
+                    continue
+                self._pos = m.end()
+                ch = self._buf[m.start()]
+                if ch == _QUOTE:
+                    yield from self._string(_discard)
+                elif ch in (_LBRACE, _LBRACKET):
+                    depth += 1
+                else:
+                    depth -= 1
+            return
+        # Number, true, false or null: runs until the next delimiter
+        while True:
+            m = _LITERAL_END.search(self._buf, self._pos)
+            if m is not None:
+                self._pos = m.start()
+                return
+            self._pos = len(self._buf)
+            yield from self._fill()
+
+    def _parse(self):
+        if (yield from self._take()) != _LBRACE:
+            raise ValueError("Expected a JSON object")
+        while True:
+            c = yield from self._take()
+            if c == _RBRACE:
+                return
+            if c == _COMMA:
+                c = yield from self._take()
+            if c != _QUOTE:
+                raise ValueError("Malformed JSON object key")
+
+            key_parts = []
+            yield from self._string(key_parts.append)
+            if (yield from self._take()) != _COLON:
+                raise ValueError("Malformed JSON object")
+
+            if b''.join(key_parts).decode('utf-8') != self.field:
+                yield from self._skip_value()
+                continue
+
+            if (yield from self._peek()) != _QUOTE:
+                # null or non-string content: nothing to decode
+                return
+            self._pos += 1
+            self.found = True
+            yield from self._string(self._write)
+            # The rest of the object is irrelevant once the content is written
+            return
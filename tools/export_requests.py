@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from intapp_sdk.commands.export_requests import main
+
+# Same as `intapp export` (see intapp_sdk/commands/export_requests.py)
+if __name__ == "__main__":
+    main()
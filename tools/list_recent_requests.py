@@ -1,73 +1,10 @@
 import os
 import sys
-import argparse
-from dotenv import load_dotenv
-
-# Set UTF-8 encoding for stdout
-if hasattr(sys.stdout, 'reconfigure'):
-    sys.stdout.reconfigure(encoding='utf-8')
 
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from intapp_sdk import IntappIntakeClient
-from intapp_sdk.auth import get_intapp_token
-
-def main():
-    load_dotenv()
-    
-    parser = argparse.ArgumentParser(description="List recent Intapp requests.")
-    parser.add_argument("-n", "--count", type=int, default=15, help="Number of requests to return (default: 15)")
-    parser.add_argument("-t", "--type", type=str, default="Valuation Request", help="Request type to filter by (default: 'Valuation Request')")
-    parser.add_argument("--all", action="store_true", help="List all request types (ignores -t)")
-    parser.add_argument("-o", "--output", type=str, help="Output file path (.md file)")
-    
-    args = parser.parse_args()
-
-    BASE_URL = "https://marcum-flow.open.intapp.com/api"
-    TOKEN = get_intapp_token()
-    
-    client = IntappIntakeClient(BASE_URL, TOKEN)
-    
-    req_type = None if args.all else [args.type]
-    type_display = "All Types" if args.all else args.type
-    
-    # Calculate a date 30 days ago to ensure we get recent items
-    from datetime import datetime, timedelta
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S")
-    
-    print(f"Fetching the {args.count} most recent requests ({type_display})...")
-    
-    try:
-        # Fetch a large batch since 30 days ago to ensure accurate local sorting
-        requests = client.list_requests(
-            limit=1000,
-            request_types=req_type,
-            modified_from=thirty_days_ago
-        )
-        
-        # Sort by createdOn descending
-        requests.sort(key=lambda x: x.get('createdOn', ''), reverse=True)
-        
-        print(f"\nFound {len(requests)} matching requests modified recently.")
-        
-        recent_requests = requests[:args.count]
-        
-        if args.output:
-            # Output to markdown file
-            markdown_table = client.format_request_table_markdown(recent_requests)
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(f"# {args.count} Most Recent Requests ({type_display})\n\n")
-                f.write(f"Found {len(requests)} matching requests modified recently.\n\n")
-                f.write(markdown_table)
-            print(f"\n{args.count} Most Recent Results:")
-            print(client.format_request_table(recent_requests))
-            print(f"\n✓ Table saved to {args.output}")
-        else:
-            print(f"\n{args.count} Most Recent Results:")
-            print(client.format_request_table(recent_requests))
-        
-    except Exception as e:
-        print(f"Error: {e}")
+from intapp_sdk.commands.list_recent_requests import main
 
+# Same as `intapp list` (see intapp_sdk/commands/list_recent_requests.py)
 if __name__ == "__main__":
     main()